@@ -1,2 +1,4 @@
 """Analysis tools (Monte Carlo, stats)."""
-from .montecarlo import bootstrap_pnl
+from .covariance import RollingCovariance
+from .montecarlo import bootstrap_pnl, parallel_bootstrap
+from .sketch import QuantileSketch
@@ -0,0 +1,196 @@
+"""Rolling return covariance/correlation over a universe, updated bar by bar.
+
+:class:`RollingCovariance` takes one row of closes per session (NaN where a
+symbol has no bar) and keeps pairwise sums of its log returns:
+
+* ``window=W``: the last W sessions.  Each update adds the new return
+  row and removes the one leaving the window (rank-1 add/remove), and
+  the sums are recomputed exactly from the kept rows once per W updates
+  so rounding cannot drift.
+* ``halflife=H``: exponentially decayed sums, so no history is kept.
+
+An update costs O(N²) for N symbols, instead of O(N²·W) for recomputing
+the matrix every session.  Pairs are "pairwise complete", like
+:meth:`pandas.DataFrame.corr`: each pair uses only the sessions where both
+symbols have a return, and is NaN until it has ``min_periods`` of them.
+Lookups of one candidate against a few holdings (:meth:`corr_with`,
+:meth:`max_corr`) touch only those entries.
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class RollingCovariance:
+    """Pairwise rolling (or exponentially weighted) return covariance."""
+
+    def __init__(self, symbols: Iterable[str] = (), window: Optional[int] = 60, halflife: Optional[float] = None,
+                 min_periods: int = 20):
+        if halflife is not None:
+            window = None  # a halflife replaces the window
+        elif window is None:
+            raise ValueError("give a window or a halflife")
+        if window is not None and window < 2:
+            raise ValueError("window must be >= 2")
+        if halflife is not None and halflife <= 0:
+            raise ValueError("halflife must be > 0")
+        self.window = None if window is None else int(window)
+        self.halflife = None if halflife is None else float(halflife)
+        self.decay = 1.0 if halflife is None else 0.5 ** (1.0 / self.halflife)
+        self.min_periods = max(2, int(min_periods))
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.updates = 0
+        self._alloc(0)
+        self.add_symbols(symbols)
+
+    def _alloc(self, n: int):
+        self._last = np.full(n, np.nan)           # last close seen per symbol
+        self._w = np.zeros((n, n))                # pair weight: sessions (window) or decayed weight
+        # pair sessions observed, for min_periods (window mode: _w already counts them)
+        self._obs = np.zeros((n, n), dtype=np.int64) if self.window is None else None
+        self._sx = np.zeros((n, n))               # [i, j]: sum of r_i where both i and j have a return
+        self._sxx = np.zeros((n, n))              # [i, j]: sum of r_i**2, same sessions
+        self._sxy = np.zeros((n, n))              # [i, j]: sum of r_i * r_j
+        self._ring = np.full((self.window or 0, n), np.nan)  # kept return rows (window mode)
+        self._head = 0                            # next ring slot
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def add_symbols(self, symbols: Iterable[str]):
+        """Start tracking *symbols* not tracked yet (their pairs start empty)."""
+        new = [s for s in dict.fromkeys(symbols) if s not in self.index]
+        if not new:
+            return
+        n0, n = len(self.symbols), len(self.symbols) + len(new)
+        old = (self._last, self._ring, self._w, self._obs, self._sx, self._sxx, self._sxy)
+        head = self._head
+        self._alloc(n)
+        self._head = head                         # the kept rows stay in their ring slots
+        self._last[:n0], self._ring[:, :n0] = old[0], old[1]
+        for dst, src in zip((self._w, self._obs, self._sx, self._sxx, self._sxy), old[2:]):
+            if dst is not None:
+                dst[:n0, :n0] = src
+        self.symbols += new
+        self.index.update({s: n0 + k for k, s in enumerate(new)})
+
+    # --- updates ----------------------------------------------------------
+    def update(self, closes) -> np.ndarray:
+        """Add one session: closes aligned to :attr:`symbols` (array) or a ``{symbol: close}`` dict.
+
+        A symbol without a close this session is skipped; its next return
+        spans the gap.  Returns the session's log returns.
+        """
+        if isinstance(closes, dict):
+            self.add_symbols(closes)
+            row = np.full(len(self.symbols), np.nan)
+            for s, px in closes.items():
+                row[self.index[s]] = px
+        else:
+            row = np.asarray(closes, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.log(row / self._last)
+        r[~np.isfinite(r)] = np.nan
+        have = np.isfinite(row) & (row > 0)
+        self._last[have] = row[have]
+        self.update_returns(r)
+        return r
+
+    def update_returns(self, r: np.ndarray):
+        """Add one session of returns (NaN = none)."""
+        r = np.asarray(r, dtype=float)
+        if self.window is None:
+            for a in (self._w, self._sx, self._sxx, self._sxy):
+                a *= self.decay
+            self._add(r, 1.0)
+        else:
+            leaving = self._ring[self._head].copy()
+            self._ring[self._head] = r
+            self._head = (self._head + 1) % self.window
+            if self.updates and self.updates % self.window == 0:
+                self._resync()
+            else:
+                self._add(r, 1.0)
+                if np.isfinite(leaving).any():
+                    self._add(leaving, -1.0)
+        self.updates += 1
+
+    def _add(self, r: np.ndarray, sign: float):
+        m = np.isfinite(r)
+        if not m.any():
+            return
+        x = np.where(m, r, 0.0)
+        mf = m.astype(float)
+        self._w += sign * np.outer(mf, mf)
+        if self._obs is not None:
+            self._obs += np.outer(m, m)
+        self._sx += sign * np.outer(x, mf)
+        self._sxx += sign * np.outer(x * x, mf)
+        self._sxy += sign * np.outer(x, x)
+
+    def _resync(self):
+        """Window sums recomputed from the kept rows (bounds add/remove rounding)."""
+        m = np.isfinite(self._ring)
+        x = np.where(m, self._ring, 0.0)
+        mf = m.astype(float)
+        self._w = mf.T @ mf
+        self._sx = x.T @ mf
+        self._sxx = (x * x).T @ mf
+        self._sxy = x.T @ x
+
+    # --- queries ----------------------------------------------------------
+    def _pair_stats(self, i, j):
+        w, sx, sy = self._w[i, j], self._sx[i, j], self._sx[j, i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cxy = self._sxy[i, j] - sx * sy / w
+            cxx = self._sxx[i, j] - sx * sx / w
+            cyy = self._sxx[j, i] - sy * sy / w
+        ok = (self._w if self._obs is None else self._obs)[i, j] >= self.min_periods
+        return w, cxy, cxx, cyy, ok
+
+    def cov(self, symbols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Covariance matrix (NaN for pairs short of ``min_periods``); sample covariance over a window,
+        weighted population covariance with a halflife."""
+        idx = self._indices(symbols)
+        i, j = np.ix_(idx, idx)
+        w, cxy, _, _, ok = self._pair_stats(i, j)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(ok, cxy / (w - 1.0 if self.window is not None else w), np.nan)
+        names = [self.symbols[k] for k in idx]
+        return pd.DataFrame(out, index=names, columns=names)
+
+    def corr(self, symbols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Correlation matrix (NaN for pairs short of ``min_periods`` or with a flat series)."""
+        idx = self._indices(symbols)
+        names = [self.symbols[k] for k in idx]
+        return pd.DataFrame(self._corr(*np.ix_(idx, idx)), index=names, columns=names)
+
+    def corr_with(self, symbol: str, others: Sequence[str]) -> np.ndarray:
+        """Correlation of *symbol* with each of *others* (NaN where unknown)."""
+        if symbol not in self.index or not len(others):
+            return np.full(len(others), np.nan)
+        known = np.array([o in self.index for o in others])
+        out = np.full(len(others), np.nan)
+        if known.any():
+            j = np.array([self.index[o] for o, k in zip(others, known) if k])
+            out[known] = self._corr(np.full(len(j), self.index[symbol]), j)
+        return out
+
+    def max_corr(self, symbol: str, others: Sequence[str]) -> float:
+        """Highest correlation of *symbol* with any of *others*; NaN if none is known."""
+        c = self.corr_with(symbol, [o for o in others if o != symbol])
+        return float(np.nanmax(c)) if np.isfinite(c).any() else float("nan")
+
+    def _corr(self, i, j) -> np.ndarray:
+        _, cxy, cxx, cyy, ok = self._pair_stats(i, j)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = cxy / np.sqrt(cxx * cyy)
+        return np.where(ok & (cxx > 0) & (cyy > 0), np.clip(c, -1.0, 1.0), np.nan)
+
+    def _indices(self, symbols) -> np.ndarray:
+        if symbols is None:
+            return np.arange(len(self.symbols))
+        return np.array([self.index[s] for s in symbols], dtype=np.int64)
@@ -0,0 +1,157 @@
+"""Vectorized performance metrics over equity curves and trade sets.
+
+Every function accepts a single curve (1-D) or many runs at once (2-D, rows =
+runs, columns = bars) and returns one value per run, so parameter sweeps and
+walk-forward folds can be ranked without per-run Python loops.  NaN padding is
+allowed at the *end* of shorter rows (curves) and anywhere in trade arrays.
+"""
+from __future__ import annotations
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+PERIODS_PER_YEAR = 252
+
+
+def _as_2d(a) -> np.ndarray:
+    arr = np.asarray(a, dtype=float)
+    if arr.ndim == 1:
+        arr = arr[None, :]
+    if arr.ndim != 2:
+        raise ValueError("expected a 1-D or 2-D array")
+    return arr
+
+
+def _ffill_rows(a: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along each row (vectorized)."""
+    mask = np.isnan(a)
+    if not mask.any():
+        return a
+    idx = np.where(~mask, np.arange(a.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return a[np.arange(a.shape[0])[:, None], idx]
+
+
+def returns(equity) -> np.ndarray:
+    """Simple per-bar returns, shape (runs, bars-1); NaN where undefined."""
+    eq = _as_2d(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return eq[:, 1:] / eq[:, :-1] - 1.0
+
+
+def drawdown(equity) -> np.ndarray:
+    """Fractional drawdown from running peak (<= 0), same shape as input."""
+    eq = _ffill_rows(_as_2d(equity))
+    peak = np.fmax.accumulate(eq, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return eq / peak - 1.0
+
+
+def max_drawdown_duration(equity) -> np.ndarray:
+    """Longest stretch (in bars) spent below a prior peak, per run."""
+    dd = drawdown(equity)
+    n = dd.shape[1]
+    at_peak = ~(dd < 0)
+    last_peak = np.where(at_peak, np.arange(n), 0)
+    np.maximum.accumulate(last_peak, axis=1, out=last_peak)
+    return (np.arange(n) - last_peak).max(axis=1) if n else np.zeros(dd.shape[0])
+
+
+def equity_metrics(
+    equity,
+    periods_per_year: int = PERIODS_PER_YEAR,
+    risk_free: float = 0.0,
+    exposure=None,
+    traded_notional=None,
+) -> Dict[str, np.ndarray]:
+    """Curve-level metrics for each row of *equity*.
+
+    ``exposure`` (optional, same shape) is the fraction of equity invested per
+    bar (or a boolean in-market mask); ``traded_notional`` (optional, same
+    shape) is the dollar value traded per bar and drives annualized turnover.
+    """
+    eq = _ffill_rows(_as_2d(equity))
+    valid = (~np.isnan(_as_2d(equity))).sum(axis=1)
+    first = eq[:, 0]
+    last = eq[:, -1]
+    years = np.maximum(valid - 1, 1) / periods_per_year
+
+    r = returns(eq)
+    rf = risk_free / periods_per_year
+    n_r = np.maximum((~np.isnan(r)).sum(axis=1), 1)
+    mean_r = np.nanmean(r, axis=1) if r.shape[1] else np.zeros(len(eq))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std_r = np.sqrt(np.nansum((r - mean_r[:, None]) ** 2, axis=1) / np.maximum(n_r - 1, 1))
+        downside = np.sqrt(np.nansum(np.minimum(r - rf, 0.0) ** 2, axis=1) / n_r)
+        ann = np.sqrt(periods_per_year)
+        sharpe = np.where(std_r > 0, (mean_r - rf) / std_r * ann, np.nan)
+        sortino = np.where(downside > 0, (mean_r - rf) / downside * ann, np.nan)
+        total = last / first - 1.0
+        cagr = np.where((first > 0) & (last > 0), (last / first) ** (1.0 / years) - 1.0, np.nan)
+
+    out = {
+        "total_return": total,
+        "cagr": cagr,
+        "volatility": std_r * np.sqrt(periods_per_year),
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": np.nanmin(drawdown(eq), axis=1),
+        "max_dd_duration": max_drawdown_duration(eq),
+    }
+    if exposure is not None:
+        out["exposure"] = np.nanmean(_as_2d(exposure), axis=1)
+    if traded_notional is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["turnover"] = np.nansum(_as_2d(traded_notional), axis=1) / np.nanmean(eq, axis=1) / years
+    return out
+
+
+def trade_metrics(pnls) -> Dict[str, np.ndarray]:
+    """Win rate / profit factor per row of realized trade PnLs (NaN-padded)."""
+    p = _as_2d(pnls) if np.size(pnls) else np.full((1, 0), np.nan)
+    wins = p > 0
+    losses = p < 0
+    n = (~np.isnan(p)).sum(axis=1)
+    gross_win = np.where(wins, p, 0.0).sum(axis=1)
+    gross_loss = -np.where(losses, p, 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_rate = np.where(n > 0, wins.sum(axis=1) / n, np.nan)
+        pf = np.where(gross_loss > 0, gross_win / gross_loss, np.where(gross_win > 0, np.inf, np.nan))
+    return {"trades": n, "win_rate": win_rate, "profit_factor": pf}
+
+
+def metrics_frame(
+    equity,
+    pnls=None,
+    index=None,
+    periods_per_year: int = PERIODS_PER_YEAR,
+    exposure=None,
+    traded_notional=None,
+) -> pd.DataFrame:
+    """All metrics as a DataFrame (one row per run) ready for sorting/ranking."""
+    cols = equity_metrics(equity, periods_per_year, exposure=exposure, traded_notional=traded_notional)
+    if pnls is not None:
+        cols.update(trade_metrics(pnls))
+    return pd.DataFrame(cols, index=index)
+
+
+def backtest_metrics(equity_curve: pd.Series, trades: list[dict],
+                     periods_per_year: int = PERIODS_PER_YEAR) -> Dict[str, float]:
+    """Scalar metrics for one :func:`run_bar_backtest` result.
+
+    *equity_curve* is indexed by session date; exposure and turnover are
+    derived from the trade records (``side``/``notional``/``dt``/``realized_pnl``).
+    """
+    eq = equity_curve.to_numpy(dtype=float)
+    exposure: Optional[np.ndarray] = None
+    traded: Optional[np.ndarray] = None
+    sells = [t["realized_pnl"] for t in trades if t.get("side") == "sell"]
+    if trades:
+        tdf = pd.DataFrame(trades)
+        pos = pd.Series(np.where(tdf["side"] == "buy", tdf["qty"], -tdf["qty"]), index=tdf["dt"])
+        held = pos.groupby(level=0).sum().reindex(equity_curve.index, fill_value=0).cumsum()
+        exposure = (held.to_numpy() > 0).astype(float)
+        traded = tdf.groupby("dt")["notional"].sum().reindex(equity_curve.index, fill_value=0.0).to_numpy()
+    row = metrics_frame(eq, [sells] if sells else None, periods_per_year=periods_per_year,
+                        exposure=exposure, traded_notional=traded).iloc[0]
+    return {k: float(v) for k, v in row.items()}
@@ -1,25 +1,23 @@
 from __future__ import annotations
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Iterable, List
-import pandas as pd
+import numpy as np
+from autoswing.analysis.sketch import QuantileSketch
+from autoswing.db.store import RunStore, db_path
+from autoswing.utils import telemetry
+from autoswing.utils.parallel import process_context
 
 ROOT = Path(__file__).parents[2]
 
-def _load_trade_pnls_from_logs() -> list[float]:
-    """Read trade logs under runtime/logs/trades_*.csv; assume 0 PnL placeholder."""
-    tdir = ROOT / "runtime" / "logs"
-    vals: List[float] = []
-    if not tdir.exists():
-        return vals
-    for f in tdir.glob("trades_*.csv"):
-        try:
-            df = pd.read_csv(f)
-            # placeholder: treat each trade as 0% (improve later when exits implemented)
-            vals.extend([0.0] * len(df))
-        except Exception:
-            continue
-    return vals
+def _load_trade_pnls_from_logs(project_root: Path = ROOT, run_id: str | None = None) -> list[float]:
+    """Realized PnL of closing trades from the run store (all runs or one)."""
+    if not db_path(project_root).exists():
+        return []
+    with RunStore.for_project(project_root) as store:
+        return store.trade_pnls(run_id=run_id).tolist()
 
 def bootstrap_pnl(
     trade_pnls: Iterable[float] | None = None,
@@ -49,3 +47,97 @@ def bootstrap_pnl(
         "p95": pct(0.95),
         "max": finals[-1],
     }
+
+
+# ---------------------------------------------------------------------------
+# Parallel, constant-memory bootstrap
+# ---------------------------------------------------------------------------
+
+_QUANTILES = {"p05": 0.05, "p50": 0.50, "p95": 0.95}
+
+
+def _mc_shard(pnls: np.ndarray, iters: int, starting_cash: float, seed_seq,
+              batch: int, rel_err: float, progress=None):
+    """Run *iters* bootstrap paths in batches; return (finals, drawdowns) sketches."""
+    rng = np.random.default_rng(seed_seq)
+    finals = QuantileSketch(rel_err)
+    dds = QuantileSketch(rel_err)
+    n = len(pnls)
+    done = 0
+    while done < iters:
+        b = min(batch, iters - done)
+        paths = starting_cash + np.cumsum(pnls[rng.integers(0, n, size=(b, n))], axis=1)
+        peaks = np.maximum(np.maximum.accumulate(paths, axis=1), starting_cash)
+        finals.update(paths[:, -1])
+        dds.update((peaks - paths).max(axis=1))
+        done += b
+        if progress is not None:
+            progress(done / iters, f"{done}/{iters} paths")
+    return finals, dds
+
+
+def parallel_bootstrap(
+    trade_pnls: Iterable[float] | None = None,
+    iters: int = 5000,
+    starting_cash: float = 1000.0,
+    workers: int = 1,
+    seed: int | None = None,
+    batch: int = 4096,
+    rel_err: float = 0.005,
+    progress=None,
+    hist_bins: int = 0,
+) -> dict:
+    """Sharded bootstrap Monte Carlo for very large iteration counts.
+
+    Iterations are split across *workers* processes, each with an independent
+    RNG stream spawned from one :class:`numpy.random.SeedSequence` (so a fixed
+    *seed* is reproducible for a fixed worker count).  Workers summarize final
+    equity and max drawdown in :class:`QuantileSketch` objects which are merged
+    at the end; memory is bounded by ``batch * len(trade_pnls)`` regardless of
+    *iters*.  *progress* (``progress(fraction, message)``) is called per
+    batch in-process, or per finished shard with several workers.  With
+    *hist_bins* the result also carries ``final_hist`` (binned final equity
+    from the merged sketch) for charting without shipping samples.
+    Raises :class:`ValueError` if *iters* is below 1.
+    """
+    if iters < 1:
+        raise ValueError(f"iters must be at least 1, got {iters}")
+    if trade_pnls is None:
+        trade_pnls = _load_trade_pnls_from_logs()
+    pnls = np.asarray(list(trade_pnls) or [0.0], dtype=float)
+    workers = max(1, min(int(workers), iters))
+    children = np.random.SeedSequence(seed).spawn(workers)
+    shares = [iters // workers + (1 if i < iters % workers else 0) for i in range(workers)]
+    args = [(pnls, k, starting_cash, ss, batch, rel_err) for k, ss in zip(shares, children)]
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        parts = [_mc_shard(*a, progress=progress) for a in args]
+    else:
+        # forkserver/spawn: the daemon and the UI run this job on a worker thread
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as ex:
+            futs = [ex.submit(_mc_shard, *a) for a in args]
+            for n, _ in enumerate(as_completed(futs), 1):
+                if progress is not None:
+                    progress(n / workers, f"{n}/{workers} shards")
+            parts = [f.result() for f in futs]
+
+    secs = time.perf_counter() - t0
+    telemetry.counter("autoswing_mc_iterations_total", "Bootstrap iterations").inc(iters)
+    telemetry.gauge("autoswing_mc_iterations_per_second", "Last Monte Carlo throughput",
+                    workers=str(workers)).set(iters / secs if secs else 0.0)
+    finals, dds = QuantileSketch(rel_err), QuantileSketch(rel_err)
+    for f, d in parts:
+        finals.merge(f)
+        dds.merge(d)
+    out = {"iters": iters, "start": starting_cash, "workers": workers,
+           "min": finals.min, "mean": finals.mean, "max": finals.max}
+    for k, q in _QUANTILES.items():
+        out[k] = finals.quantile(q)
+    out["max_dd_mean"] = dds.mean
+    out["max_dd_max"] = dds.max
+    for k, q in _QUANTILES.items():
+        out[f"max_dd_{k}"] = dds.quantile(q)
+    if hist_bins:
+        out["final_hist"] = finals.histogram(hist_bins)
+    return out
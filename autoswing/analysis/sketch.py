@@ -0,0 +1,123 @@
+"""Mergeable streaming quantile sketch (DDSketch-style, relative error).
+
+Values are bucketed on a logarithmic grid so that any reported quantile is
+within ``rel_err`` of the true value.  Memory depends on the *range* of the
+data, not on how many values were added, and two sketches built with the same
+``rel_err`` merge exactly by adding bucket counts.  Positive, negative and
+zero values are tracked separately.
+"""
+from __future__ import annotations
+import math
+from typing import Dict
+import numpy as np
+
+
+class QuantileSketch:
+    """Log-bucket quantile sketch with exact count/min/max/mean."""
+
+    def __init__(self, rel_err: float = 0.005):
+        if not 0 < rel_err < 1:
+            raise ValueError("rel_err must be in (0, 1)")
+        self.rel_err = float(rel_err)
+        self._gamma = (1 + rel_err) / (1 - rel_err)
+        self._log_gamma = math.log(self._gamma)
+        self.pos: Dict[int, int] = {}
+        self.neg: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    # --- ingest -----------------------------------------------------------
+    def _bucket(self, store: Dict[int, int], mags: np.ndarray):
+        keys = np.ceil(np.log(mags) / self._log_gamma).astype(np.int64)
+        uniq, counts = np.unique(keys, return_counts=True)
+        for k, c in zip(uniq.tolist(), counts.tolist()):
+            store[k] = store.get(k, 0) + c
+
+    def update(self, values) -> "QuantileSketch":
+        """Add a batch of values (any array-like); vectorized."""
+        arr = np.asarray(values, dtype=float).ravel()
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return self
+        self.count += int(arr.size)
+        self.total += float(arr.sum())
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+        pos = arr[arr > 0]
+        neg = arr[arr < 0]
+        self.zero += int(arr.size - pos.size - neg.size)
+        if pos.size:
+            self._bucket(self.pos, pos)
+        if neg.size:
+            self._bucket(self.neg, -neg)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold *other* into this sketch (in place)."""
+        if not math.isclose(other.rel_err, self.rel_err):
+            raise ValueError("cannot merge sketches with different rel_err")
+        for k, c in other.pos.items():
+            self.pos[k] = self.pos.get(k, 0) + c
+        for k, c in other.neg.items():
+            self.neg[k] = self.neg.get(k, 0) + c
+        self.zero += other.zero
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    # --- query ------------------------------------------------------------
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _clamp(self, v: float) -> float:
+        return min(max(v, self.min), self.max)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return math.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        # ascending order: most negative first, then zeros, then positives
+        for k in sorted(self.neg, reverse=True):
+            seen += self.neg[k]
+            if seen > rank:
+                return self._clamp(-self._value(k))
+        seen += self.zero
+        if seen > rank:
+            return self._clamp(0.0)
+        for k in sorted(self.pos):
+            seen += self.pos[k]
+            if seen > rank:
+                return self._clamp(self._value(k))
+        return self.max
+
+    def histogram(self, bins: int = 40) -> dict:
+        """Counts over *bins* equal-width bins spanning [min, max].
+
+        Each log bucket is attributed to its representative value, so bin
+        counts are exact up to ``rel_err`` near the bin edges.
+        """
+        if not self.count:
+            return {"edges": [], "counts": []}
+        vals = [-self._value(k) for k in self.neg] + [0.0] * bool(self.zero) + [self._value(k) for k in self.pos]
+        wts = list(self.neg.values()) + [self.zero] * bool(self.zero) + list(self.pos.values())
+        vals = np.clip(vals, self.min, self.max)
+        lo, hi = self.min, self.max if self.max > self.min else self.min + 1.0
+        counts, edges = np.histogram(vals, bins=bins, range=(lo, hi), weights=wts)
+        return {"edges": edges.tolist(), "counts": counts.astype(int).tolist()}
+
+    def __len__(self) -> int:
+        return self.count
@@ -1,40 +1,42 @@
-apply_patch <<'EOF'
-*** Begin Patch
-*** Update File: autoswing/backtest/backtester.py
-@@
--from autoswing.engine.portfolio import Portfolio, Position
--
--
--def run_backtest(data_bundle: Dict[str, pd.DataFrame], strategy, starting_cash: float = 1000.0):
--    pf = Portfolio(cash=starting_cash)
--    # strategy.scan called once at end-of-data for Phase 1 demo
--    signals = strategy.scan(data_bundle)
--    for sig in signals:
--        if sig.action != "buy":
--            continue
--        df = data_bundle[sig.symbol]
--        price = df.close.iloc[-1]
--        size = strategy.position_size(pf, sig)
--        cost = size * price
--        if cost <= pf.cash:
--            pf.cash -= cost
--            pf.positions[sig.symbol] = Position(sig.symbol, size, price)
--    return pf
-+from autoswing.engine.paper_executor import run_bar_backtest
-+
-+def run_backtest(data_bundle: Dict[str, pd.DataFrame], strategy, starting_cash: float = 1000.0, project_root=None):
-+    """Phase 3A realistic paper backtest on daily bars."""
-+    final_eq, trades, acct = run_bar_backtest(
-+        bundle=data_bundle,
-+        strategy=strategy,
-+        starting_cash=starting_cash,
-+        max_hold_days=getattr(strategy, "max_hold_days", None),
-+        fee_per_share=0.0,
-+        project_root=project_root,
-+    )
-+    # return something Portfolio-like shim for compatibility
-+    class _Shim:
-+        def equity(self_inner): return float(final_eq)
-+    return _Shim()
-*** End Patch
-EOF
+from __future__ import annotations
+from typing import Dict
+import pandas as pd
+from autoswing.engine.paper_executor import run_bar_backtest
+
+def run_backtest(data_bundle: Dict[str, pd.DataFrame], strategy, starting_cash: float = 1000.0, project_root=None,
+                 run_kind: str = "backtest", cache=None, settings=None, progress=None,
+                 fill_model=None, compliance=None, correlation=None):
+    """Phase 3A realistic paper backtest on daily bars.
+
+    Pass a :class:`~autoswing.backtest.result_cache.ResultCache` as *cache* to
+    reuse results for identical data/strategy/*settings*.  *progress*,
+    *fill_model* (see :meth:`~autoswing.engine.fills.FillModel.from_settings`),
+    *compliance* and *correlation* are forwarded to :func:`run_bar_backtest`.
+    """
+    final_eq, trades, acct = run_bar_backtest(
+        bundle=data_bundle,
+        strategy=strategy,
+        starting_cash=starting_cash,
+        max_hold_days=getattr(strategy, "max_hold_days", None),
+        fee_per_share=0.0,
+        project_root=project_root,
+        run_kind=run_kind,
+        cache=cache,
+        settings=settings,
+        progress=progress,
+        fill_model=fill_model,
+        compliance=compliance,
+        correlation=correlation,
+    )
+    # return something Portfolio-like shim for compatibility
+    class _Shim:
+        def equity(self_inner): return float(final_eq)
+        def equity_curve(self_inner) -> pd.Series:
+            dts, vals = zip(*acct.equity_curve) if acct.equity_curve else ((), ())
+            return pd.Series(vals, index=pd.Index(dts, name="date"), name="equity", dtype=float)
+        def metrics(self_inner) -> dict:
+            from autoswing.analysis.metrics import backtest_metrics
+            return backtest_metrics(self_inner.equity_curve(), trades)
+    _Shim.trades = trades
+    _Shim.account = acct
+    return _Shim()
@@ -0,0 +1,133 @@
+"""Content-addressed memoization of backtest results.
+
+A key is the SHA-256 of everything that determines a run's output: every
+input frame's contents, the strategy class, its parameters (class defaults
+included) and code, the settings
+and run arguments, and :data:`ENGINE_VERSION`.  Values are pickled
+``(final_equity, trades, account)`` tuples under ``runtime/cache/backtests``;
+the directory is kept under a byte / entry cap by evicting the least recently
+used files (hits refresh the file mtime).
+"""
+from __future__ import annotations
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+RESULT_CACHE_SUBDIR = "runtime/cache/backtests"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 512
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Stable digest of a frame's columns and values (index ignored)."""
+    h = hashlib.sha256()
+    h.update(",".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _jsonable(obj: Any):
+    if hasattr(obj, "model_dump"):  # pydantic settings
+        return obj.model_dump()
+    return str(obj)
+
+
+def strategy_fingerprint(strategy) -> Dict[str, Any]:
+    """Class, effective parameters and a digest of the class code.
+
+    Parameters are the public class-level attributes along the MRO (e.g.
+    ``max_positions``, ``alloc_pct``) overlaid by the instance's, so editing
+    a default or the strategy's code changes the fingerprint too.
+    """
+    cls = type(strategy)
+    params: Dict[str, Any] = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        params.update({k: v for k, v in vars(klass).items() if not k.startswith("_")
+                       and not callable(v) and not isinstance(v, (property, staticmethod, classmethod))})
+    params.update({k: v for k, v in vars(strategy).items() if not k.startswith("_")})
+    return {"class": f"{cls.__module__}.{cls.__qualname__}", "params": params, "code": _code_digest(cls)}
+
+
+@functools.lru_cache(maxsize=None)
+def _code_digest(cls) -> str:
+    h = hashlib.sha256()
+    for klass in cls.__mro__[:-1]:
+        try:
+            h.update(inspect.getsource(klass).encode())
+        except (OSError, TypeError):  # no source (interactive / built-in): the name stands in
+            h.update(klass.__qualname__.encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Directory of pickled backtest results with an LRU size cap."""
+
+    def __init__(self, root: Path | str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.max_entries = int(max_entries)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def for_project(cls, project_root: Path, **kw) -> "ResultCache":
+        return cls(Path(project_root) / RESULT_CACHE_SUBDIR, **kw)
+
+    # --- keys -------------------------------------------------------------
+    def key(self, bundle: Dict[str, pd.DataFrame], strategy, settings=None, **run_args) -> str:
+        from autoswing.engine.paper_executor import ENGINE_VERSION
+        payload = {
+            "engine": ENGINE_VERSION,
+            "data": {s: frame_fingerprint(df) for s, df in sorted(bundle.items())},
+            "strategy": strategy_fingerprint(strategy),
+            "settings": settings,
+            "args": run_args,
+        }
+        blob = json.dumps(payload, sort_keys=True, default=_jsonable).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    # --- get / put --------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        fp = self._path(key)
+        try:
+            with fp.open("rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(fp)  # mark as recently used
+        return value
+
+    def put(self, key: str, value: Any):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until under both caps."""
+        entries = sorted(((p.stat().st_mtime, p.stat().st_size, p) for p in self.root.glob("*.pkl")),
+                         key=lambda e: e[0])
+        total = sum(e[1] for e in entries)
+        while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+            _, size, p = entries.pop(0)
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for p in self.root.glob("*.pkl"):
+            p.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.root.glob("*.pkl"))
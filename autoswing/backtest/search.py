@@ -0,0 +1,301 @@
+"""Successive-halving parameter search over walk-forward folds.
+
+An exhaustive grid backtests every configuration on every fold and symbol,
+and most of that compute goes to configurations that are clearly bad after
+one fold.  :func:`successive_halving` samples ``n_configs`` parameter sets.
+It scores all of them on a small budget: the first fold(s) and a subset of
+symbols.  Only the top ``1/eta`` are promoted to the next rung, where the
+budget grows ``eta``-fold, up to every fold and every symbol on the last
+rung.  :func:`grid_search` runs every configuration at the full budget and
+is the reference it is measured against.
+
+One *evaluation* is one :func:`run_bar_backtest` of a configuration on one
+fold's sessions (plus warm-up history) for the rung's symbols.  Its score
+is the Sharpe ratio of the equity curve inside the fold; a configuration
+that never trades scores 0.  A configuration's rung score is the mean over
+the rung's folds.  Evaluations are memoized per (config, fold, symbol set).
+One evaluation is a single portfolio backtest with shared cash, so a wider
+symbol set is a new evaluation.  While the rungs are still widening the
+universe, every fold is re-run.  Once a rung already uses every symbol, a
+promoted configuration only pays for the folds it has not seen yet.
+Every evaluation, memo hits included, is a row of the audit log, which can
+also be appended to a CSV as the search runs.
+"""
+from __future__ import annotations
+import csv
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from autoswing.analysis.metrics import equity_metrics
+from autoswing.data.calendar import to_days
+from autoswing.engine.paper_executor import run_bar_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+from autoswing.utils import telemetry
+from autoswing.utils.parallel import map_chunks
+
+DEFAULT_SPACE: Dict[str, list] = {
+    "fast": [5, 10, 15, 20, 30],
+    "slow": [30, 50, 75, 100, 150],
+    "max_hold_days": [3, 5, 10, 20],
+}
+AUDIT_FIELDS = ["search_id", "rung", "config_id", "params", "fold", "fold_start", "fold_end", "symbols",
+                "score", "total_return", "max_drawdown", "trades", "seconds", "memo"]
+
+
+def valid_sma(params: dict) -> bool:
+    return params.get("slow", math.inf) > params.get("fast", 0)
+
+
+def sample_configs(space: Dict[str, list], n: Optional[int] = None, seed: int = 0,
+                   valid: Callable[[dict], bool] = valid_sma) -> List[dict]:
+    """*n* distinct valid configurations drawn from the grid of *space* (all of them if *n* is None or larger)."""
+    keys = list(space)
+    grid = [dict(zip(keys, vals)) for vals in itertools.product(*(space[k] for k in keys))]
+    grid = [p for p in grid if valid(p)]
+    if n is None or n >= len(grid):
+        return grid
+    pick = np.random.default_rng(seed).choice(len(grid), size=n, replace=False)
+    return [grid[i] for i in sorted(pick)]
+
+
+@dataclass(frozen=True)
+class Fold:
+    index: int
+    start: np.datetime64
+    end: np.datetime64
+
+
+def make_folds(sessions: np.ndarray, fold_days: int, warmup: int, n_folds: Optional[int] = None) -> List[Fold]:
+    """Consecutive non-overlapping windows of *fold_days* sessions after *warmup* sessions of history."""
+    folds = []
+    for k, lo in enumerate(range(warmup, len(sessions) - fold_days + 1, fold_days)):
+        if n_folds is not None and k >= n_folds:
+            break
+        folds.append(Fold(k, sessions[lo], sessions[lo + fold_days - 1]))
+    return folds
+
+
+@dataclass
+class SearchResult:
+    best: dict
+    leaderboard: pd.DataFrame          # one row per config at the highest rung it reached
+    audit: pd.DataFrame                # one row per evaluation (AUDIT_FIELDS)
+    backtests: int                     # evaluations actually run (memo hits excluded)
+    symbol_folds: int                  # sum of symbols over those backtests, a cost unit
+    seconds: float
+    rungs: List[dict] = field(default_factory=list)  # per rung: configs, folds, symbols
+
+
+class _Evaluator:
+    """Fold backtests for one bundle, memoized and logged."""
+
+    def __init__(self, bundle: Dict[str, pd.DataFrame], folds: List[Fold], warmup: int, starting_cash: float,
+                 base_params: dict, cache, workers: int, search_id: str, audit_path: Optional[Path]):
+        self.bundle = {s: df.sort_values("date").reset_index(drop=True) for s, df in bundle.items()}
+        self.days = {s: to_days(df["date"]) for s, df in self.bundle.items()}
+        self.folds = folds
+        self.warmup = warmup
+        self.starting_cash = starting_cash
+        self.base_params = base_params
+        self.cache = cache
+        self.workers = workers
+        self.search_id = search_id
+        self.audit_path = audit_path
+        self.memo: Dict[Tuple[int, int, Tuple[str, ...]], dict] = {}
+        self.rows: List[dict] = []
+        self.backtests = 0
+        self.symbol_folds = 0
+
+    def fold_bundle(self, fold: Fold, symbols: Sequence[str]) -> Dict[str, pd.DataFrame]:
+        out = {}
+        for s in symbols:
+            d = self.days[s]
+            lo = max(0, np.searchsorted(d, fold.start) - self.warmup)
+            hi = np.searchsorted(d, fold.end, side="right")
+            if hi > lo:
+                out[s] = self.bundle[s].iloc[lo:hi]
+        return out
+
+    def run(self, rung: int, configs: List[Tuple[int, dict]], n_folds: int, symbols: Sequence[str]) -> Dict[int, float]:
+        """Mean fold score per config id, running only evaluations not yet memoized."""
+        key = tuple(symbols)
+        todo = [(cid, params, f) for cid, params in configs for f in self.folds[:n_folds]
+                if (cid, f.index, key) not in self.memo]
+        tasks = [(cid, {**self.base_params, **params}, f, self.fold_bundle(f, symbols), self.starting_cash,
+                  self.cache) for cid, params, f in todo]
+        for cid, fold_idx, res in map_chunks(_evaluate_chunk, tasks, workers=self.workers, kind="process"):
+            self.memo[(cid, fold_idx, key)] = res
+            self.backtests += 1
+            self.symbol_folds += len(symbols)
+        telemetry.counter("autoswing_search_backtests_total", "Parameter-search fold backtests").inc(len(todo))
+        fresh = {(cid, f.index) for cid, _, f in todo}
+        rows, scores = [], {}
+        for cid, params in configs:
+            per_fold = []
+            for f in self.folds[:n_folds]:
+                res = self.memo[(cid, f.index, key)]
+                per_fold.append(res["score"])
+                rows.append({"search_id": self.search_id, "rung": rung, "config_id": cid,
+                             "params": _params_str(params), "fold": f.index, "fold_start": str(f.start),
+                             "fold_end": str(f.end), "symbols": len(symbols), **res,
+                             "memo": (cid, f.index) not in fresh})
+            scores[cid] = float(np.mean(per_fold))
+        self.rows.extend(rows)
+        if self.audit_path is not None:
+            _append_audit(self.audit_path, rows)
+        return scores
+
+
+def _params_str(params: dict) -> str:
+    return ",".join(f"{k}={v}" for k, v in params.items())
+
+
+def _evaluate_chunk(tasks) -> list:
+    """Work unit for pool workers (module-level so it pickles)."""
+    out = []
+    for cid, params, fold, bundle, starting_cash, cache in tasks:
+        t0 = time.perf_counter()
+        strat = SMAPullbackStrategy(**params)
+        final_eq, trades, acct = run_bar_backtest(bundle, strat, starting_cash,
+                                                  max_hold_days=strat.max_hold_days, cache=cache)
+        eq = np.array([v for d, v in acct.equity_curve if np.datetime64(d, "D") >= fold.start], dtype=float)
+        m = equity_metrics(eq) if len(eq) > 1 else {}
+        score = float(np.nan_to_num(m["sharpe"][0])) if m else 0.0
+        out.append((cid, fold.index, {
+            "score": score,
+            "total_return": float(m["total_return"][0]) if m else 0.0,
+            "max_drawdown": float(m["max_drawdown"][0]) if m else 0.0,
+            "trades": len(trades),
+            "seconds": time.perf_counter() - t0,
+        }))
+    return out
+
+
+def _append_audit(path: Path, rows: List[dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    new = not path.exists() or path.stat().st_size == 0
+    with path.open("a", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=AUDIT_FIELDS)
+        if new:
+            w.writeheader()
+        w.writerows(rows)
+
+
+def _setup(bundle, fold_days, n_folds, space, warmup):
+    space = space or DEFAULT_SPACE
+    warmup = warmup if warmup is not None else int(max(space.get("slow", [SMAPullbackStrategy.warmup_bars])))
+    sessions = np.unique(np.concatenate([to_days(df["date"]) for df in bundle.values()]))
+    folds = make_folds(sessions, fold_days, warmup, n_folds)
+    if not folds:
+        raise ValueError(f"not enough history for one {fold_days}-session fold after {warmup} warm-up sessions")
+    return space, warmup, folds
+
+
+def _leaderboard(configs: List[dict], reached: Dict[int, Tuple[int, float]]) -> pd.DataFrame:
+    rows = [{"config_id": cid, **configs[cid], "rung": r, "score": s} for cid, (r, s) in reached.items()]
+    return pd.DataFrame(rows).sort_values(["rung", "score", "config_id"], ascending=[False, False, True],
+                                          ignore_index=True)
+
+
+def successive_halving(
+    bundle: Dict[str, pd.DataFrame],
+    space: Optional[Dict[str, list]] = None,
+    n_configs: Optional[int] = 27,
+    eta: int = 3,
+    fold_days: int = 60,
+    n_folds: Optional[int] = None,
+    min_folds: int = 2,
+    min_symbols: int = 4,
+    warmup: Optional[int] = None,
+    starting_cash: float = 1000.0,
+    base_params: Optional[dict] = None,
+    seed: int = 0,
+    workers: int = 1,
+    cache=None,
+    audit_path: Optional[Path] = None,
+    search_id: Optional[str] = None,
+    progress: Optional[Callable[[float, str], None]] = None,
+) -> SearchResult:
+    """Successive halving of ``SMAPullbackStrategy`` configurations over walk-forward folds.
+
+    Rung *k* of *K* rungs scores its configs on the first
+    ``folds * eta**(k-K+1)`` folds (at least *min_folds*) and the first
+    ``symbols * eta**(k-K+1)`` symbols (at least *min_symbols*) of a
+    seed-shuffled universe.  *K* is ``ceil(log_eta(n_configs))``, lowered so
+    the first rung still sees *min_folds* folds: a single short fold ranks
+    configs mostly on noise.  Each rung keeps the top ``1/cut``, where
+    ``cut = max(eta, n_configs ** (1/K))``, so the last rung gets about
+    *eta* survivors even when *K* was lowered.
+    *base_params* are fixed strategy overrides applied to every config.
+    *cache* (a :class:`~autoswing.backtest.result_cache.ResultCache`) is
+    passed to every backtest; *workers* > 1 evaluates a rung on a process
+    pool.  *progress* is called per rung as ``progress(fraction, message)``.
+    """
+    t0 = time.perf_counter()
+    space, warmup, folds = _setup(bundle, fold_days, n_folds, space, warmup)
+    configs = sample_configs(space, n_configs, seed)
+    universe = list(np.random.default_rng(seed).permutation(sorted(bundle)))
+    search_id = search_id or f"sh-{int(time.time())}"
+    ev = _Evaluator(bundle, folds, warmup, starting_cash, base_params or {}, cache, workers, search_id, audit_path)
+
+    eta = max(2, int(eta))
+    n_rungs = max(1, math.ceil(math.log(len(configs), eta) - 1e-9)) if len(configs) > 1 else 1
+    min_folds = min(max(1, min_folds), len(folds))
+    n_rungs = min(n_rungs, 1 + int(math.log(len(folds) / min_folds, eta) + 1e-9))
+    cut = max(eta, len(configs) ** (1.0 / n_rungs))
+    alive = list(range(len(configs)))
+    reached: Dict[int, Tuple[int, float]] = {}
+    rungs = []
+    for k in range(n_rungs):
+        frac = eta ** (k - n_rungs + 1)
+        nf = min(len(folds), max(min_folds, round(len(folds) * frac)))
+        ns = min(len(universe), max(min_symbols, round(len(universe) * frac)))
+        if progress is not None:
+            progress(k / n_rungs, f"rung {k}: {len(alive)} configs x {nf} folds x {ns} symbols")
+        scores = ev.run(k, [(cid, configs[cid]) for cid in alive], nf, universe[:ns])
+        for cid, s in scores.items():
+            reached[cid] = (k, s)
+        rungs.append({"rung": k, "configs": len(alive), "folds": nf, "symbols": ns})
+        if k < n_rungs - 1:
+            keep = max(1, math.ceil(len(alive) / cut))
+            alive = sorted(alive, key=lambda c: (-scores[c], c))[:keep]
+    board = _leaderboard(configs, reached)
+    return SearchResult(best=configs[int(board["config_id"].iloc[0])], leaderboard=board,
+                        audit=pd.DataFrame(ev.rows, columns=AUDIT_FIELDS), backtests=ev.backtests,
+                        symbol_folds=ev.symbol_folds, seconds=time.perf_counter() - t0, rungs=rungs)
+
+
+def grid_search(
+    bundle: Dict[str, pd.DataFrame],
+    space: Optional[Dict[str, list]] = None,
+    n_configs: Optional[int] = None,
+    fold_days: int = 60,
+    n_folds: Optional[int] = None,
+    warmup: Optional[int] = None,
+    starting_cash: float = 1000.0,
+    base_params: Optional[dict] = None,
+    seed: int = 0,
+    workers: int = 1,
+    cache=None,
+    audit_path: Optional[Path] = None,
+    search_id: Optional[str] = None,
+) -> SearchResult:
+    """Every configuration on every fold and symbol (the exhaustive reference)."""
+    t0 = time.perf_counter()
+    space, warmup, folds = _setup(bundle, fold_days, n_folds, space, warmup)
+    configs = sample_configs(space, n_configs, seed)
+    search_id = search_id or f"grid-{int(time.time())}"
+    ev = _Evaluator(bundle, folds, warmup, starting_cash, base_params or {}, cache, workers, search_id, audit_path)
+    scores = ev.run(0, list(enumerate(configs)), len(folds), sorted(bundle))
+    board = _leaderboard(configs, {cid: (0, s) for cid, s in scores.items()})
+    return SearchResult(best=configs[int(board["config_id"].iloc[0])], leaderboard=board,
+                        audit=pd.DataFrame(ev.rows, columns=AUDIT_FIELDS), backtests=ev.backtests,
+                        symbol_folds=ev.symbol_folds, seconds=time.perf_counter() - t0,
+                        rungs=[{"rung": 0, "configs": len(configs), "folds": len(folds), "symbols": len(bundle)}])
@@ -1,11 +1,12 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Sequence, Tuple, Dict
+from typing import Callable, Optional, Sequence, Tuple, Dict
 import numpy as np
 import pandas as pd
 from autoswing.strategies.sma_pullback import SMAPullbackStrategy
 from autoswing.backtest.backtester import run_backtest
 from autoswing.data.loader import load_bundle_cached
+from autoswing.analysis.metrics import equity_metrics
 
 ROOT = Path(__file__).parents[2]
 
@@ -16,40 +17,76 @@ def slice_windows(df: pd.DataFrame, train: int, test: int, step: int):
         yield (df.iloc[idx:idx+train], df.iloc[idx+train:idx+train+test])
         idx += step
 
-def walkforward(symbols: Sequence[str], train_days: int, test_days: int, step_days: int, root: Path = ROOT) -> pd.DataFrame:
-    """Rolling windows; train: optimize SMA lengths naive grid; test: apply fixed strat."""
+def _grid_equity(close: pd.Series, combos: Sequence[Tuple[int, int]]) -> np.ndarray:
+    """Equity curves (rows = combos) of a long-when-fast>slow regime, starting at 1."""
+    c = close.to_numpy(dtype=float)
+    csum = np.concatenate([[0.0], np.cumsum(c)])
+    n = len(c)
+    ret = np.zeros(n)
+    ret[1:] = c[1:] / c[:-1] - 1.0
+    curves = np.empty((len(combos), n))
+    for k, (f, sl) in enumerate(combos):
+        sma_f = np.full(n, np.nan)
+        sma_s = np.full(n, np.nan)
+        sma_f[f - 1:] = (csum[f:] - csum[:-f]) / f
+        sma_s[sl - 1:] = (csum[sl:] - csum[:-sl]) / sl
+        regime = np.nan_to_num(sma_f > sma_s).astype(float)
+        curves[k, 0] = 0.0
+        curves[k, 1:] = ret[1:] * regime[:-1]
+    return np.cumprod(1.0 + curves, axis=1)
+
+
+def walkforward(symbols: Sequence[str], train_days: int, test_days: int, step_days: int, root: Path = ROOT,
+                progress: Optional[Callable[[float, str], None]] = None) -> pd.DataFrame:
+    """Rolling windows; train: rank SMA grid by Sharpe; test: apply best pair.
+
+    Regime curves for the whole grid are built once per symbol and each fold
+    ranks all candidates in one :func:`equity_metrics` pass.  *progress* is
+    called once per symbol as ``progress(fraction, message)``.
+    """
     # simple grid
     fast_opts = [10,20,30]
     slow_opts = [50,100,150]
+    grid = [(f, sl) for f in fast_opts for sl in slow_opts if sl > f]
     recs = []
     bundle_full = {s: load_bundle_cached([s], 10_000, root).get(s) for s in symbols}
-    for sym, df_full in bundle_full.items():
+    for i, (sym, df_full) in enumerate(bundle_full.items()):
+        if progress is not None:
+            progress(i / max(1, len(bundle_full)), sym)
         if df_full is None or len(df_full) < slow_opts[-1]:
             continue
-        for (train_df, test_df) in slice_windows(df_full.reset_index(drop=True), train_days, test_days, step_days):
-            best = None
-            best_pnl = -np.inf
-            for f in fast_opts:
-                for sl in slow_opts:
-                    if sl <= f or len(train_df) < sl:
-                        continue
-                    sma_f = train_df.close.rolling(f).mean()
-                    sma_s = train_df.close.rolling(sl).mean()
-                    sig = 1 if sma_f.iloc[-1] > sma_s.iloc[-1] else 0
-                    # toy pnl proxy: last close - mean(close[-5:])
-                    pnl_proxy = float(train_df.close.iloc[-1] - train_df.close.tail(5).mean()) * sig
-                    if pnl_proxy > best_pnl:
-                        best_pnl = pnl_proxy
-                        best = (f, sl)
-            if best is None:
+        df_full = df_full.reset_index(drop=True)
+        curves = _grid_equity(df_full.close, grid)
+        n = len(df_full)
+        for start in range(0, n - train_days - test_days + 1, step_days):
+            tr = slice(start, start + train_days)
+            te = slice(start + train_days, start + train_days + test_days)
+            ok = [k for k, (_, sl) in enumerate(grid) if sl <= train_days]
+            if not ok:
                 continue
-            f_best, sl_best = best
-            # test window: simple result measure
-            sma_f_t = test_df.close.rolling(f_best).mean()
-            sma_s_t = test_df.close.rolling(sl_best).mean()
-            regime = sma_f_t > sma_s_t
-            ret = test_df.close.pct_change().fillna(0.0)
-            pnl = float((ret * regime.shift(1).fillna(False)).add(1).prod() - 1)
-            recs.append({"symbol": sym, "start": test_df.date.iloc[0], "end": test_df.date.iloc[-1],
-                         "fast": f_best, "slow": sl_best, "return": pnl})
+            train_m = equity_metrics(curves[ok, tr])
+            score = np.nan_to_num(train_m["sharpe"], nan=-np.inf)
+            best = ok[int(np.lexsort((train_m["total_return"], score))[-1])]
+            f_best, sl_best = grid[best]
+            test_m = equity_metrics(curves[best, te])
+            recs.append({"symbol": sym, "start": df_full.date.iloc[te.start], "end": df_full.date.iloc[te.stop - 1],
+                         "fast": f_best, "slow": sl_best, "return": float(test_m["total_return"][0]),
+                         "train_sharpe": float(score[ok.index(best)]),
+                         "sharpe": float(test_m["sharpe"][0]),
+                         "max_drawdown": float(test_m["max_drawdown"][0])})
     return pd.DataFrame(recs)
+
+
+def rank_walkforward(results: pd.DataFrame) -> pd.DataFrame:
+    """Per-symbol summary of walk-forward folds, best mean test Sharpe first."""
+    if results.empty:
+        return results
+    g = results.groupby("symbol")
+    out = pd.DataFrame({
+        "folds": g.size(),
+        "mean_return": g["return"].mean(),
+        "compound_return": g["return"].apply(lambda r: float((1 + r).prod() - 1)),
+        "mean_sharpe": g["sharpe"].mean(),
+        "worst_drawdown": g["max_drawdown"].min(),
+    })
+    return out.sort_values("mean_sharpe", ascending=False)
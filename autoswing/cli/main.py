@@ -1,27 +1,69 @@
+"""``autoswingctl`` command line.
+
+Commands register with nothing but typer loaded; each command imports its own
+dependencies (pandas, data sources, engine, pipeline) when it is invoked, so
+``--help`` and ``env-check`` stay fast.  ``tests/test_cli_startup.py`` keeps
+that honest with an import-time budget.
+"""
 from __future__ import annotations
 
+import json
 import sys
 import subprocess
 from pathlib import Path
 import typer
 from rich import print
 
-from autoswing.utils.env import load_env
-from autoswing.config.loader import load_accounts, load_settings
-from autoswing.data.fetch import fetch_history
-from autoswing.data.loader import load_bundle_cached
-from autoswing.strategies.sma_pullback import SMAPullbackStrategy
-from autoswing.backtest.backtester import run_backtest
-
 app = typer.Typer(help="AutoSwingUS-Pro command line")
 ROOT = Path(__file__).parents[2]
+SETTINGS_PATH = ROOT / "autoswing" / "config" / "settings_default.yaml"
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    metrics: bool = typer.Option(False, "--metrics", help="Record metrics (also AUTOSWING_METRICS=1)."),
+    profile: bool = typer.Option(False, "--profile", help="Profile the command into runtime/profiles/."),
+    profile_mode: str = typer.Option("cprofile", "--profile-mode", help="cprofile (deterministic) | sample"),
+):
+    """AutoSwingUS-Pro command line."""
+    from autoswing.utils import telemetry
+    if metrics or profile:
+        # profiling also wants the backtest phase histograms
+        telemetry.enable()
+    if telemetry.enabled():
+        ctx.call_on_close(lambda: telemetry.flush(ROOT, run=ctx.invoked_subcommand or ""))
+    if profile:
+        from autoswing.utils.profiling import Profiler
+        try:
+            prof = Profiler(ROOT, ctx.invoked_subcommand or "", mode=profile_mode)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc), param_hint="--profile-mode")
+
+        def _write_profile():
+            out = prof.stop()
+            print(f"[cyan]profile:[/cyan] {out['report']} (stacks: {out['collapsed']})")
+        # registered last so it runs first on close, before the metrics flush
+        ctx.call_on_close(_write_profile)
+        prof.start()
+
+
+def _settings():
+    from autoswing.config.loader import load_settings
+    return load_settings(SETTINGS_PATH)
+
+
+def _load_env():
+    from autoswing.utils.env import load_env
+    load_env(ROOT / ".env")
 
 
 # ------------------------------------------------------------------ env-check
 @app.command("env-check")
 def env_check():
     """Validate .env + configs; warn if broker creds missing."""
-    load_env(ROOT / ".env")
+    from autoswing.config.loader import load_accounts
+    _load_env()
     accts = load_accounts(ROOT / "autoswing" / "config" / "accounts.yaml")
     missing = {}
     for name, acct in accts.items():
@@ -44,34 +86,219 @@ def data_fetch(
     symbols: str = typer.Option(..., "--symbols", help="Comma symbols: AAPL,MSFT"),
     history: str = typer.Option("1y", "--history", help="1y,6mo,30d"),
     sources: str = typer.Option("alpaca,yahoo", "--sources", help="priority order"),
+    incremental: bool = typer.Option(False, "--incremental",
+                                     help="Only request sessions missing since each symbol's last cached bar."),
 ):
-    load_env(ROOT / ".env")
+    from autoswing.data.fetch import fetch_history
+    _load_env()
     syms = [s.strip().upper() for s in symbols.split(",") if s.strip()]
     srcs = [s.strip() for s in sources.split(",") if s.strip()]
     print(f"Fetching {history} for {syms} via {srcs}")
-    fetch_history(syms, history, srcs, ROOT)
-    print("[green]Done.[/green]")
+    done = fetch_history(syms, history, srcs, ROOT, incremental=incremental)
+    print(f"[green]Done.[/green] updated {len(done)}/{len(syms)}")
+
+
+# ------------------------------------------------------------------ data-gaps
+@app.command("data-gaps")
+def data_gaps(
+    symbols: str = typer.Option("", "--symbols", help="Comma list; default = every cached symbol."),
+    through_today: bool = typer.Option(False, "--through-today", help="Count sessions after the last bar too."),
+    show: int = typer.Option(5, "--show", help="Missing dates listed per symbol."),
+):
+    """Report sessions missing from each symbol's cached bars (equities or 24/7 crypto calendar)."""
+    from datetime import date
+    from autoswing.data.cache import CACHE_SUBDIR, cache_gaps
+    syms = [s.strip().upper() for s in symbols.split(",") if s.strip()] or \
+        sorted(p.stem for p in (ROOT / CACHE_SUBDIR).glob("*.parquet"))
+    total = 0
+    for s in syms:
+        gaps = cache_gaps(s, ROOT, end=date.today() if through_today else None)
+        if gaps is None:
+            print(f"{s}: not cached")
+        elif len(gaps):
+            total += len(gaps)
+            print(f"{s}: {len(gaps)} missing, e.g. {[str(d) for d in gaps[:show]]}")
+    print({"symbols": len(syms), "missing_sessions": total})
+
+
+# ------------------------------------------------------------------ data-ingest
+@app.command("data-ingest")
+def data_ingest(
+    replay_dir: str = typer.Option(..., "--replay-dir", help="Directory of <SYM>.csv bars to stream (stand-in feed)."),
+    interval: float = typer.Option(0.0, "--interval", help="Seconds between replayed sessions."),
+    max_batch: int = typer.Option(500, "--max-batch", help="Flush after this many buffered bars."),
+    max_delay: float = typer.Option(1.0, "--max-delay", help="Flush when the oldest buffered bar is this old (s)."),
+    no_compact: bool = typer.Option(False, "--no-compact", help="Leave delta segments for a later compaction."),
+):
+    """Stream bars into the daily cache in micro-batches (delta segments + compaction)."""
+    import asyncio
+    from autoswing.data.data_client import LocalCSVDataClient
+    from autoswing.data.ingest import BarIngestor
+    from autoswing.engine.live import ReplayFeed
+    dc = LocalCSVDataClient(replay_dir)
+    feed = ReplayFeed({s: dc.load(s) for s in dc.available()}, interval=interval)
+    if not len(feed):
+        print(f"[red]No <SYM>.csv bars under {replay_dir}[/red]")
+        raise typer.Exit(code=1)
+    ing = BarIngestor(ROOT, max_batch=max_batch, max_delay=max_delay)
+    print(asyncio.run(ing.run(feed, compact_on_close=not no_compact)))
+
+
+# ------------------------------------------------------------------ data-index
+@app.command("data-index")
+def data_index(
+    symbols: str = typer.Option("", "--symbols", help="Comma list; default = every cached symbol."),
+    days: int = typer.Option(60, "--days", help="Scan lookback used for the history gate."),
+):
+    """Refresh the per-symbol stats index and preview the pipeline prefilter."""
+    from autoswing.data.cache import CACHE_SUBDIR
+    from autoswing.data.stats_index import StatsIndex
+    from autoswing.pipeline.screen import Prefilter, screen
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    st = _settings()
+    syms = [s.strip().upper() for s in symbols.split(",") if s.strip()] or \
+        sorted(p.stem for p in (ROOT / CACHE_SUBDIR).glob("*.parquet"))
+    index = StatsIndex.for_project(ROOT)
+    rebuilt = index.refresh(syms)
+    index.save()
+    cands, rejected = screen(index.frame(), syms, Prefilter.from_settings(st.screen.model_dump(),
+                                                                         SMAPullbackStrategy(), days))
+    print({"symbols": len(syms), "rebuilt": rebuilt, "candidates": len(cands), "rejected": rejected})
+
+
+# ------------------------------------------------------------------ data-features
+@app.command("data-features")
+def data_features(
+    symbols: str = typer.Option("", "--symbols", help="Comma list; default = every cached symbol."),
+    features: str = typer.Option("", "--features",
+                                 help="Comma list like sma_20,atr_14; default = the strategy's features."),
+):
+    """Build or extend the stored indicator columns next to the daily cache."""
+    from collections import Counter
+    from autoswing.data.cache import CACHE_SUBDIR
+    from autoswing.data.features import ensure_features, parse_feature
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    syms = [s.strip().upper() for s in symbols.split(",") if s.strip()] or \
+        sorted(p.stem for p in (ROOT / CACHE_SUBDIR).glob("*.parquet"))
+    names = [f.strip() for f in features.split(",") if f.strip()] or list(SMAPullbackStrategy().features)
+    try:
+        for n in names:
+            parse_feature(n)
+    except ValueError as e:
+        print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1)
+    done = Counter(ensure_features(s, names, ROOT) for s in syms)
+    print({"symbols": len(syms), "features": names, **done})
 
 
 # ------------------------------------------------------------------ paper-backtest
 @app.command("paper-backtest")
-def paper_backtest(days: int = typer.Option(365, "--days", help="Lookback days from cache")):
-    load_env(ROOT / ".env")
-    st = load_settings(ROOT / "autoswing" / "config" / "settings_default.yaml")
-    bundle = load_bundle_cached(st.universe, days, ROOT)
+def paper_backtest(
+    days: int = typer.Option(365, "--days", help="Lookback days from cache"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore memoized results and re-run."),
+    cache_max_mb: int = typer.Option(256, "--cache-max-mb", help="LRU size cap for memoized results."),
+    chunk_sessions: int = typer.Option(0, "--chunk-sessions",
+                                       help="Stream the cache in blocks of this many sessions (0 = load it all); "
+                                            "warm-up bars are read from before --days."),
+):
+    if chunk_sessions > 0:
+        _paper_backtest_chunked(days, chunk_sessions)
+        return
+    from autoswing.data.loader import load_bundle_cached
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    from autoswing.backtest.backtester import run_backtest
+    from autoswing.backtest.result_cache import ResultCache
+    from autoswing.data.calendar import calendar_for_symbols
+    from autoswing.engine.compliance import Compliance
+    from autoswing.engine.correlation import CorrelationLimit
+    from autoswing.engine.fills import FillModel
+    _load_env()
+    st = _settings()
+    strat = SMAPullbackStrategy()
+    bundle = load_bundle_cached(st.universe, days, ROOT, features=strat.features if st.pipeline.feature_store else ())
     if not bundle:
         print("[red]No cached data. Run data-fetch or seed-ccxt first.[/red]")
         raise typer.Exit(code=1)
-    strat = SMAPullbackStrategy()
-    pf = run_backtest(bundle, strat, starting_cash=1000)
+    cache = None if no_cache else ResultCache.for_project(ROOT, max_bytes=cache_max_mb * 1024 * 1024)
+    pf = run_backtest(bundle, strat, starting_cash=1000, project_root=ROOT, cache=cache, settings=st,
+                      fill_model=FillModel.from_settings(st),
+                      compliance=Compliance.from_settings(st, 1000, log_only=True,
+                                                          calendar=calendar_for_symbols(bundle)),
+                      correlation=CorrelationLimit.from_settings(st))
     print(f"Equity: {pf.equity():.2f}")
+    print({k: round(v, 4) for k, v in pf.metrics().items()})
+    print({"compliance": pf.account.compliance.summary()})
+
+
+def _paper_backtest_chunked(days: int, chunk_sessions: int):
+    """paper-backtest over the last *days* sessions without loading the universe into memory."""
+    from datetime import date, timedelta
+    import pandas as pd
+    from autoswing.analysis.metrics import backtest_metrics
+    from autoswing.data.calendar import calendar_for_symbols
+    from autoswing.engine.compliance import Compliance
+    from autoswing.engine.correlation import CorrelationLimit
+    from autoswing.engine.fills import FillModel
+    from autoswing.engine.paper_executor import run_chunked_backtest
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    _load_env()
+    st = _settings()
+    strat = SMAPullbackStrategy()
+    start = calendar_for_symbols(st.universe).next_session(date.today() + timedelta(days=1), -days)
+    final_eq, trades, acct = run_chunked_backtest(
+        st.universe, strat, 1000, ROOT, chunk_sessions=chunk_sessions, start=start,
+        features=strat.features if st.pipeline.feature_store else (),
+        max_hold_days=strat.max_hold_days, project_root=ROOT, fill_model=FillModel.from_settings(st),
+        compliance=Compliance.from_settings(st, 1000, log_only=True, calendar=calendar_for_symbols(st.universe)),
+        correlation=CorrelationLimit.from_settings(st))
+    if not acct.equity_curve:
+        print("[red]No cached data. Run data-fetch or seed-ccxt first.[/red]")
+        raise typer.Exit(code=1)
+    dts, vals = zip(*acct.equity_curve)
+    curve = pd.Series(vals, index=pd.Index(dts, name="date"), name="equity", dtype=float)
+    print(f"Equity: {final_eq:.2f}")
+    print({k: round(v, 4) for k, v in backtest_metrics(curve, trades).items()})
+    print({"compliance": acct.compliance.summary()})
 
 
 # ------------------------------------------------------------------ paper-run (alias)
 @app.command("paper-run")
 def paper_run():
     """Alias: paper-backtest 30d."""
-    paper_backtest(days=30)
+    paper_backtest(days=30, no_cache=False, cache_max_mb=256, chunk_sessions=0)
+
+
+# ------------------------------------------------------------------ paper-live
+@app.command("paper-live")
+def paper_live(
+    feed: str = typer.Option("replay", "--feed", help="Bar source (replay = cached parquet bars)."),
+    days: int = typer.Option(365, "--days", help="Sessions of cached history to replay."),
+    symbols: str = typer.Option("", "--symbols", help="Comma symbols; blank=universe from settings"),
+    interval: float = typer.Option(0.0, "--interval", help="Seconds between replayed sessions (0 = max speed)."),
+    broker_delay: float = typer.Option(0.0, "--broker-delay", help="Simulated broker round trip, seconds."),
+):
+    """Event-driven paper trading on a bar stream; reports throughput and latency."""
+    if feed != "replay":
+        raise typer.BadParameter("only the 'replay' feed is available", param_hint="--feed")
+    from autoswing.data.loader import load_bundle_cached
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    from autoswing.data.calendar import calendar_for_symbols
+    from autoswing.engine.compliance import Compliance
+    from autoswing.engine.live import run_replay
+    _load_env()
+    st = _settings()
+    syms = [s.strip().upper() for s in symbols.split(",") if s.strip()] or st.universe
+    bundle = load_bundle_cached(syms, days, ROOT)
+    if not bundle:
+        print("[red]No cached data. Run data-fetch or seed-ccxt first.[/red]")
+        raise typer.Exit(code=1)
+    eq, trades, acct, stats = run_replay(bundle, SMAPullbackStrategy(), starting_cash=1000, interval=interval,
+                                         broker_delay=broker_delay, project_root=ROOT,
+                                         compliance=Compliance.from_settings(
+                                             st, 1000, calendar=calendar_for_symbols(bundle)))
+    print(f"Equity: {eq:.2f}  trades: {len(trades)}")
+    print(stats.summary())
+    print({"compliance": acct.compliance.summary()})
 
 
 # ------------------------------------------------------------------ seed-ccxt
@@ -106,6 +333,8 @@ def seed_ccxt(
     rc = subprocess.call(cmd)
     raise typer.Exit(code=rc)
 
+
+# ------------------------------------------------------------------ ui
 @app.command("ui")
 def ui(
     port: int = typer.Option(8501, "--port", help="Streamlit port"),
@@ -124,29 +353,33 @@ def ui(
     print(f"[cyan]Launching UI: {' '.join(cmd)}[/cyan]")
     subprocess.call(cmd)
 
-def run():
-    app()
-
-
-if __name__ == "__main__":
-    run()
-
-
-from autoswing.pipeline.daily import run_pipeline
-from autoswing.backtest.walkforward import walkforward
-from autoswing.analysis.montecarlo import bootstrap_pnl
-import pandas as pd
-import json
-import subprocess
 
+# ------------------------------------------------------------------ pipeline-daily
 @app.command("pipeline-daily")
 def pipeline_daily(
     days: int = typer.Option(60, "--days", help="Lookback days for signals"),
     auto_push: bool = typer.Option(False, "--auto-push", help="Git add/push logs"),
+    force: bool = typer.Option(False, "--force", help="Re-run every stage even if inputs are unchanged."),
+    verify_snapshot: bool = typer.Option(False, "--verify-snapshot",
+                                         help="Check the incremental account against a full replay."),
 ):
-    eq = run_pipeline(days=days, auto_push=auto_push)
-    print(f"Final equity: {eq:.2f}")
+    from autoswing.pipeline.daily import run_daily
+    run = run_daily(days=days, auto_push=auto_push, force=force, verify_snapshot=verify_snapshot)
+    for name, secs in run.timings.items():
+        state = "ran" if name in run.ran else "skipped"
+        print(f"  {name:<10} {state:<8} {secs:6.2f}s")
+    print(f"Final equity: {run.artifacts['equity']:.2f}")
+    snap = run.artifacts.get("snapshot")
+    if snap is not None:
+        print({k: v for k, v in snap.items() if k != "verify"})
+        if "verify" in snap:
+            print(snap["verify"])
+            if not snap["verify"]["ok"]:
+                print("[red]Incremental state diverged from a full replay.[/red]")
+                raise typer.Exit(code=1)
+
 
+# ------------------------------------------------------------------ walkforward
 @app.command("walkforward")
 def cli_walkforward(
     symbols: str = typer.Option("", "--symbols", help="Comma symbols; blank=equities from settings"),
@@ -154,32 +387,114 @@ def cli_walkforward(
     test: int = typer.Option(30, "--test"),
     step: int = typer.Option(30, "--step"),
 ):
-    from autoswing.config.loader import load_settings
-    ROOT = Path(__file__).parents[2]
-    st = load_settings(ROOT / "autoswing" / "config" / "settings_default.yaml")
+    from autoswing.backtest.walkforward import walkforward, rank_walkforward
+    st = _settings()
     syms = [s.strip().upper() for s in symbols.split(",") if s.strip()] or st.universe_equities
     df = walkforward(syms, train_days=train, test_days=test, step_days=step, root=ROOT)
     out = ROOT / "runtime/logs" / "walkforward_results.csv"
+    out.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(out, index=False)
     print(f"Saved walkforward results: {out} ({len(df)} rows)")
+    if not df.empty:
+        print(rank_walkforward(df).round(4).to_string())
+
+
+# ------------------------------------------------------------------ param-search
+@app.command("param-search")
+def cli_param_search(
+    symbols: str = typer.Option("", "--symbols", help="Comma symbols; blank=universe from settings"),
+    days: int = typer.Option(1000, "--days", help="Lookback days from cache"),
+    configs: int = typer.Option(27, "--configs", help="Configurations sampled from the grid (0 = all)."),
+    eta: int = typer.Option(3, "--eta", help="Budget growth / survivor cut per rung."),
+    fold_days: int = typer.Option(60, "--fold-days", help="Sessions per walk-forward fold."),
+    workers: int = typer.Option(1, "--workers", help="Worker processes per rung."),
+    seed: int = typer.Option(0, "--seed", help="Seed for config sampling and symbol order."),
+    grid: bool = typer.Option(False, "--grid", help="Exhaustive search instead of successive halving."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore memoized results and re-run."),
+):
+    """Search SMAPullbackStrategy parameters on walk-forward folds (successive halving)."""
+    from autoswing.data.loader import load_bundle_cached
+    from autoswing.backtest.result_cache import ResultCache
+    from autoswing.backtest.search import grid_search, successive_halving
+    st = _settings()
+    syms = [s.strip().upper() for s in symbols.split(",") if s.strip()] or st.universe
+    bundle = load_bundle_cached(syms, days, ROOT)
+    if not bundle:
+        print("[red]No cached data. Run data-fetch or seed-ccxt first.[/red]")
+        raise typer.Exit(code=1)
+    logs = ROOT / "runtime/logs"
+    kw = dict(n_configs=configs or None, fold_days=fold_days, seed=seed, workers=workers,
+              cache=None if no_cache else ResultCache.for_project(ROOT), audit_path=logs / "search_audit.csv")
+    try:
+        res = grid_search(bundle, **kw) if grid else successive_halving(
+            bundle, eta=eta, progress=lambda f, m: print(f"[cyan]{m}[/cyan]"), **kw)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--fold-days")
+    out = logs / "param_search_leaderboard.csv"
+    res.leaderboard.to_csv(out, index=False)
+    print(f"Saved leaderboard: {out} (audit: {logs / 'search_audit.csv'})")
+    print(res.leaderboard.head(10).round(4).to_string())
+    print({"best": res.best, "backtests": res.backtests, "symbol_folds": res.symbol_folds,
+           "seconds": round(res.seconds, 1)})
 
+
+# ------------------------------------------------------------------ montecarlo
 @app.command("montecarlo")
 def cli_montecarlo(
-    iters: int = typer.Option(5000, "--iters", help="Bootstrap iterations."),
+    iters: int = typer.Option(5000, "--iters", min=1, help="Bootstrap iterations."),
     start: float = typer.Option(1000.0, "--start", help="Starting cash for simulation."),
+    workers: int = typer.Option(1, "--workers", help="Worker processes (iterations are sharded)."),
+    seed: int = typer.Option(None, "--seed", help="Root seed for reproducible runs."),
 ):
-    """Bootstrap Monte Carlo on recorded trade PnLs (Phase‑2B minimal)."""
-    res = bootstrap_pnl(iters=iters, starting_cash=start)
+    """Bootstrap Monte Carlo on recorded trade PnLs (sharded, constant memory)."""
+    from autoswing.analysis.montecarlo import parallel_bootstrap
+    res = parallel_bootstrap(iters=iters, starting_cash=start, workers=workers, seed=seed)
     print(res)
 
-@app.command("ui")
-def cli_ui(
-    port: int = typer.Option(8501, "--port", help="Streamlit port"),
-    open_browser: bool = typer.Option(False, "--open-browser/--no-open-browser", help="Launch browser automatically."),
+
+# ------------------------------------------------------------------ daemon
+@app.command("daemon")
+def cli_daemon(
+    socket_path: str = typer.Option(None, "--socket", help="Control socket (default runtime/daemon.sock)."),
+    no_schedule: bool = typer.Option(False, "--no-schedule", help="Only serve triggered jobs."),
+    days: int = typer.Option(60, "--days", help="Lookback days for the scheduled pipeline run."),
 ):
-    ROOT = Path(__file__).parents[2]
-    script = ROOT / "autoswing" / "ui" / "app.py"
-    cmd = ["streamlit", "run", str(script), "--server.port", str(port)]
-    if not open_browser:
-        cmd += ["--server.headless", "true", "--browser.gatherUsageStats", "false"]
-    subprocess.call(cmd)
+    """Run the resident scheduler: warm data, daily pipeline at pipeline.daily_run_time_local."""
+    from autoswing.daemon import Daemon, DailySchedule
+    st = _settings()
+    sched = None if no_schedule else DailySchedule.parse(st.pipeline.daily_run_time_local)
+    d = Daemon(ROOT, socket_path=Path(socket_path) if socket_path else None, schedule=sched,
+               scheduled_args={"days": days, "auto_push": st.pipeline.auto_push})
+    print(f"[cyan]daemon listening on {d.socket_path}[/cyan]")
+    d.serve_forever()
+
+
+@app.command("daemon-ctl")
+def cli_daemon_ctl(
+    cmd: str = typer.Argument(..., help="ping|status|run|stop"),
+    job: str = typer.Argument(None, help="Job name for 'run' (pipeline-daily, paper-backtest, montecarlo, walkforward)."),
+    args: str = typer.Option("{}", "--args", help="JSON object of job keyword arguments."),
+    wait: bool = typer.Option(True, "--wait/--no-wait", help="Block until the job finishes."),
+    socket_path: str = typer.Option(None, "--socket", help="Control socket (default runtime/daemon.sock)."),
+):
+    """Send a command to a running daemon."""
+    from autoswing.daemon.server import SOCKET_PATH, request
+    payload = {"cmd": cmd}
+    if cmd == "run":
+        payload.update(job=job, args=json.loads(args), wait=wait)
+    try:
+        resp = request(Path(socket_path) if socket_path else ROOT / SOCKET_PATH, payload)
+    except OSError as exc:
+        print(f"[red]daemon not reachable: {exc}[/red]")
+        raise typer.Exit(code=1)
+    print(resp)
+    if not resp.get("ok") or resp.get("state") == "failed":
+        raise typer.Exit(code=1)
+
+
+def run():
+    app()
+
+
+if __name__ == "__main__":
+    run()
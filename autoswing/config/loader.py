@@ -17,6 +17,49 @@ class AccountConfig(BaseModel):
     active: bool = True  # auto‑disabled if creds missing
 
 
+class PipelineSettings(BaseModel):
+    daily_run_time_local: str = "19:15 America/Los_Angeles"  # "HH:MM [IANA zone]"
+    auto_push: bool = False
+    workers: Optional[int] = None        # per-symbol scan workers (None = cpu count)
+    executor: str = "process"            # "process" | "thread" for the per-symbol scan
+    memory_budget_mb: float = 1024       # caps concurrent per-symbol frames
+    fetch_workers: int = 4               # concurrent symbol downloads
+    incremental: bool = True             # execution resumes the account snapshot instead of a full replay
+    feature_store: bool = False          # scan and backtests read stored indicator columns (autoswing.data.features)
+
+
+class ExecutionSettings(BaseModel):
+    """Backtest fill model (see :class:`autoswing.engine.fills.FillModel`)."""
+    limit_offset_bps: float = 0.0      # limit entries rest this far below the signal close
+    stop_offset_bps: float = 0.0       # stop entries trigger this far above it
+    stop_limit_bps: float = 50.0       # stop_limit: limit this far beyond the trigger
+    exit_type: str = "market"          # timed exits: "market" (next open) | "close"
+    gap_fill: str = "open"             # "open" (gaps fill at the open) | "order"
+    slippage_bps: float = 0.0          # adverse, market/stop fills only
+    participation: Optional[float] = None  # max fraction of bar volume per fill
+    ttl_bars: int = 1                  # sessions an unfilled entry rests
+    protective_stops: bool = False     # sell stop at the signal's stop once filled
+
+
+class ScreenSettings(BaseModel):
+    """Prefilter gates ahead of the strategy scan (see :mod:`autoswing.pipeline.screen`)."""
+    min_price: Optional[float] = 1.0
+    max_price: Optional[float] = None
+    min_adv_usd: Optional[float] = 1_000_000   # mean close * volume, last 20 bars
+    min_bars: Optional[int] = None             # None = strategy warmup
+    min_volatility: Optional[float] = None     # daily log-return stdev
+    max_volatility: Optional[float] = None
+    max_stale_days: Optional[int] = 10
+
+
+class CorrelationSettings(BaseModel):
+    """Entry limit on return correlation with holdings (see :mod:`autoswing.engine.correlation`)."""
+    max_corr: Optional[float] = None     # None = no limit
+    window: Optional[int] = 60           # sessions of daily returns
+    halflife: Optional[float] = None     # exponential weighting instead of the window
+    min_periods: int = 20
+
+
 class Settings(BaseModel):
     timeframe: str = "1d"
     run_schedule: str = "after_close"
@@ -25,7 +68,14 @@ class Settings(BaseModel):
     max_positions: int = 5
     enforce_cash_settlement: bool = True
     warn_pdt_trades: bool = True
-    default_order_type: str = "limit"
+    default_order_type: str = "limit"    # close | market | limit | stop | stop_limit
+    universe_equities: List[str] = Field(default_factory=list)
+    universe_crypto: List[str] = Field(default_factory=list)
+    adaptive_universe: bool = False
+    pipeline: PipelineSettings = Field(default_factory=PipelineSettings)
+    execution: ExecutionSettings = Field(default_factory=ExecutionSettings)
+    screen: ScreenSettings = Field(default_factory=ScreenSettings)
+    correlation: CorrelationSettings = Field(default_factory=CorrelationSettings)
 
 
 def _expand_env(val: str):
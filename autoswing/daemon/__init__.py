@@ -0,0 +1,3 @@
+"""Resident scheduler daemon (``autoswingctl daemon``)."""
+from .scheduler import DailySchedule  # noqa: F401
+from .server import Daemon, JOBS, request, ping  # noqa: F401
@@ -0,0 +1,33 @@
+"""Daily wall-clock schedule parsing (``"19:15 America/Los_Angeles"``)."""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, tzinfo
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+
+@dataclass(frozen=True)
+class DailySchedule:
+    at: time
+    tz: Optional[tzinfo] = None  # None = host local time
+
+    @classmethod
+    def parse(cls, spec: str) -> "DailySchedule":
+        parts = spec.split()
+        if not parts:
+            raise ValueError("empty schedule")
+        hh, mm = parts[0].split(":")
+        tz = ZoneInfo(parts[1]) if len(parts) > 1 else None
+        return cls(time(int(hh), int(mm)), tz)
+
+    def next_after(self, now: datetime) -> datetime:
+        """Next fire time strictly after *now* (aware *now* is converted)."""
+        local = now.astimezone(self.tz) if self.tz else now
+        cand = local.replace(hour=self.at.hour, minute=self.at.minute, second=0, microsecond=0)
+        if cand <= local:
+            cand = (cand + timedelta(days=1)).replace(hour=self.at.hour, minute=self.at.minute)
+        return cand
+
+    def seconds_until(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now().astimezone()
+        return max(0.0, self.next_after(now).timestamp() - now.timestamp())
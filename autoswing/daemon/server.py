@@ -0,0 +1,283 @@
+"""Resident AutoSwing process: warm imports/data, daily schedule, control socket.
+
+Jobs run inside this long-lived interpreter, so a trigger only pays for the
+work itself — pandas/alpaca/yfinance are imported once, settings are parsed
+once, and cache frames stay in :data:`autoswing.data.loader.MEMO` until the
+file on disk changes.
+
+The control socket speaks one JSON object per line::
+
+    {"cmd": "run", "job": "pipeline-daily", "args": {"days": 60}, "wait": true}
+    {"cmd": "status"} | {"cmd": "ping"} | {"cmd": "stop"}
+"""
+from __future__ import annotations
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from autoswing.daemon.scheduler import DailySchedule
+
+ROOT = Path(__file__).parents[2]
+SOCKET_PATH = "runtime/daemon.sock"
+JOB_HISTORY = 100   # finished job records kept for status/wait
+
+
+# ---------------------------------------------------------------------------
+# Jobs (resolved lazily so the registry itself imports nothing heavy)
+#
+# Every job takes ``(root, **args, progress=None)``; *progress* is called as
+# ``progress(fraction, message)`` and may raise to cancel the job.  The UI's
+# :class:`autoswing.ui.jobs.JobRunner` runs the same registry.
+# ---------------------------------------------------------------------------
+
+def _job_pipeline_daily(root: Path, **args) -> dict:
+    # run_daily always works on the package root (autoswing.pipeline.daily.ROOT), not *root*
+    from autoswing.pipeline.daily import run_daily
+    run = run_daily(**args)
+    return {"ran": run.ran, "skipped": run.skipped, "equity": float(run.artifacts["equity"]),
+            "timings": run.timings}
+
+
+def _job_paper_backtest(root: Path, days: int = 365, use_cache: bool = True, progress=None) -> dict:
+    from autoswing.config.loader import load_settings
+    from autoswing.data.loader import load_bundle_cached
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    from autoswing.backtest.backtester import run_backtest
+    from autoswing.backtest.result_cache import ResultCache
+    from autoswing.data.calendar import calendar_for_symbols
+    from autoswing.engine.compliance import Compliance
+    from autoswing.engine.correlation import CorrelationLimit
+    from autoswing.engine.fills import FillModel
+    st = load_settings(root / "autoswing" / "config" / "settings_default.yaml")
+    strat = SMAPullbackStrategy()
+    bundle = load_bundle_cached(st.universe, days, root, features=strat.features if st.pipeline.feature_store else ())
+    if not bundle:
+        raise RuntimeError("no cached data")
+    cache = ResultCache.for_project(root) if use_cache else None
+    pf = run_backtest(bundle, strat, starting_cash=1000, project_root=root,
+                      cache=cache, settings=st, progress=progress, fill_model=FillModel.from_settings(st),
+                      compliance=Compliance.from_settings(st, 1000, log_only=True,
+                                                          calendar=calendar_for_symbols(bundle)),
+                      correlation=CorrelationLimit.from_settings(st))
+    return {"equity": pf.equity(), "metrics": pf.metrics(), "compliance": pf.account.compliance.summary()}
+
+
+def _job_walkforward(root: Path, symbols=None, train: int = 180, test: int = 30, step: int = 30,
+                     progress=None) -> dict:
+    from autoswing.config.loader import load_settings
+    from autoswing.backtest.walkforward import walkforward
+    st = load_settings(root / "autoswing" / "config" / "settings_default.yaml")
+    syms = [s.upper() for s in symbols] if symbols else st.universe_equities
+    df = walkforward(syms, train_days=train, test_days=test, step_days=step, root=root, progress=progress)
+    out = root / "runtime/logs" / "walkforward_results.csv"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(out, index=False)
+    return {"rows": len(df), "path": str(out)}
+
+
+def _job_montecarlo(root: Path, **args) -> dict:
+    from autoswing.analysis.montecarlo import parallel_bootstrap
+    return parallel_bootstrap(**args)
+
+
+JOBS: Dict[str, Callable[..., dict]] = {
+    "pipeline-daily": _job_pipeline_daily,
+    "paper-backtest": _job_paper_backtest,
+    "montecarlo": _job_montecarlo,
+    "walkforward": _job_walkforward,
+}
+
+
+def warm_up():
+    """Import the heavy modules once, up front."""
+    import autoswing.pipeline.daily  # noqa: F401  (pulls pandas, data sources, engine)
+    import autoswing.analysis.montecarlo  # noqa: F401
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+class Daemon:
+    """Job queue + worker thread + scheduler thread + Unix control socket."""
+
+    def __init__(self, root: Path = ROOT, socket_path: Optional[Path] = None,
+                 schedule: Optional[DailySchedule] = None, scheduled_job: str = "pipeline-daily",
+                 scheduled_args: Optional[dict] = None, history: int = JOB_HISTORY):
+        self.root = Path(root)
+        self.socket_path = Path(socket_path or self.root / SOCKET_PATH)
+        self.schedule = schedule
+        self.scheduled_job = scheduled_job
+        self.scheduled_args = scheduled_args or {}
+        self.history = max(1, int(history))
+        self.jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._done: Dict[str, threading.Event] = {}
+        self._server: Optional[socketserver.UnixStreamServer] = None
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+
+    # --- jobs -------------------------------------------------------------
+    def submit(self, job: str, args: Optional[dict] = None, source: str = "socket") -> str:
+        if job not in JOBS:
+            raise KeyError(f"unknown job {job!r}; known: {sorted(JOBS)}")
+        jid = uuid.uuid4().hex[:12]
+        with self._lock:
+            self.jobs[jid] = {"id": jid, "job": job, "args": args or {}, "source": source,
+                              "state": "queued", "queued": time.perf_counter()}
+            self._done[jid] = threading.Event()
+        self._queue.put(jid)
+        return jid
+
+    def wait(self, jid: str, timeout: Optional[float] = None) -> dict:
+        with self._lock:
+            rec, done = self.jobs[jid], self._done[jid]
+        done.wait(timeout)
+        return self._public(rec)
+
+    def public(self, jid: str) -> dict:
+        return self._public(self.jobs[jid])
+
+    @staticmethod
+    def _public(rec: dict) -> dict:
+        return {k: v for k, v in rec.items() if k not in ("queued",)}
+
+    def recent(self, limit: int = 20) -> list:
+        with self._lock:
+            recs = list(self.jobs.values())[-limit:]
+        return [self._public(r) for r in recs]
+
+    def _prune(self):
+        """Drop the oldest finished records beyond :attr:`history` (queued/running ones stay)."""
+        with self._lock:
+            finished = [j for j, r in self.jobs.items() if r["state"] in ("done", "failed")]
+            for j in finished[:max(0, len(finished) - self.history)]:
+                del self.jobs[j]
+                del self._done[j]
+
+    def _worker(self):
+        while True:
+            jid = self._queue.get()
+            if jid is None:
+                return
+            rec = self.jobs[jid]
+            rec["state"] = "running"
+            rec["start_latency_ms"] = round((time.perf_counter() - rec["queued"]) * 1000, 3)
+            t0 = time.perf_counter()
+
+            def _progress(frac: float, msg: str = "", rec=rec):
+                rec["progress"] = round(frac, 3)
+                rec["message"] = msg
+            try:
+                rec["result"] = JOBS[rec["job"]](self.root, **rec["args"], progress=_progress)
+                rec["state"] = "done"
+            except Exception as exc:
+                rec["state"] = "failed"
+                rec["error"] = f"{type(exc).__name__}: {exc}"
+                rec["traceback"] = traceback.format_exc()
+            rec["seconds"] = round(time.perf_counter() - t0, 3)
+            from autoswing.utils import telemetry
+            telemetry.histogram("autoswing_daemon_job_seconds", "Daemon job wall time", job=rec["job"],
+                                state=rec["state"]).observe(rec["seconds"])
+            telemetry.flush(self.root, run=rec["job"])
+            self._done[jid].set()
+            self._prune()
+
+    def _scheduler(self):
+        while not self._stop.is_set():
+            wait_s = self.schedule.seconds_until()
+            if self._stop.wait(wait_s):
+                return
+            self.submit(self.scheduled_job, self.scheduled_args, source="schedule")
+
+    # --- control socket ---------------------------------------------------
+    def handle(self, req: dict) -> dict:
+        cmd = req.get("cmd")
+        if cmd == "ping":
+            return {"ok": True, "pid": os.getpid(), "started_at": self.started_at}
+        if cmd == "status":
+            nxt = self.schedule.next_after(datetime.now().astimezone()).isoformat() if self.schedule else None
+            return {"ok": True, "next_scheduled": nxt, "queued": self._queue.qsize(),
+                    "jobs": self.recent()}
+        if cmd == "run":
+            try:
+                jid = self.submit(req["job"], req.get("args"))
+            except KeyError as exc:
+                return {"ok": False, "error": str(exc)}
+            if req.get("wait"):
+                return {"ok": True, **self.wait(jid)}
+            return {"ok": True, "id": jid}
+        if cmd == "stop":
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown cmd {cmd!r}"}
+
+    def serve_forever(self):
+        warm_up()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if ping(self.socket_path) is not None:
+                raise RuntimeError(f"daemon already running on {self.socket_path}")
+            self.socket_path.unlink()
+        daemon = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        resp = daemon.handle(json.loads(line))
+                    except Exception as exc:
+                        resp = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+                    self.wfile.write((json.dumps(resp, default=str) + "\n").encode())
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), _Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._worker, name="asw-worker", daemon=True).start()
+        if self.schedule is not None:
+            threading.Thread(target=self._scheduler, name="asw-scheduler", daemon=True).start()
+        try:
+            self._server.serve_forever(poll_interval=0.2)
+        finally:
+            self._server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def stop(self):
+        self._stop.set()
+        self._queue.put(None)
+        if self._server is not None:
+            self._server.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+def request(socket_path: Path, payload: dict, timeout: Optional[float] = None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(socket_path))
+        s.sendall((json.dumps(payload) + "\n").encode())
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf)
+
+
+def ping(socket_path: Path) -> Optional[dict]:
+    try:
+        return request(socket_path, {"cmd": "ping"}, timeout=2.0)
+    except OSError:
+        return None
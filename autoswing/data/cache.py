@@ -1,29 +1,140 @@
+"""Per-symbol daily bar cache.
+
+Each symbol has a base parquet file (``runtime/data_cache/daily/<SYM>.parquet``)
+plus optional *delta segments* under ``_delta/<SYM>/`` written by streaming
+ingestion (:mod:`autoswing.data.ingest`).  A segment is a small parquet of
+new bars, published with an atomic rename; readers merge base + segments
+(later rows win per ``date``), so fresh bars are visible without rewriting
+the base file.  :func:`compact_daily_cache` folds segments back into it.
+"""
 from __future__ import annotations
+import os
+import tempfile
+import time
 from pathlib import Path
+from typing import List, Optional, Sequence
 import pandas as pd
+from autoswing.utils import telemetry
 
 CACHE_SUBDIR = "runtime/data_cache/daily"
+DELTA_DIRNAME = "_delta"
 
 
 def _cache_path(symbol: str, project_root: Path) -> Path:
     return Path(project_root) / CACHE_SUBDIR / f"{symbol.upper()}.parquet"
 
 
+def _delta_dir(symbol: str, project_root: Path) -> Path:
+    return Path(project_root) / CACHE_SUBDIR / DELTA_DIRNAME / symbol.upper()
+
+
 def ensure_cache_dir(project_root: Path):
     (Path(project_root) / CACHE_SUBDIR).mkdir(parents=True, exist_ok=True)
 
 
-def read_daily_cache(symbol: str, project_root: Path) -> pd.DataFrame | None:
+def delta_segments(symbol: str, project_root: Path) -> List[Path]:
+    """Published segments for *symbol*, oldest first."""
+    d = _delta_dir(symbol, project_root)
+    if not d.is_dir():
+        return []
+    return sorted(p for p in d.iterdir() if p.suffix == ".parquet")
+
+
+def cache_files(symbol: str, project_root: Path) -> List[Path]:
+    """Base file (if present) followed by its delta segments."""
     fp = _cache_path(symbol, project_root)
-    if not fp.exists():
-        return None
-    return pd.read_parquet(fp)
+    return ([fp] if fp.exists() else []) + delta_segments(symbol, project_root)
 
 
-def write_daily_cache(symbol: str, df: pd.DataFrame, project_root: Path):
-    ensure_cache_dir(project_root)
+def cache_signature(symbol: str, project_root: Path) -> tuple:
+    """Cheap change detector over base + segments: ``(name, mtime_ns, size)`` each."""
+    out = []
+    for p in cache_files(symbol, project_root):
+        try:
+            st = p.stat()
+        except FileNotFoundError:  # compacted away meanwhile
+            continue
+        out.append((p.name, st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def _atomic_parquet(df: pd.DataFrame, fp: Path):
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=fp.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, fp)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _date_filters(start=None, end=None) -> Optional[list]:
+    filters = []
+    if start is not None:
+        filters.append(("date", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("date", "<=", pd.Timestamp(end)))
+    return filters or None
+
+
+def _read_merged(symbol: str, project_root: Path, start=None, end=None, columns=None):
+    """(frame or None, segments read); segments override base rows per date."""
     fp = _cache_path(symbol, project_root)
-    df.to_parquet(fp, index=False)
+    segs = delta_segments(symbol, project_root)
+    if columns is not None and "date" not in columns:
+        columns = ["date", *columns]
+    filters = _date_filters(start, end)
+    parts, nbytes, used = [], 0, []
+    for p in ([fp] if fp.exists() else []) + segs:
+        try:
+            parts.append(pd.read_parquet(p, columns=columns, filters=filters))
+            nbytes += p.stat().st_size
+        except FileNotFoundError:  # compacted between listing and reading
+            continue
+        if p != fp:
+            used.append(p)
+    if not parts:
+        return None, used
+    telemetry.counter("autoswing_cache_bytes_read_total", "Parquet bytes read").inc(nbytes)
+    if len(parts) == 1:
+        return parts[0], used
+    df = pd.concat(parts, ignore_index=True)
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.drop_duplicates(subset="date", keep="last").sort_values("date").reset_index(drop=True)
+    return df, used
+
+
+def read_daily_cache(symbol: str, project_root: Path, start=None, end=None,
+                     columns: Optional[Sequence[str]] = None) -> pd.DataFrame | None:
+    """Merged bars of *symbol*, optionally only ``start <= date <= end`` and *columns* (plus ``date``).
+
+    The date range is pushed down to the parquet reader, so row groups
+    outside it are skipped rather than loaded and dropped.
+    """
+    df, _ = _read_merged(symbol, project_root, start, end, columns)
+    telemetry.counter("autoswing_cache_reads_total", "Daily cache reads",
+                      result="miss" if df is None else "hit").inc()
+    return df
+
+
+def write_daily_cache(symbol: str, df: pd.DataFrame, project_root: Path,
+                      consumed: Sequence[Path] = ()):
+    """Atomically replace the base file; *consumed* segments are then removed."""
+    ensure_cache_dir(project_root)
+    _atomic_parquet(df, _cache_path(symbol, project_root))
+    for p in consumed:
+        p.unlink(missing_ok=True)
+
+
+def append_daily_cache(symbol: str, df: pd.DataFrame, project_root: Path) -> Optional[Path]:
+    """Publish *df* as a new delta segment (one small file; base untouched)."""
+    if df is None or df.empty:
+        return None
+    fp = _delta_dir(symbol, project_root) / f"{time.time_ns():020d}-{os.getpid()}.parquet"
+    _atomic_parquet(df, fp)
+    return fp
 
 
 def merge_with_cache(symbol: str, newdf: pd.DataFrame, project_root: Path) -> pd.DataFrame:
@@ -34,3 +145,38 @@ def merge_with_cache(symbol: str, newdf: pd.DataFrame, project_root: Path) -> pd
     combo = pd.concat([old, newdf], ignore_index=True)
     combo = combo.drop_duplicates(subset="date", keep="last").sort_values("date")
     return combo
+
+
+def upsert_daily_cache(symbol: str, newdf: pd.DataFrame | None, project_root: Path) -> pd.DataFrame | None:
+    """Merge *newdf* into base + segments, rewrite the base, drop the merged segments."""
+    old, used = _read_merged(symbol, project_root)
+    parts = [p for p in (old, newdf) if p is not None and not p.empty]
+    if not parts:
+        return None
+    combo = pd.concat(parts, ignore_index=True)
+    combo["date"] = pd.to_datetime(combo["date"])
+    combo = combo.drop_duplicates(subset="date", keep="last").sort_values("date").reset_index(drop=True)
+    write_daily_cache(symbol, combo, project_root, consumed=used)
+    return combo
+
+
+def compact_daily_cache(symbol: str, project_root: Path) -> int:
+    """Fold *symbol*'s delta segments into its base file; returns segments folded."""
+    n = len(delta_segments(symbol, project_root))
+    if n:
+        upsert_daily_cache(symbol, None, project_root)
+    return n
+
+
+def cache_gaps(symbol: str, project_root: Path, start=None, end=None):
+    """Sessions of *symbol*'s calendar in ``[start, end]`` (default: its cached span) with no cached bar.
+
+    ``None`` when nothing is cached.
+    """
+    from autoswing.data.calendar import calendar_for
+    df = read_daily_cache(symbol, project_root)
+    if df is None or df.empty:
+        return None
+    gaps = calendar_for(symbol).missing_sessions(df["date"], start, end)
+    telemetry.counter("autoswing_cache_gap_sessions_total", "Missing sessions found in the daily cache").inc(len(gaps))
+    return gaps
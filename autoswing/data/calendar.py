@@ -0,0 +1,189 @@
+"""Exchange trading calendars as precomputed session arrays.
+
+A :class:`TradingCalendar` holds its sessions once as a sorted
+``datetime64[D]`` array, so every lookup is a ``searchsorted`` over whole
+arrays: session <-> integer index, "N sessions after", sessions in a range,
+and missing-session (gap) detection for a symbol's bars.  Settlement, the
+backtest session panel and incremental fetch all work in integer session
+offsets instead of per-row date arithmetic.
+
+``equities`` is the NYSE calendar (weekends plus the regular holiday rules;
+one-off closures can be passed as ``extra_closures``), ``crypto`` trades
+every day.  :func:`calendar_for` picks one by symbol.
+"""
+from __future__ import annotations
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+FIRST_YEAR, LAST_YEAR = 1970, 2060
+CRYPTO_QUOTES = ("USDT", "USDC", "BUSD", "USD")
+
+
+def to_days(values) -> np.ndarray:
+    """Dates/timestamps/strings (scalar or sequence) -> ``datetime64[D]`` array (local date if tz-aware)."""
+    if isinstance(values, np.ndarray) and values.dtype == "datetime64[D]":
+        return values
+    if isinstance(values, (date, str, pd.Timestamp, np.datetime64)):
+        values = [values]
+    idx = pd.DatetimeIndex(pd.to_datetime(values))
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    return idx.to_numpy().astype("datetime64[D]")
+
+
+def _easter(year: int) -> date:
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l_ = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l_) // 433
+    month = (h + l_ - 7 * m + 90) // 25
+    return date(year, month, (h + l_ - 7 * m + 33 * month + 19) % 32)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th (1-based; -1 = last) *weekday* (Mon=0) of the month."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d: date) -> date:
+    return d - timedelta(days=1) if d.weekday() == 5 else d + timedelta(days=1) if d.weekday() == 6 else d
+
+
+def nyse_holidays(year: int) -> list:
+    """Regular NYSE full-day holidays for *year* (observed dates)."""
+    out = []
+    ny = date(year, 1, 1)
+    if ny.weekday() != 5:  # a Saturday New Year is not observed on Dec 31
+        out.append(_observed(ny))
+    if year >= 1998:
+        out.append(_nth_weekday(year, 1, 0, 3))                  # Martin Luther King Jr. Day
+    out.append(_nth_weekday(year, 2, 0, 3))                      # Washington's Birthday
+    out.append(_easter(year) - timedelta(days=2))                # Good Friday
+    out.append(_nth_weekday(year, 5, 0, -1))                     # Memorial Day
+    if year >= 2022:
+        out.append(_observed(date(year, 6, 19)))                 # Juneteenth
+    out.append(_observed(date(year, 7, 4)))                      # Independence Day
+    out.append(_nth_weekday(year, 9, 0, 1))                      # Labor Day
+    out.append(_nth_weekday(year, 11, 3, 4))                     # Thanksgiving
+    out.append(_observed(date(year, 12, 25)))                    # Christmas
+    return out
+
+
+class TradingCalendar:
+    """Sorted session array with vectorized lookups."""
+
+    def __init__(self, name: str, sessions: np.ndarray):
+        self.name = name
+        self.sessions = np.asarray(sessions, dtype="datetime64[D]")
+        if len(self.sessions) == 0:
+            raise ValueError("calendar has no sessions")
+
+    def __repr__(self) -> str:
+        return f"TradingCalendar({self.name!r}, {self.sessions[0]}..{self.sessions[-1]})"
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __reduce_ex__(self, protocol):
+        # the shared calendars pickle by name, so snapshots and cached results don't carry the session array
+        if self.name in ("equities", "crypto") and self is get_calendar(self.name):
+            return get_calendar, (self.name,)
+        return super().__reduce_ex__(protocol)
+
+    def _check(self, days: np.ndarray):
+        if len(days) and (days.min() < self.sessions[0] or days.max() > self.sessions[-1]):
+            raise ValueError(f"dates outside the {self.name} calendar range "
+                             f"{self.sessions[0]}..{self.sessions[-1]}")
+
+    # --- vectorized -------------------------------------------------------
+    def is_session(self, dates) -> np.ndarray:
+        days = to_days(dates)
+        pos = np.searchsorted(self.sessions, days).clip(max=len(self.sessions) - 1)
+        return self.sessions[pos] == days
+
+    def session_index(self, dates) -> np.ndarray:
+        """Integer session index per date; -1 where the date is not a session."""
+        days = to_days(dates)
+        pos = np.searchsorted(self.sessions, days)
+        hit = (pos < len(self.sessions)) & (self.sessions[pos.clip(max=len(self.sessions) - 1)] == days)
+        return np.where(hit, pos, -1)
+
+    def add_sessions(self, dates, n) -> np.ndarray:
+        """The session *n* sessions after each date (a non-session counts from the session before it)."""
+        days = to_days(dates)
+        self._check(days)
+        pos = np.searchsorted(self.sessions, days, side="right") - 1 + np.asarray(n)
+        if len(days) and (pos.min() < 0 or pos.max() >= len(self.sessions)):
+            raise ValueError(f"offset leaves the {self.name} calendar range")
+        return self.sessions[pos]
+
+    def sessions_between(self, start, end) -> np.ndarray:
+        """Sessions in ``[start, end]``."""
+        lo, hi = np.searchsorted(self.sessions, to_days(start)[0]), \
+            np.searchsorted(self.sessions, to_days(end)[0], side="right")
+        return self.sessions[lo:hi]
+
+    def count_sessions(self, start, end) -> int:
+        return len(self.sessions_between(start, end))
+
+    def missing_sessions(self, dates, start=None, end=None) -> np.ndarray:
+        """Sessions in ``[start, end]`` (default: the span of *dates*) with no row in *dates*."""
+        days = to_days(dates)
+        if not len(days) and (start is None or end is None):
+            return np.empty(0, dtype="datetime64[D]")
+        span = self.sessions_between(days.min() if start is None else start,
+                                     days.max() if end is None else end)
+        return span[~np.isin(span, days)]
+
+    # --- scalar convenience -------------------------------------------------
+    def next_session(self, dt: date, n: int = 1) -> date:
+        return self.add_sessions(np.datetime64(dt, "D").reshape(1), n)[0].astype(object)
+
+
+@lru_cache(maxsize=None)
+def equities_calendar(extra_closures: Optional[tuple] = None) -> TradingCalendar:
+    days = np.arange(np.datetime64(f"{FIRST_YEAR}-01-01"), np.datetime64(f"{LAST_YEAR + 1}-01-01"))
+    holidays = [h for y in range(FIRST_YEAR, LAST_YEAR + 1) for h in nyse_holidays(y)]
+    holidays += list(extra_closures or ())
+    cal = np.busdaycalendar(holidays=np.array(holidays, dtype="datetime64[D]"))
+    return TradingCalendar("equities", days[np.is_busday(days, busdaycal=cal)])
+
+
+@lru_cache(maxsize=None)
+def crypto_calendar() -> TradingCalendar:
+    return TradingCalendar("crypto", np.arange(np.datetime64(f"{FIRST_YEAR}-01-01"),
+                                               np.datetime64(f"{LAST_YEAR + 1}-01-01")))
+
+
+def get_calendar(name: str) -> TradingCalendar:
+    if name == "equities":
+        return equities_calendar()
+    if name == "crypto":
+        return crypto_calendar()
+    raise ValueError(f"unknown calendar {name!r}")
+
+
+def is_crypto(symbol: str) -> bool:
+    s = symbol.upper().replace("-", "").replace("/", "")
+    return any(s.endswith(q) and len(s) > len(q) + 1 for q in CRYPTO_QUOTES)
+
+
+def calendar_for(symbol: str) -> TradingCalendar:
+    return crypto_calendar() if is_crypto(symbol) else equities_calendar()
+
+
+def calendar_for_symbols(symbols: Iterable[str]) -> TradingCalendar:
+    """Crypto only if every symbol is crypto (account settlement follows equities otherwise)."""
+    syms = list(symbols)
+    return crypto_calendar() if syms and all(is_crypto(s) for s in syms) else equities_calendar()
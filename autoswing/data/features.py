@@ -0,0 +1,349 @@
+"""Materialized indicator columns next to the daily cache.
+
+A feature is named ``<kind>_<window>`` (``sma_20``, ``atr_14``, ...; see
+:data:`FEATURES`).  Each symbol's computed features live in one parquet file
+under ``runtime/data_cache/daily/_features/``, row-aligned with its cached
+bars, so consumers load just the columns they need instead of recomputing
+them from raw closes on every run.
+
+The file's schema metadata records the
+:func:`~autoswing.data.cache.cache_signature` the columns were computed
+from and each feature's version.  :func:`ensure_features` compares that
+with the cache as it is now:
+
+* unchanged: nothing to do;
+* only new delta segments: recompute from the earliest new bar, with
+  each feature's lookback of older bars as context;
+* anything else (a rewritten base file, a compaction, a feature whose
+  version changed or that is not stored yet): rebuild from the full
+  history.
+
+Every kernel folds each window left to right, so an extended column is
+bit-for-bit what a rebuild would produce.
+"""
+from __future__ import annotations
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from autoswing.data.cache import CACHE_SUBDIR, _delta_dir, cache_signature, read_daily_cache
+from autoswing.utils import telemetry
+
+FEATURES_DIRNAME = "_features"
+META_KEY = b"autoswing.features"
+TAIL_KEY = b"autoswing.features.tail"   # kept apart so freshness checks skip parsing it
+# Bump when the file layout changes; stores written by another version are rebuilt.
+STORE_VERSION = 1
+
+
+def _fold(x: np.ndarray, n: int, op=np.add) -> np.ndarray:
+    """``op`` over each length-*n* window of *x*, left to right; NaN until the first full window."""
+    out = np.full(len(x), np.nan)
+    m = len(x) - n + 1
+    if m <= 0:
+        return out
+    acc = np.array(x[:m], dtype=float)
+    for j in range(1, n):
+        op(acc, x[j:j + m], out=acc)
+    out[n - 1:] = acc
+    return out
+
+
+def _sma(cols: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    return _fold(cols["close"], n) / n
+
+
+def _log_returns(close: np.ndarray) -> np.ndarray:
+    r = np.full(len(close), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r[1:] = np.log(close[1:] / close[:-1])
+    return r
+
+
+def _ret(cols: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    c = cols["close"]
+    out = np.full(len(c), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[n:] = np.log(c[n:] / c[:-n])
+    return out
+
+
+def _vol(cols: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    """Sample stdev of daily log returns over the last *n* returns."""
+    r = _log_returns(cols["close"])
+    out = np.full(len(r), np.nan)
+    m = len(r) - n + 1
+    if n < 2 or m <= 0:
+        return out
+    mean = _fold(r, n)[n - 1:] / n
+    ss = np.zeros(m)
+    for j in range(n):
+        d = r[j:j + m] - mean
+        ss += d * d
+    out[n - 1:] = np.sqrt(ss / (n - 1))
+    return out
+
+
+def _atr(cols: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    """Simple mean of the true range over *n* bars."""
+    h, lo, c = cols["high"], cols["low"], cols["close"]
+    prev = np.r_[np.nan, c[:-1]]
+    tr = np.fmax(h - lo, np.fmax(np.abs(h - prev), np.abs(lo - prev)))
+    return _fold(tr, n) / n
+
+
+def _hh(cols: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    return _fold(cols["high"], n, np.maximum)
+
+
+def _ll(cols: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    return _fold(cols["low"], n, np.minimum)
+
+
+@dataclass(frozen=True)
+class FeatureKind:
+    compute: Callable[[Dict[str, np.ndarray], int], np.ndarray]
+    inputs: Tuple[str, ...]
+    lookback: Callable[[int], int]  # older bars a new row depends on
+    version: int = 1
+
+
+FEATURES: Dict[str, FeatureKind] = {
+    "sma": FeatureKind(_sma, ("close",), lambda n: n - 1),
+    "ret": FeatureKind(_ret, ("close",), lambda n: n),
+    "vol": FeatureKind(_vol, ("close",), lambda n: n),
+    "atr": FeatureKind(_atr, ("high", "low", "close"), lambda n: n),
+    "hh": FeatureKind(_hh, ("high",), lambda n: n - 1),
+    "ll": FeatureKind(_ll, ("low",), lambda n: n - 1),
+}
+
+_NAME = re.compile(r"^([a-z]+)_(\d+)$")
+
+
+def parse_feature(name: str) -> Tuple[FeatureKind, int]:
+    """``"sma_20"`` -> (its :class:`FeatureKind`, 20); ValueError for unknown kinds or windows < 1."""
+    m = _NAME.match(name)
+    if not m or m.group(1) not in FEATURES or int(m.group(2)) < 1:
+        raise ValueError(f"unknown feature {name!r} (expected <kind>_<window>, kind in {sorted(FEATURES)})")
+    return FEATURES[m.group(1)], int(m.group(2))
+
+
+def _versions(names: Iterable[str]) -> Dict[str, int]:
+    return {n: parse_feature(n)[0].version for n in names}
+
+
+def feature_inputs(names: Iterable[str]) -> List[str]:
+    """Bar columns the features in *names* are computed from."""
+    return sorted({c for n in names for c in parse_feature(n)[0].inputs})
+
+
+def feature_lookback(names: Iterable[str]) -> int:
+    return max((kind.lookback(n) for kind, n in map(parse_feature, names)), default=0)
+
+
+def compute_features(bars: pd.DataFrame, names: Sequence[str]) -> pd.DataFrame:
+    """``date`` plus one float column per name, computed over all of *bars*."""
+    cols = {c: bars[c].to_numpy(dtype=float) for c in feature_inputs(names)}
+    out = {"date": pd.to_datetime(bars["date"]).to_numpy().astype("datetime64[ns]")}
+    for name in names:
+        kind, n = parse_feature(name)
+        out[name] = kind.compute(cols, n)
+    return pd.DataFrame(out)
+
+
+# ------------------------------------------------------------------ storage
+def _features_path(symbol: str, project_root: Path) -> Path:
+    return Path(project_root) / CACHE_SUBDIR / FEATURES_DIRNAME / f"{symbol.upper()}.parquet"
+
+
+def _read_meta(fp: Path) -> Optional[dict]:
+    try:
+        md = pq.read_schema(fp).metadata or {}
+    except (FileNotFoundError, OSError, pa.ArrowInvalid):
+        return None
+    if META_KEY not in md:
+        return None
+    meta = json.loads(md[META_KEY])
+    if meta.get("store") != STORE_VERSION:
+        return None
+    meta["sig"] = tuple(tuple(x) for x in meta["sig"])
+    meta["tail"] = md.get(TAIL_KEY, b"{}")
+    return meta
+
+
+def _tail_meta(bars: pd.DataFrame, names: Sequence[str]) -> dict:
+    """The last lookback bars' input columns, enough context to extend without reading the cache."""
+    tail = bars.tail(feature_lookback(names))
+    out = {"date": pd.to_datetime(tail["date"]).to_numpy().astype("datetime64[ns]").astype("int64").tolist()}
+    out.update({c: tail[c].to_numpy(dtype=float).tolist() for c in feature_inputs(names)})
+    return out
+
+
+def _tail_frame(meta: dict) -> pd.DataFrame:
+    tail = json.loads(meta["tail"])
+    return pd.DataFrame({"date": pd.to_datetime(np.asarray(tail.pop("date", []), dtype="int64")), **tail})
+
+
+def _write(fp: Path, table, sig: tuple, names: Sequence[str], bars: pd.DataFrame):
+    """Atomically write *table* (frame or arrow table); *bars* are the (last) cache bars it was computed from."""
+    meta = {"store": STORE_VERSION, "sig": [list(x) for x in sig], "features": _versions(names)}
+    if isinstance(table, pd.DataFrame):
+        table = pa.Table.from_pandas(table, preserve_index=False)
+    table = table.replace_schema_metadata({META_KEY: json.dumps(meta).encode(),
+                                           TAIL_KEY: json.dumps(_tail_meta(bars, names)).encode()})
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=fp.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp)
+        os.replace(tmp, fp)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _appended(symbol: str, project_root: Path, old: tuple, new: tuple, columns: List[str]) -> Optional[pd.DataFrame]:
+    """Bars in the segments *new* adds to *old* (empty if none); None if *new* is not *old* plus segments."""
+    added = sorted(set(new) - set(old))
+    base = f"{symbol.upper()}.parquet"
+    if not set(old) <= set(new) or any(name == base for name, _, _ in added):
+        return None
+    parts = []
+    for name, _, _ in added:  # segment names sort oldest first
+        try:
+            parts.append(pd.read_parquet(_delta_dir(symbol, project_root) / name, columns=["date", *columns]))
+        except FileNotFoundError:  # compacted meanwhile
+            return None
+    if not parts:
+        return pd.DataFrame(columns=["date", *columns])
+    df = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+    df["date"] = pd.to_datetime(df["date"])
+    if len(parts) > 1 or not df["date"].is_monotonic_increasing:
+        df = df.drop_duplicates("date", keep="last").sort_values("date").reset_index(drop=True)
+    return df
+
+
+def _valid_names(versions: Dict[str, int]) -> set:
+    ok = set()
+    for name, v in versions.items():
+        try:
+            if parse_feature(name)[0].version == v:
+                ok.add(name)
+        except ValueError:  # kind no longer registered
+            continue
+    return ok
+
+
+def ensure_features(symbol: str, names: Sequence[str], project_root: Path) -> str:
+    """Bring *symbol*'s stored features up to date with its cache and *names*.
+
+    Features already stored (at their current version) are kept alongside
+    *names*.  Returns what was done: ``"fresh"``, ``"extended"``,
+    ``"rebuilt"`` or ``"missing"`` (nothing cached).
+    """
+    sym = symbol.upper()
+    fp = _features_path(sym, project_root)
+    sig = cache_signature(sym, project_root)
+    if not sig:
+        return "missing"
+    meta = _read_meta(fp)
+    stored = _valid_names(meta["features"]) if meta else set()
+    want = sorted(stored | set(names))
+    result = "rebuilt"
+    if meta is not None and set(names) <= stored:
+        if sig == meta["sig"]:
+            result = "fresh"
+        else:
+            new = _appended(sym, project_root, meta["sig"], sig, feature_inputs(want))
+            if new is not None and _extend(sym, fp, project_root, sig, want, meta, new):
+                result = "extended"
+    if result == "rebuilt":
+        bars = read_daily_cache(sym, project_root, columns=feature_inputs(want))
+        if bars is None:
+            return "missing"
+        _write(fp, compute_features(bars, want), sig, want, bars)
+    telemetry.counter("autoswing_feature_store_total", "Feature store refreshes", result=result).inc()
+    return result
+
+
+def _extend(symbol: str, fp: Path, project_root: Path, sig: tuple, names: List[str], meta: dict,
+            new: pd.DataFrame) -> bool:
+    """Recompute rows from the first of the *new* bars on; False when a rebuild is needed instead.
+
+    Context comes from the stored tail when it reaches back far enough,
+    otherwise (a late bar deep in the history) from the cache.
+    """
+    if new.empty:
+        return False
+    since = new["date"].iloc[0]
+    stored = pq.read_table(fp, columns=["date", *names])
+    dates = stored.column("date").to_numpy()
+    p = int(np.searchsorted(dates, since.to_datetime64()))
+    ctx = p - feature_lookback(names)
+    if p == 0 or ctx < 0:
+        return False
+    tail = _tail_frame(meta)
+    if len(dates) - len(tail) <= ctx:
+        bars = pd.concat([tail, new], ignore_index=True)
+        if not len(tail) or since <= tail["date"].iloc[-1]:
+            bars = bars.drop_duplicates("date", keep="last").sort_values("date").reset_index(drop=True)
+        bars = bars[bars["date"] >= dates[ctx]]
+    else:
+        bars = read_daily_cache(symbol, project_root, start=dates[ctx], columns=feature_inputs(names))
+        if bars is None:
+            return False
+    feats = compute_features(bars, names)
+    feats = feats[feats["date"] >= since]
+    head = stored.slice(0, p).replace_schema_metadata(None)
+    _write(fp, pa.concat_tables([head, pa.Table.from_pandas(feats, schema=head.schema, preserve_index=False)]),
+           sig, names, bars)
+    telemetry.counter("autoswing_feature_rows_computed_total", "Feature rows recomputed on extend").inc(len(feats))
+    return True
+
+
+def read_features(symbol: str, names: Sequence[str], project_root: Path, start=None, end=None,
+                  refresh: bool = True) -> pd.DataFrame | None:
+    """``date`` plus the *names* columns of *symbol*; None when nothing is cached.
+
+    The store is brought up to date first unless *refresh* is False (the
+    caller already ran :func:`ensure_features` for *names*).
+    """
+    names = list(dict.fromkeys(names))
+    fp = _features_path(symbol, project_root)
+    if refresh and ensure_features(symbol, names, project_root) == "missing" or not fp.exists():
+        return None
+    df = pq.read_table(fp, columns=["date", *names]).to_pandas()
+    if start is not None or end is not None:
+        dates = df["date"]
+        lo = 0 if start is None else int(dates.searchsorted(pd.Timestamp(start)))
+        hi = len(df) if end is None else int(dates.searchsorted(pd.Timestamp(end), side="right"))
+        df = df.iloc[lo:hi].reset_index(drop=True)
+    return df
+
+
+def join_features(symbol: str, bars: pd.DataFrame, names: Sequence[str], project_root: Path,
+                  refresh: bool = True) -> pd.DataFrame:
+    """*bars* with the *names* columns attached by date (NaN where a bar has no stored row)."""
+    if not names or bars is None or bars.empty:
+        return bars
+    feats = read_features(symbol, names, project_root, start=bars["date"].iloc[0], end=bars["date"].iloc[-1],
+                          refresh=refresh)
+    if feats is None:
+        return bars
+    out = bars.drop(columns=[n for n in names if n in bars])
+    dates = out["date"] if pd.api.types.is_datetime64_any_dtype(out["date"]) else pd.to_datetime(out["date"])
+    dates = dates.to_numpy().astype("datetime64[ns]")
+    if len(feats) == len(out) and np.array_equal(feats["date"].to_numpy(), dates):
+        for n in names:
+            out[n] = feats[n].to_numpy()
+        return out
+    return out.assign(date=dates).merge(feats, on="date", how="left")
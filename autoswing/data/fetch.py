@@ -1,30 +1,111 @@
 from __future__ import annotations
+from datetime import date
+from importlib import import_module
 from pathlib import Path
-from typing import Sequence
+from typing import Callable, Dict, Optional, Sequence
+import numpy as np
 import pandas as pd
 
-from autoswing.data.sources.alpaca_source import fetch_alpaca_daily
-from autoswing.data.sources.yahoo_source import fetch_yahoo_daily
-from autoswing.data.cache import write_daily_cache, merge_with_cache
+from autoswing.data.cache import upsert_daily_cache
+from autoswing.data.calendar import calendar_for, to_days
+from autoswing.data.stats_index import StatsIndex
+from autoswing.utils.parallel import map_chunks
+from autoswing.utils import telemetry
 
-def fetch_history(symbols: Sequence[str], history: str, sources: Sequence[str], project_root: Path):
-    """Fetch & cache daily bars for given symbols."""
-    project_root = Path(project_root)
-    for sym in symbols:
-        df = None
-        for src in sources:
-            try:
-                if src == "alpaca":
-                    df = fetch_alpaca_daily(sym, history)
-                elif src == "yahoo":
-                    df = fetch_yahoo_daily(sym, history)
-                else:
-                    continue
-                if df is not None and len(df):
-                    break
-            except Exception:
+# source name -> (module, function); modules are imported only when selected,
+# so e.g. a yahoo-only fetch never pays for alpaca-py.
+SOURCES: Dict[str, tuple[str, str]] = {
+    "alpaca": ("autoswing.data.sources.alpaca_source", "fetch_alpaca_daily"),
+    "yahoo": ("autoswing.data.sources.yahoo_source", "fetch_yahoo_daily"),
+}
+
+
+def get_source(name: str) -> Callable[[str, str], pd.DataFrame | None] | None:
+    spec = SOURCES.get(name)
+    if spec is None:
+        return None
+    return getattr(import_module(spec[0]), spec[1])
+
+
+def _fetch_one(sym: str, history: str, sources: Sequence[str], project_root: Path) -> bool:
+    df = None
+    attempts = 0
+    for src in sources:
+        try:
+            fetch = get_source(src)
+            if fetch is None:
                 continue
-        if df is None or df.empty:
+            if attempts:
+                telemetry.counter("autoswing_fetch_retries_total", "Fallbacks to a later source", source=src).inc()
+            attempts += 1
+            with telemetry.histogram("autoswing_fetch_seconds", "Per-request fetch latency", source=src).time():
+                df = fetch(sym, history)
+            ok = df is not None and len(df)
+            telemetry.counter("autoswing_fetch_requests_total", "Fetch requests", source=src,
+                              status="ok" if ok else "empty").inc()
+            if ok:
+                telemetry.counter("autoswing_fetch_bytes_total", "In-memory bytes fetched",
+                                  source=src).inc(int(df.memory_usage(index=False).sum()))
+                break
+        except Exception:
+            telemetry.counter("autoswing_fetch_requests_total", "Fetch requests", source=src, status="error").inc()
             continue
-        merged = merge_with_cache(sym, df, project_root)
-        write_daily_cache(sym, merged, project_root)
+    if df is None or df.empty:
+        return False
+    StatsIndex.for_project(project_root).put(sym, upsert_daily_cache(sym, df, project_root))
+    return True
+
+
+def fetch_plan(symbols: Sequence[str], history: str, project_root: Path,
+               as_of: Optional[date] = None) -> Dict[str, Optional[str]]:
+    """History window to request per symbol for an incremental fetch (None = already current).
+
+    A symbol is current when its calendar has no session after the last
+    cached bar (per the :class:`~autoswing.data.stats_index.StatsIndex`) up
+    to *as_of* (default today).  Otherwise only the span since that bar is
+    requested, padded by a few days; symbols without an index entry get the
+    full *history*.
+    """
+    index = StatsIndex.for_project(project_root)
+    today = np.datetime64(as_of or date.today(), "D")
+    plan: Dict[str, Optional[str]] = {s: history for s in symbols}
+    by_cal: Dict[str, list] = {}
+    for s in symbols:
+        entry = index.get(s)
+        if entry is not None and entry.last_date is not None and not pd.isna(entry.last_date):
+            by_cal.setdefault(calendar_for(s).name, []).append((s, entry.last_date))
+    for rows in by_cal.values():
+        syms, last = zip(*rows)
+        last = to_days(list(last))
+        due = calendar_for(syms[0]).add_sessions(last, 1) <= today
+        for s, lag, stale in zip(syms, (today - last).astype(int), due):
+            plan[s] = f"{lag + 5}d" if stale else None
+    return plan
+
+
+def fetch_history(symbols: Sequence[str], history: str, sources: Sequence[str], project_root: Path,
+                  max_workers: int = 1, incremental: bool = False, as_of: Optional[date] = None) -> list[str]:
+    """Fetch & cache daily bars for given symbols; returns the symbols updated.
+
+    With ``max_workers > 1`` symbols are fetched on a thread pool (requests are
+    I/O bound and each symbol writes its own cache file).  Updated symbols'
+    :class:`~autoswing.data.stats_index.StatsIndex` entries are refreshed
+    from the merged frames.
+
+    With *incremental* each symbol requests only the sessions missing since
+    its last cached bar (:func:`fetch_plan`), and symbols that are already
+    current are not requested at all.
+    """
+    project_root = Path(project_root)
+    plan = fetch_plan(symbols, history, project_root, as_of) if incremental else dict.fromkeys(symbols, history)
+    todo = [s for s, window in plan.items() if window is not None]
+    if len(todo) < len(plan):
+        telemetry.counter("autoswing_fetch_skipped_total",
+                          "Symbols already current (incremental fetch)").inc(len(plan) - len(todo))
+
+    def _chunk(syms):
+        return [s for s in syms if _fetch_one(s, plan[s], sources, project_root)]
+
+    done = list(map_chunks(_chunk, todo, workers=max_workers, chunk_size=1, kind="thread"))
+    StatsIndex.for_project(project_root).save()
+    return done
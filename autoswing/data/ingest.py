@@ -0,0 +1,199 @@
+"""Streaming bar ingestion into the daily cache in micro-batches.
+
+:class:`BarIngestor` buffers incoming bars per symbol and publishes them as
+delta segments (:func:`~autoswing.data.cache.append_daily_cache`) when
+``max_batch`` bars are buffered or the oldest buffered bar is ``max_delay``
+seconds old.  Readers (``load_bundle_cached``, the pipeline scan) merge
+segments on read, so new bars are visible after at most ``max_delay``
+without rewriting the base parquet per bar; every ``compact_every``
+segments a symbol is compacted back into its base file.  Published bars
+are also folded into the :class:`~autoswing.data.stats_index.StatsIndex`
+(saved on :meth:`BarIngestor.close`).
+
+Bars are deduplicated by timestamp: repeats inside the buffer collapse to
+the newest copy, and a bar whose timestamp was already published recently
+is dropped (or, with ``on_duplicate="replace"``, re-published so it wins on
+read).  Late bars, older than what was already published but not seen
+before, are accepted and counted.
+
+Any async iterator of bars works as a source: a broker stream adapter, or
+:class:`~autoswing.engine.live.ReplayFeed` as a local stand-in.
+"""
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+import pandas as pd
+
+from autoswing.data.cache import append_daily_cache, compact_daily_cache, delta_segments
+from autoswing.data.stats_index import StatsIndex
+from autoswing.utils import telemetry
+
+BAR_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+
+def _row(bar: Any) -> tuple:
+    """``(symbol, Timestamp, o, h, l, c, v)`` from a dict or a Bar-like object."""
+    get = bar.get if isinstance(bar, dict) else (lambda k, d=None: getattr(bar, k, d))
+    ts = get("date")
+    if ts is None:
+        ts = get("dt", get("timestamp"))
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    close = float(get("close"))
+    return (str(get("symbol")).upper(), ts, float(get("open", close)), float(get("high", close)),
+            float(get("low", close)), close, float(get("volume", 0.0) or 0.0))
+
+
+class BarIngestor:
+    """Buffer -> micro-batch -> atomic delta segment, per symbol."""
+
+    def __init__(self, project_root: Path, max_batch: int = 500, max_delay: float = 1.0,
+                 compact_every: int = 32, on_duplicate: str = "drop", recent: int = 4096):
+        if on_duplicate not in ("drop", "replace"):
+            raise ValueError("on_duplicate must be 'drop' or 'replace'")
+        self.project_root = Path(project_root)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.compact_every = compact_every
+        self.on_duplicate = on_duplicate
+        self.recent = recent
+        self.index = StatsIndex.for_project(self.project_root)
+        self._buf: Dict[str, Dict[pd.Timestamp, tuple]] = {}
+        self._buffered = 0
+        self._oldest: Optional[float] = None
+        self._published: Dict[str, Set[pd.Timestamp]] = {}
+        self._published_order: Dict[str, Deque[pd.Timestamp]] = {}
+        self._high: Dict[str, pd.Timestamp] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one publisher/compactor at a time
+        self.stats = {"received": 0, "duplicates": 0, "late": 0, "written": 0, "flushes": 0, "compactions": 0}
+
+    # --- intake ---------------------------------------------------------------
+    def add(self, bar: Any) -> bool:
+        """Buffer one bar; flushes when a threshold is hit.  False if dropped."""
+        sym, ts, *vals = _row(bar)
+        with self._lock:
+            self.stats["received"] += 1
+            if ts in self._published.get(sym, ()) and self.on_duplicate == "drop":
+                self.stats["duplicates"] += 1
+                return False
+            if sym in self._high and ts < self._high[sym]:
+                self.stats["late"] += 1
+            buf = self._buf.setdefault(sym, {})
+            if ts in buf:
+                self.stats["duplicates"] += 1
+            else:
+                self._buffered += 1
+            buf[ts] = (ts, *vals)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            due = self._due()
+        if due:
+            self.flush()
+        return True
+
+    def _due(self) -> bool:
+        return self._buffered >= self.max_batch or (
+            self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay)
+
+    def flush_due(self) -> int:
+        """Flush if the time threshold has passed (for timer-driven callers)."""
+        with self._lock:
+            due = self._due()
+        return self.flush() if due else 0
+
+    # --- publish --------------------------------------------------------------
+    def _remember(self, sym: str, stamps):
+        seen = self._published.setdefault(sym, set())
+        order = self._published_order.setdefault(sym, deque())
+        for ts in stamps:
+            if ts not in seen:
+                seen.add(ts)
+                order.append(ts)
+        while len(order) > self.recent:
+            seen.discard(order.popleft())
+        hi = max(stamps)
+        if sym not in self._high or hi > self._high[sym]:
+            self._high[sym] = hi
+
+    def flush(self) -> int:
+        """Publish every buffered bar; returns the number of bars written."""
+        with self._flush_lock:
+            with self._lock:
+                buf, self._buf = self._buf, {}
+                self._buffered, self._oldest = 0, None
+            written = 0
+            t0 = time.perf_counter()
+            for sym, rows in buf.items():
+                df = pd.DataFrame(sorted(rows.values()), columns=BAR_COLUMNS)
+                append_daily_cache(sym, df, self.project_root)
+                self.index.extend(sym, df)
+                written += len(df)
+                with self._lock:
+                    self._remember(sym, rows.keys())
+                if self.compact_every and len(delta_segments(sym, self.project_root)) >= self.compact_every:
+                    compact_daily_cache(sym, self.project_root)
+                    self.index.restamp(sym)
+                    self.stats["compactions"] += 1
+        if written:
+            self.stats["written"] += written
+            self.stats["flushes"] += 1
+            telemetry.counter("autoswing_ingest_bars_total", "Bars published to the cache").inc(written)
+            telemetry.histogram("autoswing_ingest_flush_seconds", "Micro-batch flush time").observe(
+                time.perf_counter() - t0)
+        return written
+
+    def close(self, compact: bool = True) -> int:
+        """Flush the remainder and (by default) compact every touched symbol."""
+        n = self.flush()
+        if compact:
+            with self._flush_lock:
+                for sym in list(self._published):
+                    if compact_daily_cache(sym, self.project_root):
+                        self.index.restamp(sym)
+                        self.stats["compactions"] += 1
+        self.index.save()
+        return n
+
+    # --- async driver ---------------------------------------------------------
+    async def run(self, stream: AsyncIterator[Any], compact_on_close: bool = True) -> dict:
+        """Consume *stream* until exhausted, flushing on size or every ``max_delay``.
+
+        File writes run in a worker thread so the event loop keeps receiving.
+        """
+        loop = asyncio.get_running_loop()
+        it = stream.__aiter__()
+        nxt: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if nxt is None:
+                    nxt = asyncio.ensure_future(it.__anext__())
+                done, _ = await asyncio.wait({nxt}, timeout=self.max_delay)
+                if not done:
+                    await loop.run_in_executor(None, self.flush_due)
+                    continue
+                try:
+                    bar = nxt.result()
+                except StopAsyncIteration:
+                    break
+                nxt = None
+                if self._will_fill():
+                    await loop.run_in_executor(None, self.add, bar)
+                else:
+                    self.add(bar)
+        finally:
+            if nxt is not None and not nxt.done():
+                nxt.cancel()
+            await loop.run_in_executor(None, self.close, compact_on_close)
+        return dict(self.stats)
+
+    def _will_fill(self) -> bool:
+        """True when adding one more bar would trigger a flush (do it off-loop)."""
+        return self._buffered + 1 >= self.max_batch or (
+            self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay)
@@ -1,15 +1,164 @@
 from __future__ import annotations
+import threading
 from pathlib import Path
-from typing import Sequence, Dict
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
-from autoswing.data.cache import read_daily_cache
+from autoswing.data.cache import cache_signature, read_daily_cache
+from autoswing.data.calendar import to_days
+from autoswing.data.features import ensure_features, join_features
+from autoswing.utils import telemetry
 
-def load_bundle_cached(symbols: Sequence[str], days: int, project_root: Path) -> Dict[str, pd.DataFrame]:
+
+class FrameMemo:
+    """Process-lifetime memo of cache frames, re-read only when the files change.
+
+    A one-shot CLI run pays one read per symbol as before; a resident process
+    (``autoswingctl daemon``) keeps frames warm across jobs.  The key covers
+    the base file and any streamed delta segments (see
+    :func:`~autoswing.data.cache.cache_signature`).
+    """
+
+    def __init__(self):
+        self._frames: Dict[Tuple[Path, str], Tuple[tuple, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    def read(self, symbol: str, project_root: Path) -> pd.DataFrame | None:
+        sig = cache_signature(symbol, project_root)
+        if not sig:
+            return None
+        key = (Path(project_root), symbol.upper())
+        with self._lock:
+            hit = self._frames.get(key)
+        if hit is not None and hit[0] == sig:
+            telemetry.counter("autoswing_cache_memo_total", "Warm frame lookups", result="hit").inc()
+            return hit[1]
+        telemetry.counter("autoswing_cache_memo_total", "Warm frame lookups", result="miss").inc()
+        df = read_daily_cache(symbol, project_root)
+        if df is None:
+            return None
+        with self._lock:
+            self._frames[key] = (sig, df)
+        return df
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+MEMO = FrameMemo()
+
+
+def load_bundle_cached(symbols: Sequence[str], days: int, project_root: Path,
+                       columns: Optional[Sequence[str]] = None, features: Sequence[str] = ()) -> Dict[str, pd.DataFrame]:
+    """Each cached symbol's last *days* bars.
+
+    *columns* limits the bar columns read (``date`` always comes along;
+    such reads bypass :data:`MEMO`).  *features* are attached from the
+    feature store (:mod:`autoswing.data.features`), refreshed first.
+    """
     project_root = Path(project_root)
     out = {}
     for sym in symbols:
-        df = read_daily_cache(sym, project_root)
+        df = MEMO.read(sym, project_root) if columns is None else read_daily_cache(sym, project_root,
+                                                                                   columns=columns)
         if df is None or df.empty:
             continue
-        out[sym] = df.tail(days).reset_index(drop=True)
+        out[sym] = join_features(sym, df.tail(days).reset_index(drop=True), features, project_root)
     return out
+
+
+class SessionChunks:
+    """Date-ordered blocks of the daily cache, for backtests larger than memory.
+
+    Construction reads only the ``date`` column of each symbol to build the
+    union of sessions in ``[start, end]``.  Iterating yields
+    ``(sessions, frames)`` for consecutive blocks of *chunk_sessions*
+    sessions.  ``frames[sym]`` holds the symbol's bars inside the block,
+    preceded by its last *lookback* bars from before the block (carried over
+    from the previous block, or read from the cache for the first one:
+    construction locates each symbol's *lookback*-th bar before the first
+    session, so that read starts there rather than at the beginning of the
+    history).  Every symbol gets a tail after the first block, empty if it
+    has no bars yet, so later blocks only read their own sessions.  Peak
+    memory is therefore about ``symbols x (chunk_sessions + lookback)`` bars
+    however long the history is.  ``last_close`` tracks each symbol's latest
+    close seen so far and ``tails`` the bars carried into the next block.
+
+    Passing *tails* (and *last_close*) from an earlier pass resumes it: the
+    warm-up comes from those tails instead of the cache, and only bars from
+    *start* on are read (plus the warm-up of symbols without a tail).
+
+    *features* are attached to every frame from the feature store; it is
+    refreshed once per symbol up front and then read block by block.
+    """
+
+    def __init__(self, symbols: Sequence[str], project_root: Path, chunk_sessions: int = 250,
+                 lookback: int = 0, start=None, end=None, tails: Optional[Dict[str, pd.DataFrame]] = None,
+                 last_close: Optional[Dict[str, float]] = None, features: Sequence[str] = ()):
+        self.project_root = Path(project_root)
+        self.features = tuple(features)
+        self.chunk_sessions = max(1, int(chunk_sessions))
+        self.lookback = max(0, int(lookback))
+        self.resumed = tails is not None
+        self.tails: Dict[str, pd.DataFrame] = dict(tails or {})
+        self.last_close: Dict[str, float] = dict(last_close or {})
+        self.symbols = []
+        days: Dict[str, np.ndarray] = {}
+        for sym in symbols:
+            df = read_daily_cache(sym, self.project_root, start=start if self.resumed else None, end=end,
+                                  columns=["date"])
+            if (df is None or df.empty) and sym not in self.tails:
+                continue
+            self.symbols.append(sym)
+            if df is not None:
+                days[sym] = np.unique(to_days(df["date"]))
+        sessions = np.unique(np.concatenate(list(days.values()))) if days else np.empty(0, "datetime64[D]")
+        if start is not None:
+            sessions = sessions[sessions >= to_days(start)[0]]
+        self.sessions = sessions
+        # where the first block's read starts for symbols without carried bars
+        self._warm_from: Dict[str, np.datetime64] = {}
+        for sym in self.symbols if len(sessions) else ():
+            if sym in self.tails:
+                continue
+            d = days.get(sym)
+            if self.resumed:   # the date read above began at *start*: look behind it
+                prior = read_daily_cache(sym, self.project_root, end=sessions[0], columns=["date"])
+                d = to_days(prior["date"]) if prior is not None else np.empty(0, "datetime64[D]")
+            i = int(np.searchsorted(d, sessions[0]))
+            self._warm_from[sym] = d[max(0, i - self.lookback)] if i else sessions[0]
+        if self.features:
+            for sym in self.symbols:
+                ensure_features(sym, self.features, self.project_root)
+
+    def __len__(self) -> int:
+        return -(-len(self.sessions) // self.chunk_sessions)
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, Dict[str, pd.DataFrame]]]:
+        tails = self.tails
+        for k in range(0, len(self.sessions), self.chunk_sessions):
+            block = self.sessions[k:k + self.chunk_sessions]
+            frames = {}
+            for sym in self.symbols:
+                # a symbol without carried bars reads its warm-up history from the cache too
+                new = read_daily_cache(sym, self.project_root,
+                                       start=block[0] if sym in tails else self._warm_from.get(sym, block[0]),
+                                       end=block[-1])
+                parts = [p for p in (tails.get(sym), new) if p is not None and not p.empty]
+                if not parts:
+                    tails[sym] = new.iloc[:0] if new is not None else pd.DataFrame(columns=["date"])
+                    continue
+                df = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+                first = int(np.searchsorted(to_days(df["date"]), block[0]))
+                df = df.iloc[max(0, first - self.lookback):].reset_index(drop=True)
+                if self.features:
+                    df = join_features(sym, df, self.features, self.project_root, refresh=False)
+                frames[sym] = df
+                tails[sym] = df.tail(self.lookback)
+                self.last_close[sym] = float(df["close"].iloc[-1])
+            telemetry.counter("autoswing_backtest_chunks_total", "Out-of-core backtest blocks read").inc()
+            yield block, frames
@@ -1,3 +1,16 @@
 # autoswing.data.sources
-from .alpaca_source import fetch_alpaca_daily
-from .yahoo_source import fetch_yahoo_daily
+# Source modules pull in heavy client libraries (alpaca-py, yfinance, ccxt);
+# resolve them on first attribute access instead of at package import.
+from importlib import import_module
+
+_LAZY = {
+    "fetch_alpaca_daily": "alpaca_source",
+    "fetch_yahoo_daily": "yahoo_source",
+    "fetch_crypto_daily": "crypto_source",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(name)
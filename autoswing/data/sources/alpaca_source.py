@@ -28,7 +28,9 @@ def fetch_alpaca_daily(symbol: str, history: str) -> pd.DataFrame | None:
     secret = os.getenv("ALPACA_PAPER_SECRET") or os.getenv("ALPACA_LIVE_SECRET")
     if not key or not secret:
         return None
-    client = StockHistoricalDataClient(api_key=key, secret_key=secret)
+    # ALPACA_DATA_URL points the client at a proxy or a local stand-in (benchmarks/standins.py)
+    client = StockHistoricalDataClient(api_key=key, secret_key=secret,
+                                       url_override=os.getenv("ALPACA_DATA_URL") or None)
     days = _parse_hist_window(history)
     start, end = _date_range(days)
     req = StockBarsRequest(symbol_or_symbols=symbol.upper(), timeframe=TimeFrame.Day, start=start, end=end)
@@ -0,0 +1,208 @@
+"""Per-symbol statistics index over the daily cache, for cheap screening.
+
+For every cached symbol the index keeps a few scalars: history length, last
+date and close, average daily dollar volume (``adv_usd``) and daily
+log-return volatility over the last ``window`` bars.  It also keeps the
+``window + 1`` bars those come from, so newly landed bars update an entry in
+O(window) without re-reading the symbol's history
+(:meth:`StatsIndex.extend` from streaming ingestion, :meth:`StatsIndex.put`
+from a fetch that already holds the merged frame).
+
+Each entry remembers the :func:`~autoswing.data.cache.cache_signature` it
+reflects.  :meth:`StatsIndex.refresh` rebuilds only the entries whose files
+changed behind its back (another process, a compaction), so the index is a
+cache over the parquet files, never a source of truth.  It is stored as one
+parquet file under ``runtime/data_cache/daily/_index/``.
+"""
+from __future__ import annotations
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from autoswing.data.cache import CACHE_SUBDIR, _atomic_parquet, cache_signature, read_daily_cache
+from autoswing.utils import telemetry
+from autoswing.utils.parallel import map_chunks
+
+INDEX_FILE = "_index/stats.parquet"
+STAT_COLUMNS = ["bars", "last_date", "last_close", "adv_usd", "volatility"]
+
+
+@dataclass
+class SymbolStats:
+    symbol: str
+    bars: int
+    last_date: Optional[pd.Timestamp]
+    last_close: float
+    adv_usd: float      # mean close * volume over the window (NaN without volume)
+    volatility: float   # stdev of daily log returns over the window
+    sig: tuple = ()
+    tail_date: np.ndarray = None    # datetime64[ns], last window + 1 bars
+    tail_close: np.ndarray = None
+    tail_volume: np.ndarray = None
+
+
+def _summarize(symbol: str, bars: int, dates, close, volume, window: int, sig: tuple) -> SymbolStats:
+    keep = slice(-(window + 1), None)
+    dates, close, volume = (np.asarray(dates, dtype="datetime64[ns]")[keep],
+                            np.asarray(close, dtype=float)[keep], np.asarray(volume, dtype=float)[keep])
+    if not len(close):
+        return SymbolStats(symbol, 0, None, np.nan, np.nan, np.nan, sig, dates, close, volume)
+    c, v = close[-window:], volume[-window:]
+    dv = c * v
+    adv = float(np.nanmean(dv)) if np.isfinite(dv).any() else np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.diff(np.log(close))
+    r = r[np.isfinite(r)]
+    vol = float(np.std(r, ddof=1)) if len(r) >= 2 else np.nan
+    return SymbolStats(symbol, int(bars), pd.Timestamp(dates[-1]), float(close[-1]), adv, vol, sig,
+                       dates, close, volume)
+
+
+def _columns(df: pd.DataFrame):
+    vol = df["volume"] if "volume" in df else pd.Series(np.nan, index=df.index)
+    return pd.to_datetime(df["date"]).to_numpy(), df["close"].to_numpy(dtype=float), vol.to_numpy(dtype=float)
+
+
+class StatsIndex:
+    """Screening statistics for every cached symbol, updated as bars land."""
+
+    _instances: Dict[tuple, "StatsIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, project_root: Path, window: int = 20):
+        self.project_root = Path(project_root)
+        self.window = int(window)
+        self.path = self.project_root / CACHE_SUBDIR / INDEX_FILE
+        self._entries: Dict[str, SymbolStats] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def for_project(cls, project_root: Path, window: int = 20) -> "StatsIndex":
+        """Process-wide instance per (root, window), shared by fetch/ingest/pipeline."""
+        key = (str(Path(project_root).resolve()), int(window))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(project_root, window)
+            return cls._instances[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._entries
+
+    def get(self, symbol: str) -> Optional[SymbolStats]:
+        return self._entries.get(symbol.upper())
+
+    # --- persistence ------------------------------------------------------
+    def _load(self):
+        if not self.path.exists():
+            return
+        df = pd.read_parquet(self.path)
+        if df.empty or int(df["window"].iloc[0]) != self.window:
+            return
+        for r in df.itertuples(index=False):
+            self._entries[r.symbol] = SymbolStats(
+                r.symbol, int(r.bars), None if pd.isna(r.last_date) else pd.Timestamp(r.last_date),
+                r.last_close, r.adv_usd, r.volatility, tuple(tuple(x) for x in json.loads(r.sig)),
+                np.asarray(r.tail_date, dtype="datetime64[ns]"), np.asarray(r.tail_close, dtype=float),
+                np.asarray(r.tail_volume, dtype=float))
+
+    def save(self):
+        """Write the index if anything changed since the last save/load."""
+        with self._lock:
+            if not self._dirty:
+                return
+            rows = [{"symbol": e.symbol, "bars": e.bars, "last_date": e.last_date, "last_close": e.last_close,
+                     "adv_usd": e.adv_usd, "volatility": e.volatility, "sig": json.dumps(list(e.sig)),
+                     "tail_date": e.tail_date.astype("int64").tolist(), "tail_close": e.tail_close.tolist(),
+                     "tail_volume": e.tail_volume.tolist(), "window": self.window}
+                    for e in self._entries.values()]
+            self._dirty = False
+        _atomic_parquet(pd.DataFrame(rows), self.path)
+
+    # --- updates ----------------------------------------------------------
+    def _set(self, entry: SymbolStats):
+        with self._lock:
+            self._entries[entry.symbol] = entry
+            self._dirty = True
+
+    def put(self, symbol: str, df: Optional[pd.DataFrame]):
+        """Index *symbol* from its full (deduplicated, date-sorted) history."""
+        sym = symbol.upper()
+        if df is None or df.empty:
+            with self._lock:
+                self._dirty |= self._entries.pop(sym, None) is not None
+            return
+        if not pd.to_datetime(df["date"]).is_monotonic_increasing:
+            df = df.assign(date=pd.to_datetime(df["date"])).drop_duplicates("date", keep="last").sort_values("date")
+        self._set(_summarize(sym, len(df), *_columns(df), self.window, cache_signature(sym, self.project_root)))
+
+    def extend(self, symbol: str, rows: pd.DataFrame):
+        """Fold bars that were just written to the cache into *symbol*'s entry.
+
+        Bars newer than the entry extend it, bars inside the kept tail replace
+        their date.  Anything older, an unknown symbol, or an entry that was
+        not current before this segment re-reads the cache instead.
+        """
+        sym = symbol.upper()
+        e = self._entries.get(sym)
+        if rows is None or rows.empty:
+            return
+        dates, close, volume = _columns(rows)
+        sig = cache_signature(sym, self.project_root)
+        # incremental only if the entry was current before this one new segment
+        current = e is not None and e.bars and len(sig) == len(e.sig) + 1 and set(e.sig) <= set(sig)
+        if not current or dates.min() < e.tail_date[0]:
+            self.put(sym, read_daily_cache(sym, self.project_root))
+            return
+        merged = pd.DataFrame({"date": np.r_[e.tail_date, dates], "close": np.r_[e.tail_close, close],
+                               "volume": np.r_[e.tail_volume, volume]})
+        merged = merged.drop_duplicates("date", keep="last").sort_values("date", kind="stable")
+        added = int(len(merged) - len(e.tail_date))
+        self._set(_summarize(sym, e.bars + added, *_columns(merged), self.window, sig))
+
+    def restamp(self, symbol: str):
+        """Re-record *symbol*'s cache signature after a content-preserving rewrite (compaction)."""
+        sym = symbol.upper()
+        with self._lock:
+            e = self._entries.get(sym)
+            if e is not None:
+                e.sig = cache_signature(sym, self.project_root)
+                self._dirty = True
+
+    def refresh(self, symbols: Iterable[str], workers: int = 8) -> int:
+        """Rebuild entries whose cache files changed; returns how many were re-read."""
+        stale = []
+        for s in symbols:
+            sym = s.upper()
+            e = self._entries.get(sym)
+            if e is None or e.sig != cache_signature(sym, self.project_root):
+                stale.append(sym)
+
+        def _rebuild(chunk):
+            for sym in chunk:
+                self.put(sym, read_daily_cache(sym, self.project_root))
+            return chunk
+
+        for _ in map_chunks(_rebuild, stale, workers=workers, kind="thread"):
+            pass
+        telemetry.counter("autoswing_stats_index_rebuilds_total", "Stats index entries re-read").inc(len(stale))
+        return len(stale)
+
+    # --- queries ----------------------------------------------------------
+    def frame(self, symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Scalar stats as a symbol-indexed frame (missing symbols are absent)."""
+        with self._lock:
+            entries = list(self._entries.values()) if symbols is None else \
+                [self._entries[s.upper()] for s in symbols if s.upper() in self._entries]
+        df = pd.DataFrame([[getattr(e, c) for c in STAT_COLUMNS] for e in entries],
+                          index=pd.Index([e.symbol for e in entries], name="symbol"), columns=STAT_COLUMNS)
+        return df.astype({"bars": "int64", "last_close": float, "adv_usd": float, "volatility": float})
@@ -1 +1,2 @@
-# package
+"""Persistent run/trade store (SQLite)."""
+from .store import RunStore, db_path  # noqa: F401
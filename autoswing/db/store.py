@@ -0,0 +1,216 @@
+"""SQLite store for backtest / pipeline runs, trades and equity points.
+
+One database file under ``runtime/db`` replaces the append-only trade CSVs:
+WAL mode lets the UI read while cron writes, and every run is written in a
+single transaction so concurrent writers never interleave rows.
+"""
+from __future__ import annotations
+import json
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DB_SUBDIR = "runtime/db"
+DB_NAME = "autoswing.sqlite"
+
+TRADE_COLS = [
+    "trade_id", "dt", "symbol", "side", "qty", "price", "notional", "fee",
+    "settle_dt", "settled", "realized_pnl", "cash_after",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    strategy TEXT,
+    params TEXT,
+    starting_cash REAL,
+    final_equity REAL,
+    n_trades INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_runs_kind ON runs(kind, started_at);
+CREATE TABLE IF NOT EXISTS trades (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    trade_id INTEGER NOT NULL,
+    dt TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    qty INTEGER,
+    price REAL,
+    notional REAL,
+    fee REAL,
+    settle_dt TEXT,
+    settled INTEGER,
+    realized_pnl REAL,
+    cash_after REAL,
+    PRIMARY KEY (run_id, trade_id)
+);
+CREATE INDEX IF NOT EXISTS ix_trades_symbol ON trades(symbol, dt);
+CREATE INDEX IF NOT EXISTS ix_trades_dt ON trades(dt);
+CREATE TABLE IF NOT EXISTS equity (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    dt TEXT NOT NULL,
+    equity REAL NOT NULL,
+    PRIMARY KEY (run_id, dt)
+);
+CREATE INDEX IF NOT EXISTS ix_equity_dt ON equity(dt);
+"""
+
+
+def db_path(project_root: Path) -> Path:
+    return Path(project_root) / DB_SUBDIR / DB_NAME
+
+
+def _iso(v) -> str:
+    if isinstance(v, (date, datetime)):
+        return v.isoformat()
+    return str(v)
+
+
+def _day(v) -> date:
+    return pd.Timestamp(v).date()
+
+
+class RunStore:
+    """Thin wrapper around one SQLite file; safe to open from several processes."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+
+    @classmethod
+    def for_project(cls, project_root: Path) -> "RunStore":
+        return cls(db_path(project_root))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def _tx(self):
+        # BEGIN IMMEDIATE takes the write lock up front so two writers queue
+        # instead of failing halfway through a run.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # --- writes -----------------------------------------------------------
+    def record_run(
+        self,
+        trades: Iterable[dict],
+        equity_curve: Sequence[Tuple[date, float]] = (),
+        kind: str = "backtest",
+        strategy: Optional[str] = None,
+        params: Optional[dict] = None,
+        starting_cash: Optional[float] = None,
+        final_equity: Optional[float] = None,
+        started_at: Optional[datetime] = None,
+        run_id: Optional[str] = None,
+    ) -> str:
+        """Insert a complete run (header, trades, equity) in one transaction."""
+        run_id = run_id or uuid.uuid4().hex
+        started = (started_at or datetime.now()).isoformat(timespec="seconds")
+        rows = [
+            (run_id, int(t["trade_id"]), _iso(t["dt"]), t["symbol"], t["side"], int(t["qty"]),
+             float(t["price"]), float(t["notional"]), float(t["fee"]), _iso(t["settle_dt"]),
+             int(bool(t["settled"])), float(t["realized_pnl"]), float(t["cash_after"]))
+            for t in trades
+        ]
+        eq_rows = [(run_id, _iso(d), float(v)) for d, v in equity_curve]
+        with self._tx() as c:
+            c.execute(
+                "INSERT INTO runs (run_id, kind, started_at, finished_at, strategy, params,"
+                " starting_cash, final_equity, n_trades) VALUES (?,?,?,?,?,?,?,?,?)",
+                (run_id, kind, started, datetime.now().isoformat(timespec="seconds"), strategy,
+                 json.dumps(params or {}, default=str), starting_cash, final_equity, len(rows)),
+            )
+            c.executemany(f"INSERT INTO trades VALUES ({','.join('?' * 13)})", rows)
+            c.executemany("INSERT INTO equity VALUES (?,?,?)", eq_rows)
+        return run_id
+
+    def delete_run(self, run_id: str):
+        with self._tx() as c:
+            c.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    # --- reads ------------------------------------------------------------
+    def runs(self, kind: Optional[str] = None, limit: int = 50) -> pd.DataFrame:
+        sql = "SELECT * FROM runs"
+        args: list = []
+        if kind:
+            sql += " WHERE kind = ?"
+            args.append(kind)
+        sql += " ORDER BY started_at DESC, rowid DESC LIMIT ?"
+        args.append(limit)
+        return pd.read_sql_query(sql, self.conn, params=args)
+
+    def latest_run_id(self, kind: Optional[str] = None) -> Optional[str]:
+        df = self.runs(kind, limit=1)
+        return None if df.empty else str(df.run_id.iloc[0])
+
+    def trades(
+        self,
+        run_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        side: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Trade slice filtered on the indexed columns; typed (dates parsed).
+
+        *start* and *end* are whole days, inclusive: ``dt`` is stored as a
+        date or a datetime ISO string, so the end bound is "before the next
+        day" rather than a string ``<=`` that would drop end-day datetimes.
+        """
+        where, args = [], []
+        lo = None if start is None else _day(start).isoformat()
+        hi = None if end is None else (_day(end) + timedelta(days=1)).isoformat()
+        for col, op, val in (("run_id", "=", run_id), ("symbol", "=", symbol),
+                             ("dt", ">=", lo), ("dt", "<", hi), ("side", "=", side)):
+            if val is not None:
+                where.append(f"{col} {op} ?")
+                args.append(val)
+        sql = "SELECT * FROM trades" + (" WHERE " + " AND ".join(where) if where else "")
+        df = pd.read_sql_query(sql + " ORDER BY dt, run_id, trade_id", self.conn, params=args)
+        for col in ("dt", "settle_dt"):
+            df[col] = pd.to_datetime(df[col], format="ISO8601")   # date and datetime rows can mix
+        df["settled"] = df["settled"].astype(bool)
+        return df
+
+    def equity(self, run_id: str) -> pd.Series:
+        df = pd.read_sql_query("SELECT dt, equity FROM equity WHERE run_id = ? ORDER BY dt",
+                               self.conn, params=[run_id])
+        return pd.Series(df.equity.to_numpy(), index=pd.to_datetime(df.dt).rename("date"), name="equity")
+
+    def trade_pnls(self, run_id: Optional[str] = None, symbol: Optional[str] = None) -> np.ndarray:
+        """Realized PnL of closing trades, straight from SQL (no DataFrame)."""
+        sql = "SELECT realized_pnl FROM trades WHERE side = 'sell'"
+        args = []
+        if run_id is not None:
+            sql += " AND run_id = ?"
+            args.append(run_id)
+        if symbol is not None:
+            sql += " AND symbol = ?"
+            args.append(symbol)
+        return np.fromiter((r[0] for r in self.conn.execute(sql, args)), dtype=float)
@@ -1,4 +1,5 @@
 """Engine package exports for AutoSwingUS‑Pro."""
 from .portfolio import Portfolio, Position  # noqa: F401
-from .compliance import CashLedger, PDTMonitor  # noqa: F401
+from .compliance import CashLedger, Compliance, PDTMonitor  # noqa: F401
 from .paper_executor import PaperExecutor, PaperAccount  # noqa: F401
+from .live import LiveEngine, ReplayFeed, PaperBroker, BrokerAdapter  # noqa: F401
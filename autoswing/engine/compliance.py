@@ -0,0 +1,241 @@
+"""Cash-account compliance checks: free-riding and pattern day trading.
+
+Every rule keeps incrementally maintained state, so checking an order is O(1)
+and never scans trade history:
+
+* :class:`FreerideGuard` tracks settled buying power (settled credits minus
+  every debit as soon as it is made) and a queue of unsettled sale proceeds
+  that drains as their settlement dates pass.  A buy larger than settled
+  buying power is paid with unsettled funds (``unsettled_funds``).  Selling
+  such a position before those funds settle is free-riding (``freeride``).
+* :class:`PDTMonitor` remembers which symbols were opened in the current
+  session and keeps a deque of day-trade dates trimmed to the rolling
+  5-session window.  A sell that would be the 4th day trade in that
+  window while equity is under $25k is flagged (``pdt``).
+
+Settlement dates and the PDT window count sessions of a
+:class:`~autoswing.data.calendar.TradingCalendar` (default: equities).
+
+:class:`Compliance` combines both.  It follows ``enforce_cash_settlement``
+and ``warn_pdt_trades`` from settings, and with ``log_only=True`` records
+violations without blocking (backtests).  :meth:`Compliance.check_batch`
+checks a whole session's fills with array operations for the vectorized
+fill path.  A :class:`Compliance` is also a LiveEngine pre-trade check, and
+a :class:`~autoswing.engine.paper_executor.PaperAccount` built with it
+reports its fills back automatically.
+"""
+from __future__ import annotations
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from autoswing.data.calendar import TradingCalendar, equities_calendar
+from autoswing.engine.ledger import CashLedger  # noqa: F401  (re-exported by autoswing.engine)
+from autoswing.utils import telemetry
+
+_EPS = 1e-9
+
+
+@dataclass
+class Violation:
+    dt: date
+    symbol: str
+    side: str
+    qty: int
+    price: float
+    rule: str
+    blocked: bool
+
+
+class FreerideGuard:
+    """Settled buying power plus the unsettled-proceeds queue."""
+
+    def __init__(self, starting_cash: float, settlement_days: int = 1,
+                 calendar: Optional[TradingCalendar] = None):
+        self.settlement_days = settlement_days
+        self.calendar = calendar or equities_calendar()
+        self.available = float(starting_cash)     # settled credits - all debits
+        self.unsettled = 0.0                      # sale proceeds not yet settled
+        self._credits: Deque[tuple] = deque()     # (settle_date, amount), in settle order
+        self._funded_until: Dict[str, date] = {}  # symbol -> date its unsettled funding settles
+
+    def advance(self, dt: date):
+        while self._credits and self._credits[0][0] <= dt:
+            _, amount = self._credits.popleft()
+            self.available += amount
+            self.unsettled -= amount
+
+    def check(self, side: str, symbol: str, notional: float, dt: date) -> Optional[str]:
+        self.advance(dt)
+        if side == "buy":
+            return "unsettled_funds" if notional > self.available + _EPS else None
+        until = self._funded_until.get(symbol)
+        return "freeride" if until is not None and dt < until else None
+
+    def record(self, side: str, symbol: str, notional: float, dt: date, fee: float = 0.0):
+        self.advance(dt)
+        if side == "buy":
+            cost = notional + fee
+            if cost > self.available + _EPS and self._credits:
+                until = self._credits[-1][0]
+                self._funded_until[symbol] = max(until, self._funded_until.get(symbol, until))
+            self.available -= cost
+            return
+        settle = self.calendar.next_session(dt, self.settlement_days)
+        self._credits.append((settle, notional - fee))
+        self.unsettled += notional - fee
+
+
+class PDTMonitor:
+    """Rolling count of day trades (same-session open and close of a symbol)."""
+
+    def __init__(self, max_day_trades: int = 3, window_days: int = 5, equity_threshold: float = 25_000.0,
+                 calendar: Optional[TradingCalendar] = None):
+        self.max_day_trades = max_day_trades
+        self.window_days = window_days
+        self.equity_threshold = equity_threshold
+        self.calendar = calendar or equities_calendar()
+        self._opened: Dict[str, date] = {}  # symbol -> last session it was bought
+        self._day_trades: Deque[date] = deque()
+
+    def _expire(self, dt: date):
+        start = self.calendar.next_session(dt, -(self.window_days - 1))
+        while self._day_trades and self._day_trades[0] < start:
+            self._day_trades.popleft()
+
+    def count(self, dt: date) -> int:
+        """Day trades within the window ending at *dt*."""
+        self._expire(dt)
+        return len(self._day_trades)
+
+    def is_day_trade(self, side: str, symbol: str, dt: date) -> bool:
+        return side == "sell" and self._opened.get(symbol) == dt
+
+    def check(self, side: str, symbol: str, dt: date, equity: Optional[float] = None) -> Optional[str]:
+        if not self.is_day_trade(side, symbol, dt):
+            return None
+        if equity is not None and equity >= self.equity_threshold:
+            return None
+        return "pdt" if self.count(dt) + 1 > self.max_day_trades else None
+
+    def record(self, side: str, symbol: str, dt: date):
+        if side == "buy":
+            self._opened[symbol] = dt
+        elif self.is_day_trade(side, symbol, dt):
+            self._expire(dt)
+            self._day_trades.append(dt)
+
+
+class Compliance:
+    """Pre-trade checks for a cash account; violations are kept in :attr:`violations`.
+
+    *enforce_settlement* / *enforce_pdt* decide whether a rule blocks the
+    order or only records it; *log_only* turns every rule into record-only.
+    """
+
+    def __init__(self, starting_cash: float, settlement_days: int = 1, enforce_settlement: bool = True,
+                 pdt: Optional[PDTMonitor] = None, enforce_pdt: bool = False, log_only: bool = False,
+                 calendar: Optional[TradingCalendar] = None):
+        self.freeride = FreerideGuard(starting_cash, settlement_days, calendar)
+        self.pdt = pdt
+        self.enforce = {"unsettled_funds": enforce_settlement and not log_only,
+                        "freeride": enforce_settlement and not log_only,
+                        "pdt": enforce_pdt and not log_only}
+        self.violations: List[Violation] = []
+        self.counts: Counter = Counter()
+
+    @classmethod
+    def from_settings(cls, settings, starting_cash: float, settlement_days: int = 1,
+                      log_only: bool = False, calendar: Optional[TradingCalendar] = None) -> "Compliance":
+        raw = settings if isinstance(settings, dict) else settings.model_dump()
+        return cls(starting_cash, settlement_days,
+                   enforce_settlement=bool(raw.get("enforce_cash_settlement", True)),
+                   pdt=PDTMonitor(calendar=calendar) if raw.get("warn_pdt_trades", True) else None,
+                   log_only=log_only, calendar=calendar)
+
+    def config(self) -> dict:
+        """Result-cache key material."""
+        return {"enforce": dict(self.enforce), "settlement_days": self.freeride.settlement_days,
+                "calendar": self.freeride.calendar.name,
+                "pdt": None if self.pdt is None else {k: v for k, v in vars(self.pdt).items()
+                                                      if not k.startswith("_") and k != "calendar"}}
+
+    def _note(self, dt, symbol, side, qty, price, rule) -> bool:
+        blocked = self.enforce[rule]
+        self.violations.append(Violation(dt, symbol, side, int(qty), float(price), rule, blocked))
+        self.counts[rule] += 1
+        telemetry.counter("autoswing_compliance_violations_total", "Compliance rule hits", rule=rule,
+                          blocked=str(blocked).lower()).inc()
+        return blocked
+
+    # --- single order -----------------------------------------------------
+    def check(self, side: str, symbol: str, qty: int, price: float, dt: date,
+              equity: Optional[float] = None) -> Optional[str]:
+        """Rule that blocks this order, or None (non-blocking hits are recorded)."""
+        reasons = [self.freeride.check(side, symbol, qty * price, dt)]
+        if self.pdt is not None:
+            reasons.append(self.pdt.check(side, symbol, dt, equity))
+        for rule in reasons:
+            if rule and self._note(dt, symbol, side, qty, price, rule):
+                return rule
+        return None
+
+    def record(self, side: str, symbol: str, qty: int, price: float, dt: date, fee: float = 0.0):
+        """Update state after a fill (called by PaperAccount for attached accounts)."""
+        self.freeride.record(side, symbol, qty * price, dt, fee)
+        if self.pdt is not None:
+            self.pdt.record(side, symbol, dt)
+
+    def __call__(self, account, order) -> Optional[str]:
+        """LiveEngine ``Check`` protocol."""
+        return self.check(order.side, order.symbol, order.qty, order.price, order.dt)
+
+    # --- batch ------------------------------------------------------------
+    def check_batch(self, dt: date, symbols: Sequence[str], sides: Sequence[str], qtys, prices,
+                    equity: Optional[float] = None) -> np.ndarray:
+        """Allowed-mask for one session's fills, applied sells first, then buys in order.
+
+        A buy is admitted if it fits the settled buying power left after
+        the buys admitted before it (sale proceeds from the same batch are
+        unsettled), as a sequence of :meth:`check` calls would; the
+        day-trade count accumulates across the batch.
+        """
+        sides = np.asarray(sides)
+        notional = np.asarray(qtys, dtype=float) * np.asarray(prices, dtype=float)
+        sells = sides == "sell"
+        fr = self.freeride
+        fr.advance(dt)
+        rules = np.full(len(sides), "", dtype=object)
+        until = np.array([fr._funded_until.get(s) for s in symbols], dtype=object)
+        funded = np.array([u is not None and dt < u for u in until], dtype=bool)
+        rules[sells & funded] = "freeride"
+        if self.pdt is not None and (equity is None or equity < self.pdt.equity_threshold):
+            opened = np.array([self.pdt._opened.get(s) == dt for s in symbols], dtype=bool)
+            dtrade = sells & opened
+            over = (self.pdt.count(dt) + np.cumsum(dtrade)) > self.pdt.max_day_trades
+            rules[dtrade & over & (rules == "")] = "pdt"
+        allowed = np.ones(len(sides), dtype=bool)
+        for i in np.flatnonzero(sells & (rules != "")):
+            if self._note(dt, symbols[i], sides[i], qtys[i], prices[i], rules[i]):
+                allowed[i] = False
+        # buys in order: only the ones that will fill use up buying power
+        spent = 0.0
+        for i in np.flatnonzero(~sells):
+            if spent + notional[i] > fr.available + _EPS and \
+                    self._note(dt, symbols[i], sides[i], qtys[i], prices[i], "unsettled_funds"):
+                allowed[i] = False
+                continue
+            spent += notional[i]
+        return allowed
+
+    def summary(self) -> dict:
+        return {"violations": len(self.violations), "blocked": sum(v.blocked for v in self.violations),
+                "by_rule": dict(self.counts)}
+
+    def violations_frame(self):
+        import pandas as pd
+        return pd.DataFrame([asdict(v) for v in self.violations],
+                            columns=["dt", "symbol", "side", "qty", "price", "rule", "blocked"])
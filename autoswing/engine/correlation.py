@@ -0,0 +1,47 @@
+"""Correlation limit on new entries.
+
+``max_positions`` and percent-of-cash sizing say nothing about *what* is
+held, so a backtest will happily fill every slot with names that move
+together.  With a :class:`CorrelationLimit` the bar loop keeps a
+:class:`~autoswing.analysis.covariance.RollingCovariance` of the universe's
+daily returns, updated once per session, and skips a buy signal whose return
+correlation with any holding (open positions, resting entry orders and
+entries taken earlier the same session) exceeds ``max_corr``.  Pairs with
+too little common history (``min_periods``) never block.
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional
+
+from autoswing.analysis.covariance import RollingCovariance
+
+
+@dataclass
+class CorrelationLimit:
+    max_corr: float = 0.7            # skip entries correlated above this with a holding
+    window: Optional[int] = 60       # sessions of returns; or
+    halflife: Optional[float] = None  # exponential weighting instead of a window
+    min_periods: int = 20            # common sessions a pair needs before it counts
+
+    def __post_init__(self):
+        if not -1.0 < self.max_corr <= 1.0:
+            raise ValueError("max_corr must be in (-1, 1]")
+        if self.halflife is not None:
+            self.window = None
+        if self.window is None and self.halflife is None:
+            raise ValueError("give a window or a halflife")
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["CorrelationLimit"]:
+        """Limit from the ``correlation`` block; None when ``max_corr`` is unset."""
+        raw = settings if isinstance(settings, dict) else settings.model_dump()
+        block = dict(raw.get("correlation") or {})
+        if block.get("max_corr") is None:
+            return None
+        return cls(**block)
+
+    def tracker(self, symbols: Iterable[str]) -> RollingCovariance:
+        return RollingCovariance(symbols, window=self.window, halflife=self.halflife, min_periods=self.min_periods)
+
+    def key(self) -> dict:
+        return asdict(self)
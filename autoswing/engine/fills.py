@@ -0,0 +1,240 @@
+"""Vectorized intrabar fill simulation for resting orders.
+
+Orders rest in an :class:`OrderBook` held as parallel numpy arrays.  Each
+session :meth:`OrderBook.match` evaluates every resting order for every
+symbol against that day's open/high/low/close/volume in one pass (no
+per-order Python branching); the resulting fills are applied to the
+:class:`~autoswing.engine.paper_executor.PaperAccount` as one batch.
+
+Fill rules per bar (buy side; sells are the mirror image):
+
+* ``market``     fills at the open.
+* ``limit L``    fills at the open if it gaps through (``open <= L``),
+  otherwise at ``L`` if ``low <= L``.
+* ``stop S``     fills at the open if it gaps through (``open >= S``),
+  otherwise at ``S`` if ``high >= S``.
+* ``stop_limit`` triggers like a stop, then fills like a limit at ``L``.
+
+``gap_fill="order"`` ignores gaps and fills at the order price instead of the
+open.  Adverse slippage (bps) applies to market and stop fills; limit
+prices are protected.  With ``participation`` a fill takes at most that
+fraction of the bar's volume and the rest keeps resting until ``ttl_bars``
+sessions with a bar have passed.
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from autoswing.data.calendar import TradingCalendar, to_days
+
+MARKET, LIMIT, STOP, STOP_LIMIT = 0, 1, 2, 3
+ORDER_TYPES = {"market": MARKET, "limit": LIMIT, "stop": STOP, "stop_limit": STOP_LIMIT}
+BUY, SELL = 1, -1
+
+
+@dataclass
+class FillModel:
+    """How entries/exits are turned into orders and how those orders fill."""
+    entry_type: str = "limit"        # market | limit | stop | stop_limit (placed at the signal close)
+    limit_offset_bps: float = 0.0    # limit entries: this far below the signal price
+    stop_offset_bps: float = 0.0     # stop entries: trigger this far above the signal price
+    stop_limit_bps: float = 50.0     # stop_limit: limit this far beyond the trigger
+    exit_type: str = "market"        # timed exits: market (next open) | close (same bar, legacy)
+    gap_fill: str = "open"           # open | order
+    slippage_bps: float = 0.0
+    participation: Optional[float] = None  # max fraction of bar volume per fill
+    ttl_bars: int = 1                # sessions an unfilled entry rests
+    protective_stops: bool = False   # rest a sell stop at Signal.stop after an entry fills
+
+    def __post_init__(self):
+        if self.entry_type not in ORDER_TYPES:
+            raise ValueError(f"entry_type must be one of {sorted(ORDER_TYPES)}")
+        if self.exit_type not in ("market", "close"):
+            raise ValueError("exit_type must be 'market' or 'close'")
+        if self.gap_fill not in ("open", "order"):
+            raise ValueError("gap_fill must be 'open' or 'order'")
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["FillModel"]:
+        """Model for ``default_order_type`` + the ``execution`` block; None = close fills."""
+        raw = settings if isinstance(settings, dict) else settings.model_dump()
+        order_type = raw.get("default_order_type", "close")
+        if order_type in (None, "close"):
+            return None
+        return cls(entry_type=order_type, **(raw.get("execution") or {}))
+
+    def entry_prices(self, ref: float) -> Tuple[float, float]:
+        """(limit, stop) for an entry referenced to *ref* (NaN where unused)."""
+        if self.entry_type == "limit":
+            return ref * (1 - self.limit_offset_bps / 1e4), np.nan
+        if self.entry_type == "stop":
+            return np.nan, ref * (1 + self.stop_offset_bps / 1e4)
+        if self.entry_type == "stop_limit":
+            stop = ref * (1 + self.stop_offset_bps / 1e4)
+            return stop * (1 + self.stop_limit_bps / 1e4), stop
+        return np.nan, np.nan
+
+    def key(self) -> dict:
+        return asdict(self)
+
+
+class BarPanel:
+    """Wide ``[session, symbol]`` OHLCV arrays so a session's bars are one row each.
+
+    Columns follow *symbols* (default: the bundle's order); symbols missing
+    from *bundle* get an all-NaN column.
+    """
+
+    def __init__(self, bundle: Dict[str, pd.DataFrame], sessions, symbols: Optional[List[str]] = None):
+        self.symbols = list(bundle) if symbols is None else list(symbols)
+        self.index = {s: j for j, s in enumerate(self.symbols)}
+        shape = (len(sessions), len(self.symbols))
+        self.fields = {f: np.full(shape, np.nan) for f in ("open", "high", "low", "close", "volume")}
+        if not len(sessions):
+            return
+        cal = TradingCalendar("panel", to_days(sessions))
+        for sym, df in bundle.items():
+            j = self.index[sym]
+            pos = cal.session_index(df["date"])
+            ok = pos >= 0
+            for f, arr in self.fields.items():
+                src = f if f in df else ("close" if f != "volume" else None)
+                if src is not None:
+                    arr[pos[ok], j] = df[src].to_numpy(dtype=float)[ok]
+
+    def row(self, i: int) -> Tuple[np.ndarray, ...]:
+        return tuple(self.fields[f][i] for f in ("open", "high", "low", "close", "volume"))
+
+
+class OrderBook:
+    """Resting orders as parallel arrays; ``match`` fills them against one session."""
+
+    _COLS = ("sym", "side", "kind", "qty", "limit", "stop", "ttl", "slip", "ref")
+
+    def __init__(self, model: FillModel):
+        self.model = model
+        self.sym = np.empty(0, dtype=np.int64)
+        self.side = np.empty(0, dtype=np.int64)
+        self.kind = np.empty(0, dtype=np.int64)
+        self.qty = np.empty(0, dtype=np.int64)
+        self.limit = np.empty(0)
+        self.stop = np.empty(0)
+        self.ttl = np.empty(0)
+        self.slip = np.empty(0, dtype=bool)
+        self.ref = np.empty(0)  # price the order was sized at
+        self._pending: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self.sym) + len(self._pending)
+
+    def add(self, sym: int, side: int, kind: int, qty: int, limit: float = np.nan, stop: float = np.nan,
+            ttl: float = np.inf, ref: float = np.nan):
+        self._pending.append((sym, side, kind, qty, limit, stop, ttl, kind in (MARKET, STOP), ref))
+
+    def cancel(self, mask: np.ndarray):
+        keep = ~mask
+        for c in self._COLS:
+            setattr(self, c, getattr(self, c)[keep])
+
+    def resting(self, side: int) -> np.ndarray:
+        """Symbol indices with an order resting (or just placed) on *side*."""
+        self._commit()
+        return np.unique(self.sym[self.side == side])
+
+    def committed(self) -> Tuple[float, np.ndarray]:
+        """``(cash, symbols)`` of resting buys: cash at the highest of sizing, limit and stop price."""
+        self._commit()
+        b = self.side == BUY
+        px = np.fmax(np.fmax(self.ref[b], self.limit[b]), self.stop[b])
+        return float(np.nansum(self.qty[b] * px)), np.unique(self.sym[b])
+
+    def cancel_sells(self, sym: int):
+        self._commit()
+        self.cancel((self.sym == sym) & (self.side == SELL))
+
+    def cancel_exit(self, sym: int):
+        """Drop *sym*'s resting market sell (a timed exit); protective stops stay."""
+        self._commit()
+        self.cancel((self.sym == sym) & (self.side == SELL) & (self.kind == MARKET))
+
+    def _commit(self):
+        if not self._pending:
+            return
+        cols = list(zip(*self._pending))
+        self._pending = []
+        for c, vals in zip(self._COLS, cols):
+            cur = getattr(self, c)
+            setattr(self, c, np.concatenate([cur, np.asarray(vals, dtype=cur.dtype)]))
+
+    def match(self, o, h, l, c, v, allow=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Fill against one session's per-symbol bar arrays.
+
+        Returns ``(sym, side, qty, price)`` of the fills; filled quantities are
+        removed and orders that ran out of ``ttl`` expire.  *allow*, if
+        given, is called with the candidate fills as the same four arrays
+        and returns a keep-mask; rejected fills stay resting as if their
+        price had not been reached.
+        """
+        self._commit()
+        empty = (np.empty(0, dtype=np.int64),) * 3 + (np.empty(0),)
+        if not len(self.sym):
+            return empty
+        m = self.model
+        s = self.side.astype(float)
+        # mirror sells into buy space: prices negate, high/low swap
+        bo, bh, bl = (o[self.sym] * s, np.where(s > 0, h[self.sym], -l[self.sym]),
+                      np.where(s > 0, l[self.sym], -h[self.sym]))
+        L, S = self.limit * s, self.stop * s
+        has_bar = ~np.isnan(bo)
+        gap_open = m.gap_fill == "open"
+        price = np.full(len(bo), np.nan)
+        with np.errstate(invalid="ignore"):
+            k = self.kind
+            # market
+            mk = has_bar & (k == MARKET)
+            price[mk] = bo[mk]
+            # limit
+            lk = has_bar & (k == LIMIT)
+            lgap = lk & (bo <= L)
+            price[lgap] = bo[lgap] if gap_open else L[lgap]
+            lin = lk & ~lgap & (bl <= L)
+            price[lin] = L[lin]
+            # stop
+            sk = has_bar & (k == STOP)
+            sgap = sk & (bo >= S)
+            price[sgap] = bo[sgap] if gap_open else S[sgap]
+            sin = sk & ~sgap & (bh >= S)
+            price[sin] = S[sin]
+            # stop-limit: trigger, then the limit must be reachable
+            tk = has_bar & (k == STOP_LIMIT)
+            tgap = tk & (bo >= S)
+            tin = tk & ~tgap & (bh >= S)
+            trig_px = np.where(tgap, bo if gap_open else S, S)
+            ok = (tgap | tin) & (trig_px <= L)
+            price[ok] = trig_px[ok]
+            late = (tgap | tin) & ~ok & (bl <= L)
+            price[late] = L[late]
+        filled = ~np.isnan(price)
+        price = price * s  # back to real prices
+        price = np.where(self.slip, price * (1 + s * m.slippage_bps / 1e4), price)  # adverse
+
+        qty = np.where(filled, self.qty, 0)
+        if m.participation is not None:
+            vol = v[self.sym]
+            cap = np.where(np.isnan(vol) | (vol <= 0), self.qty, np.floor(vol * m.participation)).astype(np.int64)
+            qty = np.minimum(qty, cap)
+        fills = qty > 0
+        if allow is not None and fills.any():
+            idx = np.flatnonzero(fills)
+            ok = np.asarray(allow(self.sym[idx], self.side[idx], qty[idx], price[idx]), dtype=bool)
+            qty[idx[~ok]] = 0
+            fills = qty > 0
+        out = (self.sym[fills], self.side[fills], qty[fills], price[fills])
+
+        self.qty = self.qty - qty
+        self.ttl = self.ttl - has_bar
+        self.cancel((self.qty <= 0) | (self.ttl <= 0))
+        return out
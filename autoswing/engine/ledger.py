@@ -1,7 +1,10 @@
 from __future__ import annotations
+import heapq
 from dataclasses import dataclass
-from datetime import date, timedelta
-from typing import List
+from datetime import date
+from typing import List, Optional, Tuple
+
+from autoswing.data.calendar import TradingCalendar, equities_calendar
 
 @dataclass
 class CashEvent:
@@ -12,31 +15,76 @@ class CashEvent:
     note: str = ""
 
 class CashLedger:
-    """T+1 (default) settlement cash ledger."""
-    def __init__(self, starting_cash: float, settlement_days: int = 1):
+    """T+1 (default) settlement cash ledger.
+
+    Settlement counts exchange sessions of *calendar* (default: the equities
+    calendar), so a Friday trade settles T+1 on Monday, not Saturday.
+
+    Settled cash is kept as a running total plus a queue of pending events,
+    so queries with non-decreasing dates (every backtest and live loop) cost
+    O(1) amortized instead of a scan over :attr:`events`.  An earlier date
+    falls back to the scan.
+    """
+    def __init__(self, starting_cash: float, settlement_days: int = 1,
+                 calendar: Optional[TradingCalendar] = None):
         self.starting_cash = float(starting_cash)
         self.settlement_days = settlement_days
+        self.calendar = calendar or equities_calendar()
         self.events: List[CashEvent] = []
+        self._settled = self.starting_cash
+        self._total = self.starting_cash
+        self._asof: date | None = None
+        self._pending: List[Tuple[date, int, float]] = []  # heap of (settle_date, seq, amount)
+        self._debits = 0.0  # pending (unsettled) debits, <= 0
 
     def record(self, trade_dt: date, amount: float, symbol: str, note: str = ""):
-        self.events.append(
-            CashEvent(
-                trade_date=trade_dt,
-                settle_date=trade_dt + timedelta(days=self.settlement_days),
-                amount=float(amount),
-                symbol=symbol,
-                note=note,
-            )
+        ev = CashEvent(
+            trade_date=trade_dt,
+            settle_date=self.calendar.next_session(trade_dt, self.settlement_days),
+            amount=float(amount),
+            symbol=symbol,
+            note=note,
         )
+        self.events.append(ev)
+        self._total += ev.amount
+        if self._asof is not None and ev.settle_date <= self._asof:
+            self._settled += ev.amount
+        else:
+            heapq.heappush(self._pending, (ev.settle_date, len(self.events), ev.amount))
+            self._debits += min(ev.amount, 0.0)
+
+    def _advance(self, on_dt: date) -> bool:
+        if self._asof is not None and on_dt < self._asof:
+            return False
+        while self._pending and self._pending[0][0] <= on_dt:
+            amount = heapq.heappop(self._pending)[2]
+            self._settled += amount
+            self._debits -= min(amount, 0.0)
+        self._asof = on_dt
+        return True
 
     def settled_cash(self, on_dt: date) -> float:
+        if self._advance(on_dt):
+            return self._settled
         cash = self.starting_cash
         for ev in self.events:
             if ev.settle_date <= on_dt:
                 cash += ev.amount
         return cash
 
+    def buying_power(self, on_dt: date) -> float:
+        """Settled cash less debits not settled yet: what a cash account may spend on *on_dt*."""
+        if self._advance(on_dt):
+            return self._settled + self._debits
+        cash = self.starting_cash
+        for ev in self.events:
+            if ev.settle_date <= on_dt or (ev.amount < 0 and ev.trade_date <= on_dt):
+                cash += ev.amount
+        return cash
+
     def unsettled_cash(self, on_dt: date) -> float:
+        if self._advance(on_dt):
+            return self._total - self._settled
         cash = 0.0
         for ev in self.events:
             if ev.settle_date > on_dt:
@@ -0,0 +1,316 @@
+"""Event-driven live/paper engine on asyncio.
+
+A feed yields :class:`Bar` events; :class:`LiveEngine` keeps a rolling
+window per symbol, runs timed exits, asks the strategy to ``scan`` only the
+symbol that just updated, sizes entries like the backtester
+(:func:`~autoswing.engine.paper_executor.percent_cash_size`), passes every
+order through pre-trade checks and hands it to a :class:`BrokerAdapter`.
+The time from a bar leaving the feed to its orders being acknowledged is
+recorded per event (``latency``, includes queueing behind earlier bars),
+as is the engine's own handling time for it (``service``).
+
+:class:`ReplayFeed` streams cached parquet bars at a configurable pace, so
+the whole path (feed -> strategy -> checks -> broker) can be exercised and
+benchmarked offline with :class:`PaperBroker`.  A real broker plugs in by
+implementing :meth:`BrokerAdapter.submit`.
+"""
+from __future__ import annotations
+import abc
+import asyncio
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from autoswing.analysis.sketch import QuantileSketch
+from autoswing.data.calendar import calendar_for_symbols
+from autoswing.engine.paper_executor import PaperAccount, _record_run, percent_cash_size
+from autoswing.utils import telemetry
+
+
+@dataclass
+class Bar:
+    symbol: str
+    dt: date
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    recv_ns: int = 0  # perf_counter_ns when the feed emitted it
+
+
+@dataclass
+class Order:
+    symbol: str
+    side: str      # 'buy' | 'sell'
+    qty: int
+    price: float   # reference (bar close) price
+    dt: date
+    reason: str = ""
+
+
+# ---------------------------------------------------------------------------
+# Feeds
+# ---------------------------------------------------------------------------
+
+class ReplayFeed:
+    """Replays daily bars session by session.
+
+    *interval* is the pause in seconds between sessions (0 = as fast as the
+    consumer keeps up; the feed still yields to the event loop each session).
+    """
+
+    def __init__(self, bundle: Dict[str, pd.DataFrame], interval: float = 0.0):
+        self.interval = float(interval)
+        frames = []
+        for sym, df in bundle.items():
+            if df is None or df.empty:
+                continue
+            f = df.assign(symbol=sym)
+            f["date"] = pd.to_datetime(f["date"]).dt.date
+            frames.append(f)
+        cols = ["date", "symbol", "open", "high", "low", "close", "volume"]
+        if frames:
+            bars = pd.concat(frames, ignore_index=True)
+            for c in ("open", "high", "low", "volume"):
+                if c not in bars:
+                    bars[c] = bars["close"] if c != "volume" else 0.0
+            self.bars = bars[cols].sort_values(["date", "symbol"], kind="stable").reset_index(drop=True)
+        else:
+            self.bars = pd.DataFrame(columns=cols)
+
+    @classmethod
+    def from_cache(cls, symbols: Sequence[str], days: int, project_root: Path, interval: float = 0.0) -> "ReplayFeed":
+        from autoswing.data.loader import load_bundle_cached
+        return cls(load_bundle_cached(list(symbols), days, project_root), interval=interval)
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    async def __aiter__(self) -> AsyncIterator[Bar]:
+        current = None
+        for dt, sym, o, h, lo, c, v in self.bars.itertuples(index=False, name=None):
+            if dt != current:
+                if current is not None:
+                    await asyncio.sleep(self.interval)
+                current = dt
+            yield Bar(sym, dt, float(o), float(h), float(lo), float(c), float(v), time.perf_counter_ns())
+
+
+# ---------------------------------------------------------------------------
+# Brokers and pre-trade checks
+# ---------------------------------------------------------------------------
+
+class BrokerAdapter(abc.ABC):
+    """Order sink.  ``submit`` returns the fill as a trade dict, or None if not filled."""
+
+    @abc.abstractmethod
+    async def submit(self, order: Order) -> Optional[dict]:
+        ...
+
+
+class PaperBroker(BrokerAdapter):
+    """Fills immediately at the order's reference price on a :class:`PaperAccount`.
+
+    *delay* simulates a broker round trip (seconds).
+    """
+
+    def __init__(self, account: PaperAccount, fee_per_share: float = 0.0, delay: float = 0.0):
+        self.account = account
+        self.fee_per_share = fee_per_share
+        self.delay = delay
+
+    async def submit(self, order: Order) -> Optional[dict]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        fee = self.fee_per_share * order.qty
+        if order.side == "buy":
+            tr = self.account.buy(order.dt, order.symbol, order.price, order.qty, fee=fee)
+        else:
+            tr = self.account.sell(order.dt, order.symbol, order.price, order.qty, fee=fee)
+        return tr.__dict__ if tr else None
+
+
+Check = Callable[[PaperAccount, Order], Optional[str]]  # -> rejection reason or None
+
+
+def settled_cash_check(account: PaperAccount, order: Order) -> Optional[str]:
+    """Buys must be paid from settled cash (no free-riding on unsettled proceeds)."""
+    if order.side == "buy" and order.qty * order.price > account.settled_cash(order.dt) + 1e-9:
+        return "insufficient settled cash"
+    return None
+
+
+DEFAULT_CHECKS: List[Check] = [settled_cash_check]
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+@dataclass
+class LiveStats:
+    events: int = 0
+    signals: int = 0
+    orders: int = 0
+    fills: int = 0
+    rejected: Counter = field(default_factory=Counter)
+    latency: QuantileSketch = field(default_factory=lambda: QuantileSketch(0.01))
+    service: QuantileSketch = field(default_factory=lambda: QuantileSketch(0.01))
+    seconds: float = 0.0
+
+    def summary(self) -> dict:
+        out = {"events": self.events, "signals": self.signals, "orders": self.orders, "fills": self.fills,
+               "rejected": dict(self.rejected), "seconds": round(self.seconds, 3),
+               "events_per_sec": round(self.events / self.seconds, 1) if self.seconds else None}
+        for name, sk in (("latency", self.latency), ("service", self.service)):
+            for label, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0)):
+                out[f"{name}_ms_{label}"] = round(sk.quantile(q) * 1000, 3) if sk.count else None
+        return out
+
+
+class LiveEngine:
+    """Consumes a bar feed and trades *strategy* through *broker*.
+
+    Bars are pulled into a bounded queue (backpressure on the feed) and
+    handled one at a time.  ``account.equity_curve`` gets one point per
+    session, as in :func:`~autoswing.engine.paper_executor.run_bar_backtest`.
+    """
+
+    def __init__(self, strategy, feed, account: PaperAccount, broker: Optional[BrokerAdapter] = None,
+                 max_hold_days: Optional[int] = None, checks: Optional[Sequence[Check]] = None,
+                 window: Optional[int] = None, queue_size: int = 1024):
+        self.strategy = strategy
+        self.feed = feed
+        self.account = account
+        self.broker = broker or PaperBroker(account)
+        self.max_hold_days = max_hold_days
+        self.checks = list(DEFAULT_CHECKS if checks is None else checks)
+        self.window = window or max(1, int(getattr(strategy, "warmup_bars", 50)))
+        self.queue_size = queue_size
+        self.trades: List[dict] = []
+        self.stats = LiveStats()
+        self._hist: Dict[str, Deque[tuple]] = {}
+        self._marks: Dict[str, float] = {}
+        self._session: Optional[date] = None
+        self._stop = asyncio.Event()
+
+    def stop(self):
+        """End :meth:`run` after the bar in hand, or right away if it is waiting on the feed."""
+        self._stop.set()
+
+    # --- per event ----------------------------------------------------------
+    def _frame(self, sym: str) -> pd.DataFrame:
+        return pd.DataFrame(list(self._hist[sym]), columns=["date", "open", "high", "low", "close", "volume"])
+
+    def _close_session(self):
+        if self._session is not None:
+            self.account.equity_curve.append((self._session, self.account.equity(self._marks)))
+
+    async def _send(self, order: Order):
+        self.stats.orders += 1
+        for check in self.checks:
+            reason = check(self.account, order)
+            if reason:
+                self.stats.rejected[reason] += 1
+                telemetry.counter("autoswing_live_rejects_total", "Orders rejected by checks", reason=reason).inc()
+                return
+        tr = await self.broker.submit(order)
+        if tr:
+            self.stats.fills += 1
+            self.trades.append(tr)
+
+    async def on_bar(self, bar: Bar):
+        t0 = time.perf_counter_ns()
+        if bar.dt != self._session:
+            self._close_session()
+            self._session = bar.dt
+        hist = self._hist.setdefault(bar.symbol, deque(maxlen=self.window))
+        hist.append((bar.dt, bar.open, bar.high, bar.low, bar.close, bar.volume))
+        self._marks[bar.symbol] = bar.close
+
+        pos = self.account.positions.get(bar.symbol)
+        if pos is not None and self.max_hold_days is not None and (bar.dt - pos.entry_dt).days >= self.max_hold_days:
+            await self._send(Order(bar.symbol, "sell", pos.qty, bar.close, bar.dt, reason="max_hold"))
+
+        if len(hist) >= self.window:
+            for sig in self.strategy.scan({bar.symbol: self._frame(bar.symbol)}):
+                self.stats.signals += 1
+                if sig.action != "buy":
+                    continue
+                qty = percent_cash_size(self.account, bar.dt, bar.close, pct=self.strategy.alloc_pct,
+                                        max_positions=self.strategy.max_positions)
+                if qty > 0:
+                    await self._send(Order(sig.symbol, "buy", qty, bar.close, bar.dt, reason="signal"))
+
+        now = time.perf_counter_ns()
+        lat = (now - bar.recv_ns) / 1e9
+        self.stats.events += 1
+        self.stats.latency.update([lat])
+        self.stats.service.update([(now - t0) / 1e9])
+        telemetry.histogram("autoswing_live_event_latency_seconds", "Feed-to-ack latency per bar").observe(lat)
+
+    # --- loop ---------------------------------------------------------------
+    async def run(self) -> LiveStats:
+        q: "asyncio.Queue[Optional[Bar]]" = asyncio.Queue(maxsize=self.queue_size)
+
+        async def pump():
+            try:
+                async for bar in self.feed:
+                    await q.put(bar)
+            finally:
+                await q.put(None)
+
+        t0 = time.perf_counter()
+        producer = asyncio.create_task(pump())
+        stopped = asyncio.create_task(self._stop.wait())
+        try:
+            while not self._stop.is_set():
+                if q.empty():
+                    # idle feed: wait for a bar or stop(), whichever comes first
+                    get = asyncio.create_task(q.get())
+                    await asyncio.wait((get, stopped), return_when=asyncio.FIRST_COMPLETED)
+                    if not get.done():
+                        get.cancel()
+                        break
+                    bar = get.result()
+                else:
+                    bar = q.get_nowait()
+                if bar is None:
+                    break
+                await self.on_bar(bar)
+        finally:
+            for task in (producer, stopped):
+                task.cancel()
+            await asyncio.gather(producer, stopped, return_exceptions=True)
+            self._close_session()
+            self.stats.seconds = time.perf_counter() - t0
+        telemetry.counter("autoswing_live_events_total", "Bars handled by the live engine").inc(self.stats.events)
+        telemetry.counter("autoswing_live_fills_total", "Live engine fills").inc(self.stats.fills)
+        return self.stats
+
+
+def run_replay(bundle: Dict[str, pd.DataFrame], strategy, starting_cash: float = 1000.0,
+               interval: float = 0.0, broker_delay: float = 0.0, project_root=None, compliance=None):
+    """Replay *bundle* through :class:`LiveEngine` with a :class:`PaperBroker`.
+
+    Returns ``(final_equity, trades, account, stats)``; with *project_root*
+    the run is recorded in the run store as kind ``"replay"``.  A
+    :class:`~autoswing.engine.compliance.Compliance` replaces the default
+    settled-cash check and sees every fill through the account.
+    """
+    acct = PaperAccount(starting_cash, settlement_days=1, compliance=compliance,
+                        calendar=calendar_for_symbols(bundle))
+    engine = LiveEngine(strategy, ReplayFeed(bundle, interval=interval), acct,
+                        broker=PaperBroker(acct, delay=broker_delay),
+                        max_hold_days=getattr(strategy, "max_hold_days", None),
+                        checks=None if compliance is None else [compliance])
+    stats = asyncio.run(engine.run())
+    final_eq = acct.equity(engine._marks)
+    _record_run(project_root, "replay", strategy, starting_cash, final_eq, engine.trades, acct)
+    return final_eq, engine.trades, acct, stats
@@ -8,19 +8,32 @@ backward compatibility we now alias::
     PaperExecutor = PaperAccount
 
 The module also exposes `run_bar_backtest()` which the CLI and UI call to run a
-lightweight, cash‑account‑aware daily backtest across a bundle of symbols.
+lightweight, cash‑account‑aware daily backtest across a bundle of symbols.  Passing a
+:class:`~autoswing.engine.fills.FillModel` replaces bar‑close fills with
+resting limit/stop orders matched intrabar (:mod:`autoswing.engine.fills`).
+`run_chunked_backtest()` runs the same session loop over the daily cache in
+blocks of sessions, for universes too large to load at once.
 """
 from __future__ import annotations
 
 from datetime import date
-from typing import Dict, List, Optional
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
 import math
+import time
 
+import numpy as np
 import pandas as pd
 
+from autoswing.data.calendar import calendar_for_symbols, to_days
+from autoswing.engine.fills import BUY, MARKET, ORDER_TYPES, SELL, STOP, BarPanel, OrderBook
 from autoswing.engine.ledger import CashLedger
 from autoswing.engine.trade import Position, Trade
-from autoswing.io.trade_log import append_trades
+from autoswing.utils import telemetry
+
+# Bump whenever fills, sizing or marking change so memoized results
+# (autoswing.backtest.result_cache) are invalidated.
+ENGINE_VERSION = "3a.7"
 
 
 class PaperAccount:
@@ -28,13 +41,17 @@ class PaperAccount:
 
     Tracks a :class:`CashLedger` for settlement, open positions, and a running
     cash value (includes unsettled debits). Provides *buy*/*sell* helpers that
-    mutate state and emit :class:`Trade` records.
+    mutate state and emit :class:`Trade` records.  An attached
+    :class:`~autoswing.engine.compliance.Compliance` is told about every fill.
+    Settlement counts sessions of *calendar* (default: equities).
     """
-    def __init__(self, starting_cash: float, settlement_days: int = 1):
-        self.ledger = CashLedger(starting_cash, settlement_days)
+    def __init__(self, starting_cash: float, settlement_days: int = 1, compliance=None, calendar=None):
+        self.ledger = CashLedger(starting_cash, settlement_days, calendar)
+        self.compliance = compliance
         self.positions: Dict[str, Position] = {}
         self._next_trade_id = 1
         self.cash_running = float(starting_cash)  # includes unsettled debits
+        self.equity_curve: List[Tuple[date, float]] = []  # (session, marked equity)
 
     # --- util -------------------------------------------------------------
     def _trade_id(self) -> int:
@@ -48,6 +65,22 @@ class PaperAccount:
             dt = date.today()
         return self.ledger.settled_cash(dt)
 
+    def buying_power(self, dt: date) -> float:
+        """Settled cash less buys not settled yet (unsettled sale proceeds never count)."""
+        return self.ledger.buying_power(dt)
+
+    def equity(self, mark_prices: Dict[str, float], dt: Optional[date] = None) -> float:
+        """Running cash (settled + unsettled) plus positions marked at *mark_prices*.
+
+        Unsettled amounts are counted so equity does not jump around the
+        settlement date; use :meth:`settled_cash` for buying power.
+        """
+        eq = self.cash_running
+        for pos in self.positions.values():
+            px = mark_prices.get(pos.symbol, pos.avg_price)
+            eq += pos.qty * px
+        return eq
+
     # --- fills ------------------------------------------------------------
     def buy(self, dt: date, symbol: str, price: float, qty: int, fee: float = 0.0):
         notional = price * qty
@@ -60,6 +93,8 @@ class PaperAccount:
             self.positions[symbol] = Position(symbol, new_qty, new_avg, p.entry_dt)
         else:
             self.positions[symbol] = Position(symbol, qty, price, dt)
+        if self.compliance is not None:
+            self.compliance.record("buy", symbol, qty, price, dt, fee)
         tr = Trade(
             trade_id=self._trade_id(), dt=dt, symbol=symbol, side="buy",
             qty=qty, price=price, notional=notional, fee=fee,
@@ -82,6 +117,8 @@ class PaperAccount:
             del self.positions[symbol]
         else:
             self.positions[symbol] = Position(symbol, p.qty - qty, p.avg_price, p.entry_dt)
+        if self.compliance is not None:
+            self.compliance.record("sell", symbol, qty, price, dt, fee)
         tr = Trade(
             trade_id=self._trade_id(), dt=dt, symbol=symbol, side="sell",
             qty=qty, price=price, notional=notional, fee=fee,
@@ -90,14 +127,40 @@ class PaperAccount:
         )
         return tr
 
+    def apply_fills(self, dt: date, fills: Iterable[Tuple[str, str, int, float]],
+                    fee_per_share: float = 0.0) -> List[Trade]:
+        """Apply one session's ``(symbol, side, qty, price)`` fills as a batch.
+
+        Sells go first; a buy is cut to what :meth:`buying_power` can pay
+        for, so same-day sale proceeds (unsettled) never fund it (resting
+        orders were sized when they were placed, not when they fill).
+        """
+        fills = sorted(fills, key=lambda f: f[1] != "sell")
+        out = []
+        for sym, side, qty, price in fills:
+            if side == "sell":
+                tr = self.sell(dt, sym, price, qty, fee=fee_per_share * qty)
+            else:
+                cash = self.buying_power(dt)
+                qty = min(qty, int(math.floor(cash / (price + fee_per_share)))) if price > 0 and cash > 0 else 0
+                tr = self.buy(dt, sym, price, qty, fee=fee_per_share * qty) if qty > 0 else None
+            if tr:
+                out.append(tr)
+        return out
+
 
 # ---------------------------------------------------------------------------
 # Sizing helper (percent of settled cash)
 # ---------------------------------------------------------------------------
 
-def percent_cash_size(account: PaperAccount, dt: date, price: float, pct: float, max_positions: int) -> int:
-    settled = account.settled_cash(dt)
-    slots = max(1, max_positions - len(account.positions))
+def percent_cash_size(account: PaperAccount, dt: date, price: float, pct: float, max_positions: int,
+                      cash: Optional[float] = None, pending: int = 0) -> int:
+    """Shares for *pct* of *cash* (default: settled cash), capped at an equal split over free slots.
+
+    *pending* counts slots already taken by resting entry orders.
+    """
+    settled = account.settled_cash(dt) if cash is None else cash
+    slots = max(1, max_positions - len(account.positions) - pending)
     alloc_cash = settled * pct
     alloc_cash = min(alloc_cash, settled / slots)
     qty = int(math.floor(alloc_cash / price))
@@ -108,6 +171,255 @@ def percent_cash_size(account: PaperAccount, dt: date, price: float, pct: float,
 # Daily bar backtest loop
 # ---------------------------------------------------------------------------
 
+BACKTEST_PHASES = ("slicing", "exits", "scan", "sizing", "fills", "marking")
+
+
+class _PhaseClock:
+    """Per-session lap times, observed as ``autoswing_backtest_phase_seconds``."""
+
+    def __init__(self):
+        self.totals = dict.fromkeys(BACKTEST_PHASES, 0.0)
+        self._t = time.perf_counter()
+
+    def start(self):
+        self._t = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.totals[phase] += now - self._t
+        self._t = now
+
+    def flush(self):
+        for phase, secs in self.totals.items():
+            telemetry.histogram("autoswing_backtest_phase_seconds", "Backtest time per session by phase",
+                                phase=phase).observe(secs)
+            self.totals[phase] = 0.0
+
+
+class _NoClock:
+    def start(self):
+        pass
+
+    def lap(self, phase: str):
+        pass
+
+    def flush(self):
+        pass
+
+
+class _BarLoop:
+    """Session-loop state of a bar backtest: account, resting orders, exit bookkeeping.
+
+    :func:`run_bar_backtest` feeds it every session at once;
+    :func:`run_chunked_backtest` feeds it one block at a time and the state
+    carries across blocks.  Order-book columns follow *symbols* for the
+    whole run.
+    """
+
+    def __init__(self, acct: PaperAccount, strategy, symbols, mark_to_close: bool, max_hold_days: Optional[int],
+                 fee_per_share: float, fill_model, compliance, progress, total: int, correlation=None):
+        self.acct = acct
+        self.strategy = strategy
+        self.symbols = list(symbols)
+        self.mark_to_close = mark_to_close
+        self.max_hold_days = max_hold_days
+        self.fee_per_share = fee_per_share
+        self.fill_model = fill_model
+        self.compliance = compliance
+        self.trades: List[dict] = []
+        self.n_signals = 0
+        self.book = OrderBook(fill_model) if fill_model is not None else None
+        self.entry_stops: Dict[str, float] = {}  # protective stop per symbol from its last entry signal
+        self.exiting = set()                     # symbols with a resting timed-exit order
+        self.moc_exits = fill_model is not None and fill_model.exit_type == "close"
+        self.correlation = correlation
+        self.cov = correlation.tracker(self.symbols) if correlation is not None else None
+        self.corr_blocked = 0  # entries skipped by the correlation limit
+        self.start_run(progress, total)
+
+    def start_run(self, progress, total: int):
+        """Reset per-invocation bookkeeping (progress over *total* sessions, phase clock)."""
+        self.progress = progress
+        self.total = total
+        self.every = max(1, total // 100)
+        self.done = 0  # sessions run so far
+        self.clock = _PhaseClock() if telemetry.enabled() else _NoClock()
+
+    def __getstate__(self):
+        # progress callbacks and the phase clock belong to one invocation, not to a snapshot
+        return {k: v for k, v in self.__dict__.items() if k not in ("progress", "clock")}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.start_run(None, 0)
+
+    def run(self, data: Dict[str, pd.DataFrame], sessions: np.ndarray, lookback: Optional[int] = None):
+        """Run *sessions* over *data* (per-symbol frames sorted by date, index reset).
+
+        With *lookback* the strategy sees each symbol's last *lookback* bars
+        instead of its whole history in *data*.  Returns the number of bars
+        dated inside *sessions*.
+        """
+        acct, strategy, compliance, fill_model = self.acct, self.strategy, self.compliance, self.fill_model
+        book, entry_stops, exiting, trades = self.book, self.entry_stops, self.exiting, self.trades
+        fee_per_share, max_hold_days, clock = self.fee_per_share, self.max_hold_days, self.clock
+        days = {s: to_days(df["date"]) for s, df in data.items()}
+        # rows of each symbol up to and including session i: slicing is df.iloc[:ends[sym][i]]
+        ends = {s: np.searchsorted(d, sessions, side="right") for s, d in days.items()}
+        panel = BarPanel(data, sessions, self.symbols) if book is not None else None
+        cov = self.cov
+        if cov is not None:
+            cov.add_symbols(self.symbols)  # symbols appended on a snapshot resume
+            closes = (panel or BarPanel(data, sessions, self.symbols)).fields["close"]
+
+        for i, dt in enumerate(sessions.astype(object).tolist()):
+            if self.progress is not None and self.done % self.every == 0:
+                self.progress(self.done / self.total, f"session {dt}")
+            self.done += 1
+            clock.start()
+            # slice up to current date for each symbol
+            slice_bundle = {}
+            for sym, df in data.items():
+                end = ends[sym][i]
+                if end:
+                    slice_bundle[sym] = df.iloc[max(0, end - lookback) if lookback else 0:end].copy()
+            clock.lap("slicing")
+
+            # resting orders against today's bars, all symbols in one pass
+            if book is not None and len(book):
+                allow = None
+                if compliance is not None:
+                    blocked_exits = []
+                    allow = partial(self._check_fills, dt, blocked_exits)
+                f_sym, f_side, f_qty, f_px = book.match(*panel.row(i), allow=allow)
+                batch = [(panel.symbols[j], "buy" if sd == BUY else "sell", int(q), float(p))
+                         for j, sd, q, p in zip(f_sym, f_side, f_qty, f_px)]
+                if compliance is not None:
+                    batch.sort(key=lambda f: f[1] != "sell")
+                    # a blocked timed exit is re-queued (at the then-current qty) next session
+                    for j in blocked_exits:
+                        book.cancel_exit(j)
+                        exiting.discard(panel.symbols[j])
+                for tr in acct.apply_fills(dt, batch, fee_per_share):
+                    trades.append(tr.__dict__)
+                    if tr.side == "buy" and tr.symbol in entry_stops:
+                        book.add(panel.index[tr.symbol], SELL, STOP, tr.qty, stop=entry_stops[tr.symbol])
+                    elif tr.side == "sell" and tr.symbol not in acct.positions:
+                        book.cancel_sells(panel.index[tr.symbol])
+                        exiting.discard(tr.symbol)
+                        entry_stops.pop(tr.symbol, None)
+                if entry_stops:  # entries that expired unfilled take their protective stop with them
+                    _, resting = book.committed()
+                    live = set(acct.positions).union(panel.symbols[j] for j in resting)
+                    for sym in [s for s in entry_stops if s not in live]:
+                        del entry_stops[sym]
+                clock.lap("fills")
+
+            # timed exits
+            if max_hold_days is not None:
+                for sym, pos in list(acct.positions.items()):
+                    held = (dt - pos.entry_dt).days
+                    if held >= max_hold_days:
+                        if book is not None and not self.moc_exits:
+                            if sym not in exiting:
+                                book.add(panel.index[sym], SELL, MARKET, pos.qty)
+                                exiting.add(sym)
+                            continue
+                        sdf = slice_bundle.get(sym)
+                        if sdf is not None:
+                            px = float(sdf["close"].iloc[-1])
+                            if compliance is not None and compliance.check("sell", sym, pos.qty, px, dt):
+                                continue
+                            tr = acct.sell(dt, sym, px, fee=fee_per_share * pos.qty)
+                            if tr:
+                                trades.append(tr.__dict__)
+                                if book is not None:
+                                    book.cancel_sells(panel.index[sym])
+                                    entry_stops.pop(sym, None)
+            clock.lap("exits")
+
+            # generate new buy signals
+            sigs = list(strategy.scan(slice_bundle))
+            self.n_signals += len(sigs)
+            clock.lap("scan")
+            if cov is not None:
+                cov.update(closes[i])
+                held = set(acct.positions)
+                if book is not None:
+                    held.update(panel.symbols[j] for j in book.resting(BUY))
+                clock.lap("sizing")
+            if book is not None and sigs:
+                # resting entries hold their cash and a position slot until they fill or expire
+                committed, resting = book.committed()
+                opening = {panel.symbols[j] for j in resting}.difference(acct.positions)
+            for sig in sigs:
+                if sig.action != "buy":
+                    continue
+                sdf = slice_bundle.get(sig.symbol)
+                if sdf is None or sdf.empty:
+                    continue
+                if cov is not None and cov.max_corr(sig.symbol, held) > self.correlation.max_corr:
+                    self.corr_blocked += 1
+                    continue
+                px = float(sdf["close"].iloc[-1])
+                if book is None:
+                    qty = percent_cash_size(acct, dt, px, pct=strategy.alloc_pct, max_positions=strategy.max_positions)
+                else:
+                    qty = percent_cash_size(acct, dt, px, pct=strategy.alloc_pct, max_positions=strategy.max_positions,
+                                            cash=acct.buying_power(dt) - committed, pending=len(opening))
+                clock.lap("sizing")
+                if qty <= 0:
+                    continue
+                if cov is not None:
+                    held.add(sig.symbol)
+                if book is not None:
+                    limit, stop = fill_model.entry_prices(px)
+                    book.add(panel.index[sig.symbol], BUY, ORDER_TYPES[fill_model.entry_type], qty,
+                             limit, stop, ttl=fill_model.ttl_bars, ref=px)
+                    committed += qty * np.nanmax([px, limit, stop])
+                    if sig.symbol not in acct.positions:
+                        opening.add(sig.symbol)
+                    if fill_model.protective_stops and sig.stop:
+                        entry_stops[sig.symbol] = float(sig.stop)
+                    continue
+                if compliance is not None and compliance.check("buy", sig.symbol, qty, px, dt):
+                    continue
+                tr = acct.buy(dt, sig.symbol, px, qty, fee=fee_per_share * qty)
+                trades.append(tr.__dict__)
+                clock.lap("fills")
+
+            if self.mark_to_close:
+                marks = {s: float(sdf["close"].iloc[-1]) for s, sdf in slice_bundle.items()}
+                acct.equity_curve.append((dt, acct.equity(marks)))
+            clock.lap("marking")
+            clock.flush()
+        if not len(sessions):
+            return 0
+        return sum(int(ends[s][-1] - np.searchsorted(d, sessions[0])) for s, d in days.items())
+
+    def _check_fills(self, dt, blocked_exits: List[int], f_sym, f_side, f_qty, f_px) -> np.ndarray:
+        """Compliance keep-mask for one session's candidate fills (sells first, as they apply)."""
+        order = np.argsort(f_side != SELL, kind="stable")
+        ok = np.empty(len(order), dtype=bool)
+        ok[order] = self.compliance.check_batch(dt, [self.symbols[j] for j in f_sym[order]],
+                                                np.where(f_side[order] == BUY, "buy", "sell"),
+                                                f_qty[order], f_px[order])
+        blocked_exits.extend(int(j) for j in f_sym[~ok & (f_side == SELL)] if self.symbols[j] in self.exiting)
+        return ok
+
+    def observe(self, secs: float, n_bars: int):
+        telemetry.histogram("autoswing_backtest_seconds", "Backtest wall time").observe(secs)
+        telemetry.counter("autoswing_backtest_bars_total", "Bars processed").inc(n_bars)
+        telemetry.gauge("autoswing_backtest_bars_per_second", "Last backtest throughput").set(n_bars / secs if secs else 0.0)
+        telemetry.counter("autoswing_backtest_signals_total", "Strategy signals").inc(self.n_signals)
+        if self.cov is not None:
+            telemetry.counter("autoswing_backtest_corr_blocked_total",
+                              "Entries skipped by the correlation limit").inc(self.corr_blocked)
+        for side in ("buy", "sell"):
+            telemetry.counter("autoswing_backtest_fills_total", "Fills", side=side).inc(
+                sum(1 for t in self.trades if t["side"] == side))
+
+
 def run_bar_backtest(
     bundle: Dict[str, pd.DataFrame],
     strategy,
@@ -116,6 +428,13 @@ def run_bar_backtest(
     max_hold_days: Optional[int] = None,
     fee_per_share: float = 0.0,
     project_root=None,
+    run_kind: str = "backtest",
+    cache=None,
+    settings=None,
+    progress=None,
+    fill_model=None,
+    compliance=None,
+    correlation=None,
 ):
     """Simple daily bar backtest across *bundle*.
 
@@ -123,59 +442,140 @@ def run_bar_backtest(
     - ``alloc_pct`` (0‑1) percent of settled cash per entry
     - ``max_positions`` (int)
     - ``scan(slice_bundle)`` -> iterable of signal objects with ``.symbol`` and ``.action``
+
+    With ``mark_to_close`` the account's ``equity_curve`` receives one
+    ``(date, equity)`` point per session for :mod:`autoswing.analysis.metrics`.
+    If *project_root* is given the run (trades + equity curve) is written to
+    the project's :class:`~autoswing.db.RunStore` tagged with *run_kind*.
+
+    *cache* (a :class:`~autoswing.backtest.result_cache.ResultCache`) memoizes
+    the ``(final_eq, trades, acct)`` result keyed on the data, strategy,
+    *settings* and run arguments.
+
+    With telemetry enabled each session's time is split into
+    :data:`BACKTEST_PHASES` and observed per phase, so a profile shows which
+    part of the loop dominates on a given universe.
+
+    *progress*, if given, is called as ``progress(fraction, message)`` about
+    a hundred times per run; it may raise to abort the run (nothing is
+    cached or recorded then).
+
+    Without *fill_model* entries and timed exits fill at the session close.
+    With a :class:`~autoswing.engine.fills.FillModel`, entries become
+    resting orders matched against the following sessions' bars for all
+    symbols at once, timed exits become market-on-open (or on-close) sells,
+    and each session's fills reach the account as one batch.
+
+    *compliance* (a fresh :class:`~autoswing.engine.compliance.Compliance`
+    per run) checks every order before it fills; blocked orders are skipped,
+    and in log-only mode violations are just recorded on ``acct.compliance``.
+
+    With a :class:`~autoswing.engine.correlation.CorrelationLimit` a buy
+    signal too correlated with a holding is skipped.
     """
-    idx = sorted(set().union(*[pd.to_datetime(df["date"]).dt.date.tolist() for df in bundle.values()]))
-    acct = PaperAccount(starting_cash, settlement_days=1)
-    trades = []
+    key = None
+    if cache is not None:
+        key = cache.key(bundle, strategy, settings, starting_cash=starting_cash,
+                        mark_to_close=mark_to_close, max_hold_days=max_hold_days,
+                        fee_per_share=fee_per_share,
+                        fill_model=fill_model.key() if fill_model is not None else None,
+                        compliance=compliance.config() if compliance is not None else None,
+                        correlation=correlation.key() if correlation is not None else None)
+        hit = cache.get(key)
+        telemetry.counter("autoswing_backtest_cache_total", "Result cache lookups",
+                          result="miss" if hit is None else "hit").inc()
+        if hit is not None:
+            _record_run(project_root, run_kind, strategy, starting_cash, *hit)
+            return hit
 
+    t0 = time.perf_counter()
     data_sorted = {s: df.sort_values("date").reset_index(drop=True) for s, df in bundle.items()}
-
-    for i, dt in enumerate(idx):
-        # slice up to current date for each symbol
-        slice_bundle = {}
-        for sym, df in data_sorted.items():
-            mask = pd.to_datetime(df["date"]).dt.date <= dt
-            sdf = df.loc[mask].copy()
-            if not sdf.empty:
-                slice_bundle[sym] = sdf
-
-        # timed exits
-        if max_hold_days is not None:
-            for sym, pos in list(acct.positions.items()):
-                held = (dt - pos.entry_dt).days
-                if held >= max_hold_days:
-                    sdf = slice_bundle.get(sym)
-                    if sdf is not None:
-                        px = float(sdf["close"].iloc[-1])
-                        tr = acct.sell(dt, sym, px, fee=fee_per_share * pos.qty)
-                        if tr:
-                            trades.append(tr.__dict__)
-
-        # generate new buy signals
-        sigs = strategy.scan(slice_bundle)
-        for sig in sigs:
-            if sig.action != "buy":
-                continue
-            sdf = slice_bundle.get(sig.symbol)
-            if sdf is None or sdf.empty:
-                continue
-            px = float(sdf["close"].iloc[-1])
-            qty = percent_cash_size(acct, dt, px, pct=strategy.alloc_pct, max_positions=strategy.max_positions)
-            if qty <= 0:
-                continue
-            tr = acct.buy(dt, sig.symbol, px, qty, fee=fee_per_share * qty)
-            trades.append(tr.__dict__)
+    days = [to_days(df["date"]) for df in data_sorted.values()]
+    sessions = np.unique(np.concatenate(days)) if days else np.empty(0, "datetime64[D]")
+    acct = PaperAccount(starting_cash, settlement_days=1, compliance=compliance,
+                        calendar=calendar_for_symbols(bundle))
+    loop = _BarLoop(acct, strategy, data_sorted, mark_to_close, max_hold_days, fee_per_share, fill_model,
+                    compliance, progress, len(sessions), correlation)
+    n_bars = loop.run(data_sorted, sessions)
+    trades = loop.trades
 
     # mark final equity
     mark_prices = {s: float(df["close"].iloc[-1]) for s, df in data_sorted.items()}
-    final_eq = acct.equity(mark_prices, idx[-1]) if idx else starting_cash
+    final_eq = acct.equity(mark_prices) if len(sessions) else starting_cash
+    loop.observe(time.perf_counter() - t0, n_bars)
 
-    if project_root is not None and trades:
-        append_trades(trades, project_root)
+    if cache is not None:
+        cache.put(key, (final_eq, trades, acct))
+    _record_run(project_root, run_kind, strategy, starting_cash, final_eq, trades, acct)
 
     return final_eq, trades, acct
 
 
+def run_chunked_backtest(
+    symbols,
+    strategy,
+    starting_cash: float,
+    data_root,
+    chunk_sessions: int = 250,
+    lookback: Optional[int] = None,
+    start=None,
+    end=None,
+    mark_to_close: bool = True,
+    max_hold_days: Optional[int] = None,
+    fee_per_share: float = 0.0,
+    project_root=None,
+    run_kind: str = "backtest",
+    progress=None,
+    fill_model=None,
+    compliance=None,
+    correlation=None,
+    features=(),
+):
+    """Out-of-core :func:`run_bar_backtest` over *symbols* in the daily cache under *data_root*.
+
+    Bars are read in blocks of *chunk_sessions* sessions
+    (:class:`~autoswing.data.loader.SessionChunks`) instead of as one
+    bundle; account, resting orders and timed exits carry across blocks, and
+    the strategy sees each symbol's last *lookback* bars (default
+    ``strategy.warmup_bars``) so its signals do not depend on where a block
+    starts.  Peak memory is about ``symbols x (chunk_sessions + lookback)``
+    bars.  Sessions run from *start* (bars before it are warm-up only) to
+    *end*.  Results match :func:`run_bar_backtest` on the same bars for a
+    strategy that looks back no further than *lookback*.  There is no result
+    cache here: keying it would mean fingerprinting the whole history.
+    *features* (usually ``strategy.features``) are attached to the bars
+    from the feature store, so the strategy reads them instead of
+    recomputing.
+    """
+    from autoswing.data.loader import SessionChunks
+    t0 = time.perf_counter()
+    if lookback is None:
+        lookback = max(1, int(getattr(strategy, "warmup_bars", 50)))
+    chunks = SessionChunks(symbols, data_root, chunk_sessions, lookback, start, end, features=features)
+    acct = PaperAccount(starting_cash, settlement_days=1, compliance=compliance,
+                        calendar=calendar_for_symbols(chunks.symbols))
+    loop = _BarLoop(acct, strategy, chunks.symbols, mark_to_close, max_hold_days, fee_per_share, fill_model,
+                    compliance, progress, len(chunks.sessions), correlation)
+    n_bars = 0
+    for sessions, frames in chunks:
+        n_bars += loop.run(frames, sessions, lookback)
+    final_eq = acct.equity(chunks.last_close) if len(chunks.sessions) else starting_cash
+    loop.observe(time.perf_counter() - t0, n_bars)
+    _record_run(project_root, run_kind, strategy, starting_cash, final_eq, loop.trades, acct)
+    return final_eq, loop.trades, acct
+
+
+def _record_run(project_root, run_kind, strategy, starting_cash, final_eq, trades, acct):
+    if project_root is None:
+        return
+    from autoswing.db import RunStore
+    params = {k: v for k, v in vars(strategy).items() if not k.startswith("_")}
+    with RunStore.for_project(project_root) as store:
+        store.record_run(trades, acct.equity_curve, kind=run_kind,
+                         strategy=type(strategy).__name__, params=params,
+                         starting_cash=starting_cash, final_equity=final_eq)
+
+
 # ------------------------------------------------------------------
 # Backward‑compat shim: legacy name used in earlier phases
 # ------------------------------------------------------------------
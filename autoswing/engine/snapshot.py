@@ -0,0 +1,258 @@
+"""Persistent backtest state, so a daily run only processes the new bars.
+
+A :class:`Snapshot` holds what the bar loop carries from one session to the
+next:
+
+* the account: cash ledger, positions and equity curve;
+* compliance state, resting orders, trades and the strategy;
+* the return covariance behind a correlation limit, if any;
+* each symbol's last ``lookback`` bars (the strategy's indicator window);
+* the last session processed.
+
+It is written as one gzip-compressed pickle stamped with
+:data:`SNAPSHOT_VERSION` and the engine version.  A snapshot written by
+another version, or by a run with different parameters, is not resumed;
+the run then replays from its start as before.
+
+:func:`run_incremental_backtest` restores the snapshot, runs the sessions
+after its last one through the same loop as
+:func:`~autoswing.engine.paper_executor.run_chunked_backtest`, and saves a
+new snapshot.  With ``verify=True`` it also replays from the snapshot's
+origin and reports any divergence (see :func:`compare_runs`).  Bars that
+arrive late for sessions already processed are the usual cause.
+"""
+from __future__ import annotations
+import copy
+import gzip
+import os
+import pickle
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from autoswing.backtest.result_cache import strategy_fingerprint
+from autoswing.data.calendar import calendar_for_symbols
+from autoswing.data.loader import SessionChunks
+from autoswing.engine.paper_executor import (ENGINE_VERSION, PaperAccount, _BarLoop, _record_run,
+                                             run_chunked_backtest)
+from autoswing.utils import telemetry
+
+# Bump when the snapshot layout or the meaning of its fields changes.
+SNAPSHOT_VERSION = 2
+
+
+@dataclass
+class Snapshot:
+    key: dict                        # run parameters the state is valid for (see run_key)
+    origin: date                     # first session of the run
+    last_session: date               # last session processed
+    loop: _BarLoop                   # account, compliance, resting orders, trades, strategy, covariance
+    tails: Dict[str, pd.DataFrame]   # each symbol's last `lookback` bars
+    last_close: Dict[str, float]
+    version: int = SNAPSHOT_VERSION
+    engine_version: str = ENGINE_VERSION
+    created: float = field(default_factory=time.time)
+
+
+def save_snapshot(path: Path, snap: Snapshot) -> Path:
+    """Atomically write *snap* to *path*."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        with gzip.open(tmp, "wb", compresslevel=6) as f:
+            pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def load_snapshot(path: Path) -> Optional[Snapshot]:
+    """The snapshot at *path*; None if missing, unreadable, or written by another snapshot/engine version."""
+    try:
+        with gzip.open(path, "rb") as f:
+            snap = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(snap, Snapshot) or snap.version != SNAPSHOT_VERSION or snap.engine_version != ENGINE_VERSION:
+        return None
+    return snap
+
+
+def run_key(symbols, strategy, starting_cash: float, lookback: int, max_hold_days: Optional[int],
+            fee_per_share: float, fill_model, compliance, correlation=None, start=None,
+            window: Optional[int] = None, features=()) -> dict:
+    """Everything a snapshot's state depends on besides the bars themselves.
+
+    A run is anchored either at a fixed *start* or *window* sessions before
+    its end (which moves with every daily run, so only the length counts).
+    """
+    return {
+        "symbols": sorted(symbols),
+        "strategy": strategy_fingerprint(strategy),
+        "start": {"window": int(window)} if window is not None else
+                 {"start": None if start is None else pd.Timestamp(start).date().isoformat()},
+        "starting_cash": float(starting_cash),
+        "lookback": int(lookback),
+        "max_hold_days": max_hold_days,
+        "fee_per_share": float(fee_per_share),
+        "fill_model": fill_model.key() if fill_model is not None else None,
+        "compliance": compliance.config() if compliance is not None else None,
+        "correlation": correlation.key() if correlation is not None else None,
+        "features": sorted(features),
+    }
+
+
+@dataclass
+class IncrementalRun:
+    final_eq: float
+    trades: List[dict]
+    account: PaperAccount
+    resumed: bool
+    reason: str                      # why the run started over ("" when it resumed)
+    sessions: int                    # sessions processed by this run
+    origin: Optional[date]
+    last_session: Optional[date]
+    seconds: float = 0.0
+    verify: Optional[dict] = None    # compare_runs() against a full replay
+
+    def summary(self) -> dict:
+        out = {"resumed": self.resumed, "reason": self.reason, "sessions": self.sessions,
+               "origin": self.origin, "last_session": self.last_session, "seconds": round(self.seconds, 3)}
+        if self.verify is not None:
+            out["verify"] = self.verify
+        return out
+
+
+def _trade_key(t: dict) -> tuple:
+    return t["dt"], t["symbol"], t["side"], t["qty"], round(t["price"], 8)
+
+
+def compare_runs(run: IncrementalRun, replay_eq: float, replay_trades: List[dict], replay_acct: PaperAccount,
+                 rel_tol: float = 1e-9) -> dict:
+    """Incremental result vs a full replay: equity, trades and the first session where equity differs."""
+    curve = dict(run.account.equity_curve)
+    first = None
+    for dt, eq in replay_acct.equity_curve:
+        mine = curve.get(dt)
+        if mine is None or abs(mine - eq) > rel_tol * max(1.0, abs(eq)):
+            first = dt
+            break
+    trades_ok = [_trade_key(t) for t in run.trades] == [_trade_key(t) for t in replay_trades]
+    eq_ok = abs(run.final_eq - replay_eq) <= rel_tol * max(1.0, abs(replay_eq))
+    ok = eq_ok and trades_ok and first is None and len(curve) == len(replay_acct.equity_curve)
+    return {"ok": ok, "equity": run.final_eq, "replay_equity": replay_eq, "trades": len(run.trades),
+            "replay_trades": len(replay_trades), "first_divergence": first}
+
+
+def run_incremental_backtest(
+    symbols,
+    strategy,
+    starting_cash: float,
+    data_root,
+    state_path: Path,
+    start=None,
+    end=None,
+    window: Optional[int] = None,
+    lookback: Optional[int] = None,
+    chunk_sessions: int = 250,
+    max_hold_days: Optional[int] = None,
+    fee_per_share: float = 0.0,
+    fill_model=None,
+    compliance=None,
+    correlation=None,
+    features=(),
+    project_root=None,
+    run_kind: str = "backtest",
+    progress=None,
+    verify: bool = False,
+) -> IncrementalRun:
+    """Resume the backtest snapshotted at *state_path* and run the sessions after it, up to *end*.
+
+    Without a usable snapshot (missing, other version, other parameters, or
+    *end* before its last session) the run starts fresh at *start*, exactly
+    like :func:`~autoswing.engine.paper_executor.run_chunked_backtest`.
+    With *window* instead, a fresh run starts *window* sessions before *end*
+    and the snapshot is resumed by any later run with the same window (a
+    daily run whose end moves forward); a different *start* or *window*
+    starts over.  *features* are attached from the feature store as in
+    :func:`~autoswing.engine.paper_executor.run_chunked_backtest`.
+    *strategy* and *compliance* are only used for a fresh start; a resumed
+    run continues with the snapshotted ones.  Either way the new state is
+    saved back to *state_path*.
+    """
+    t0 = time.perf_counter()
+    if lookback is None:
+        lookback = max(1, int(getattr(strategy, "warmup_bars", 50)))
+    if window is not None:
+        if end is None:
+            raise ValueError("window needs an end")
+        start = calendar_for_symbols(symbols).next_session(pd.Timestamp(end).date() + timedelta(days=1), -int(window))
+    key = run_key(symbols, strategy, starting_cash, lookback, max_hold_days, fee_per_share, fill_model, compliance,
+                  correlation, start, window, features)
+    pristine = copy.deepcopy((strategy, compliance)) if verify else None
+    snap = load_snapshot(state_path)
+    reason = ""
+    if snap is None:
+        reason = "no usable snapshot"
+    elif snap.key != key:
+        reason = "run parameters changed"
+    elif end is not None and np.datetime64(end, "D") < np.datetime64(snap.last_session, "D"):
+        reason = "end precedes the snapshot"
+
+    if reason:
+        chunks = SessionChunks(symbols, data_root, chunk_sessions, lookback, start, end, features=features)
+        acct = PaperAccount(starting_cash, settlement_days=1, compliance=compliance,
+                            calendar=calendar_for_symbols(chunks.symbols))
+        loop = _BarLoop(acct, strategy, chunks.symbols, True, max_hold_days, fee_per_share, fill_model,
+                        compliance, progress, len(chunks.sessions), correlation)
+        origin = chunks.sessions[0].astype(object) if len(chunks.sessions) else None
+        last = None
+    else:
+        chunks = SessionChunks(symbols, data_root, chunk_sessions, lookback,
+                               start=snap.last_session + timedelta(days=1), end=end,
+                               tails=snap.tails, last_close=snap.last_close, features=features)
+        loop = snap.loop
+        loop.symbols += [s for s in chunks.symbols if s not in loop.symbols]  # first bars of a new listing
+        loop.start_run(progress, len(chunks.sessions))
+        acct, origin, last = loop.acct, snap.origin, snap.last_session
+
+    n_bars = 0
+    for sessions, frames in chunks:
+        n_bars += loop.run(frames, sessions, lookback)
+    if len(chunks.sessions):
+        last = chunks.sessions[-1].astype(object)
+    final_eq = acct.equity(chunks.last_close) if last is not None else float(starting_cash)
+    loop.observe(time.perf_counter() - t0, n_bars)
+    if len(chunks.sessions):
+        save_snapshot(state_path, Snapshot(key, origin, last, loop, chunks.tails, chunks.last_close))
+    telemetry.counter("autoswing_snapshot_runs_total", "Incremental backtest runs",
+                      mode="replayed" if reason else "resumed").inc()
+    telemetry.counter("autoswing_snapshot_sessions_total", "Sessions processed by incremental runs").inc(
+        len(chunks.sessions))
+    _record_run(project_root, run_kind, loop.strategy, starting_cash, final_eq, loop.trades, acct)
+
+    run = IncrementalRun(final_eq, loop.trades, acct, resumed=not reason, reason=reason,
+                         sessions=len(chunks.sessions), origin=origin, last_session=last,
+                         seconds=time.perf_counter() - t0)
+    if verify and origin is not None:
+        strat0, comp0 = pristine
+        replay = run_chunked_backtest(symbols, strat0, starting_cash, data_root, chunk_sessions, lookback,
+                                      start=origin, end=last, max_hold_days=max_hold_days,
+                                      fee_per_share=fee_per_share, fill_model=fill_model, compliance=comp0,
+                                      correlation=correlation, features=features)
+        run.verify = compare_runs(run, *replay)
+        telemetry.counter("autoswing_snapshot_verify_total", "Snapshot verifications against a full replay",
+                          result="ok" if run.verify["ok"] else "diverged").inc()
+    return run
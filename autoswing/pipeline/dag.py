@@ -0,0 +1,186 @@
+"""Tiny stage DAG with fingerprint-based skipping.
+
+Each :class:`Stage` names the artifacts it consumes and produces.  Before a
+stage runs, its input artifacts are fingerprinted; if the combined digest
+matches the one recorded after its last successful run, the stage is skipped
+and its persisted outputs are reloaded instead.  Stages whose inputs are all
+available run concurrently on a thread pool, except ``inline`` stages, which
+run on the thread that called :meth:`Pipeline.run` (stages that fan out to
+their own process pool).  Completed stages are persisted immediately, so a
+failure late in the graph keeps the earlier work.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from autoswing.backtest.result_cache import frame_fingerprint
+from autoswing.utils import telemetry
+
+
+def fingerprint(value: Any) -> str:
+    """Content digest of an artifact (frames, containers, plain values)."""
+    h = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        h.update(b"df" + frame_fingerprint(value).encode())
+    elif isinstance(value, dict):
+        h.update(b"dict")
+        for k in sorted(value, key=str):
+            h.update(str(k).encode() + fingerprint(value[k]).encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(b"seq")
+        for v in value:
+            h.update(fingerprint(v).encode())
+    else:
+        try:
+            h.update(json.dumps(value, sort_keys=True, default=str).encode())
+        except TypeError:
+            h.update(pickle.dumps(value))
+    return h.hexdigest()
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[..., Dict[str, Any]]  # fn(**inputs) -> {output_name: value}
+    inputs: Sequence[str] = ()
+    outputs: Sequence[str] = ()
+    version: str = "1"                 # bump to invalidate persisted outputs
+    cacheable: bool = True
+    inline: bool = False               # run on the caller's thread, not the stage pool
+
+
+@dataclass
+class PipelineRun:
+    artifacts: Dict[str, Any] = field(default_factory=dict)
+    ran: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class Pipeline:
+    """Runs :class:`Stage` objects in dependency order; state under *state_dir*."""
+
+    def __init__(self, stages: Iterable[Stage], state_dir: Path | str, max_workers: int = 4):
+        self.stages = {s.name: s for s in stages}
+        self.state_dir = Path(state_dir)
+        self.max_workers = max_workers
+        self._producer: Dict[str, str] = {}
+        for s in self.stages.values():
+            for out in s.outputs:
+                if out in self._producer:
+                    raise ValueError(f"artifact {out!r} produced by both {self._producer[out]} and {s.name}")
+                self._producer[out] = s.name
+
+    # --- persisted state ------------------------------------------------
+    def _state_file(self) -> Path:
+        return self.state_dir / "state.json"
+
+    def _load_state(self) -> Dict[str, str]:
+        fp = self._state_file()
+        return json.loads(fp.read_text()) if fp.exists() else {}
+
+    def _atomic_write(self, fp: Path, data: bytes):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.state_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, fp)
+
+    def _artifact_file(self, stage: str) -> Path:
+        return self.state_dir / f"{stage}.pkl"
+
+    # --- execution ------------------------------------------------------
+    def _deps(self, stage: Stage) -> set:
+        return {self._producer[i] for i in stage.inputs if i in self._producer}
+
+    def run(self, inputs: Dict[str, Any], force: bool = False,
+            progress: Optional[Callable[[float, str], None]] = None) -> PipelineRun:
+        """Execute the graph given external *inputs*; *force* disables skipping.
+
+        If a stage raises, stages already in flight are allowed to finish (and
+        are recorded) before the first error is re-raised.  *progress* is
+        called as ``progress(fraction, message)`` after each stage; raising
+        from it stops the run the same way.
+        """
+        run = PipelineRun(artifacts=dict(inputs))
+        state = self._load_state()
+        pending = dict(self.stages)
+        for s in pending.values():
+            missing = [i for i in s.inputs if i not in inputs and i not in self._producer]
+            if missing:
+                raise KeyError(f"stage {s.name!r} needs undefined artifacts {missing}")
+        done: set = set()
+        error: Optional[BaseException] = None
+
+        def _execute(stage: Stage):
+            t0 = time.perf_counter()
+            args = {i: run.artifacts[i] for i in stage.inputs}
+            key = fingerprint({"stage": stage.name, "version": stage.version,
+                               "inputs": {i: fingerprint(v) for i, v in args.items()}})
+            art = self._artifact_file(stage.name)
+            if stage.cacheable and not force and state.get(stage.name) == key and art.exists():
+                with art.open("rb") as f:
+                    outs = pickle.load(f)
+                return stage, outs, False, time.perf_counter() - t0, key
+            outs = stage.fn(**args) or {}
+            absent = set(stage.outputs) - set(outs)
+            if absent:
+                raise RuntimeError(f"stage {stage.name!r} did not produce {sorted(absent)}")
+            if stage.cacheable:
+                self._atomic_write(art, pickle.dumps(outs, protocol=pickle.HIGHEST_PROTOCOL))
+            return stage, outs, True, time.perf_counter() - t0, key
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while (pending and error is None) or running:
+                if error is None:
+                    ready = [s for s in pending.values() if self._deps(s) <= done]
+                    for s in sorted(ready, key=lambda s: s.inline):  # pool stages first, they overlap
+                        del pending[s.name]
+                        if not s.inline:
+                            running[pool.submit(_execute, s)] = s.name
+                            continue
+                        fut = Future()
+                        try:
+                            fut.set_result(_execute(s))
+                        except Exception as exc:
+                            fut.set_exception(exc)
+                        running[fut] = s.name
+                if not running:
+                    raise RuntimeError(f"dependency cycle among {sorted(pending)}")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    del running[fut]
+                    try:
+                        stage, outs, ran, secs, key = fut.result()
+                    except Exception as exc:
+                        error = error or exc
+                        continue
+                    run.artifacts.update(outs)
+                    (run.ran if ran else run.skipped).append(stage.name)
+                    run.timings[stage.name] = secs
+                    telemetry.histogram("autoswing_pipeline_stage_seconds", "Stage wall time",
+                                        stage=stage.name, state="ran" if ran else "skipped").observe(secs)
+                    done.add(stage.name)
+                    if stage.cacheable:
+                        state[stage.name] = key
+                        self._atomic_write(self._state_file(), json.dumps(state, indent=2).encode())
+                    if progress is not None:
+                        try:
+                            progress(len(done) / len(self.stages),
+                                     f"{stage.name} {'ran' if ran else 'skipped'}")
+                        except Exception as exc:
+                            error = error or exc
+        if error is not None:
+            raise error
+        return run
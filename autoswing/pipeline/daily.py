@@ -1,29 +1,218 @@
+"""Daily pipeline as a DAG of named stages.
+
+    fetch -> screen -> scan -> signals -----> reporting
+          \\-> execution ------------------/
+
+``screen`` drops symbols failing cheap price/liquidity/history gates using the
+per-symbol stats index (:mod:`autoswing.pipeline.screen`), so only survivors
+are loaded.  ``fetch`` and ``scan`` fan out per symbol (``fetch`` on threads,
+``scan`` in memory-budgeted chunks on a process pool, see
+:mod:`autoswing.pipeline.symbols`);
+only compact per-symbol summaries come back for the single-threaded
+``signals`` selection.  ``scan`` and ``execution`` run concurrently; ``scan``
+runs inline on the caller's thread so its process pool is never started
+from a DAG worker thread.  ``execution`` streams the cache in blocks of
+sessions (:func:`~autoswing.engine.paper_executor.run_chunked_backtest`), so
+no stage holds the whole universe in memory.  Every
+stage is skipped when its inputs' fingerprints match the last successful run
+(see :mod:`autoswing.pipeline.dag`); ``fetch`` is keyed on the as-of date, so
+a re-run on the same day with no new data reuses everything.
+
+With ``pipeline.incremental`` (the default) ``execution`` does not replay
+the whole lookback every night.  It restores the account snapshot from
+the previous run (:mod:`autoswing.engine.snapshot`) and processes only the
+sessions since then.  The first run, or a run after the universe, strategy
+settings or ``days`` changed, starts fresh ``days`` sessions before the
+as-of date.  ``verify_snapshot`` also replays from the snapshot's origin and
+reports any divergence; it is an input of ``execution`` only, so toggling
+it never re-fetches.
+"""
 from __future__ import annotations
+import hashlib
+import json
+import subprocess
+from datetime import date, timedelta
+from functools import partial
 from pathlib import Path
 from typing import Sequence
+
+import pandas as pd
+
 from autoswing.utils.env import load_env
 from autoswing.config.loader import load_settings
+from autoswing.analysis.metrics import backtest_metrics
+from autoswing.data.cache import _cache_path, cache_files
+from autoswing.data.calendar import calendar_for_symbols
 from autoswing.data.fetch import fetch_history
-from autoswing.data.loader import load_bundle_cached
+from autoswing.data.stats_index import StatsIndex
 from autoswing.strategies.sma_pullback import SMAPullbackStrategy
-from autoswing.backtest.backtester import run_backtest
+from autoswing.engine.compliance import Compliance
+from autoswing.engine.correlation import CorrelationLimit
+from autoswing.engine.fills import FillModel
+from autoswing.engine.paper_executor import run_chunked_backtest
+from autoswing.engine.snapshot import run_incremental_backtest
+from autoswing.pipeline.dag import Pipeline, PipelineRun, Stage
+from autoswing.pipeline.screen import Prefilter, screen
+from autoswing.pipeline.symbols import scan_chunk
+from autoswing.utils.parallel import map_chunks, plan_workers
 
 ROOT = Path(__file__).parents[2]
+PIPELINE_SUBDIR = "runtime/pipeline/daily"
+SNAPSHOT_FILE = "account.snapshot"
 
-def run_pipeline(
+
+# ------------------------------------------------------------------ stages
+def _stage_fetch(config: dict, as_of: str) -> dict:
+    syms = config["symbols"]
+    fetch_history(syms, history=f"{config['days']}d", sources=config["sources"], project_root=ROOT,
+                  max_workers=config["settings"]["pipeline"]["fetch_workers"],
+                  incremental=True, as_of=date.fromisoformat(as_of))
+    # content digest of each symbol's cache files (base + streamed segments):
+    # a re-fetch that adds no bars leaves it unchanged, so everything
+    # downstream is skipped
+    raw = {}
+    for s in syms:
+        files = cache_files(s, ROOT)
+        if files:
+            h = hashlib.sha256()
+            for fp in files:
+                h.update(fp.read_bytes())
+            raw[s] = h.hexdigest()
+    return {"raw": raw}
+
+
+def _stage_screen(config: dict, raw: dict) -> dict:
+    index = StatsIndex.for_project(ROOT)
+    index.refresh(sorted(raw))
+    index.save()
+    pf = Prefilter.from_settings(config["settings"].get("screen"), _strategy(config), config["days"])
+    cands, rejected = screen(index.frame(), sorted(raw), pf)
+    return {"candidates": cands,
+            "screened": {"universe": len(raw), "candidates": len(cands), "rejected": rejected}}
+
+
+def _stage_scan(config: dict, raw: dict, candidates: list) -> dict:
+    # `raw` is an input only so a data change re-runs the scan for unchanged candidates
+    pcfg = config["settings"]["pipeline"]
+    syms = list(candidates)
+    workers = plan_workers((_cache_path(s, ROOT) for s in syms), pcfg["workers"], pcfg["memory_budget_mb"])
+    unit = partial(scan_chunk, days=config["days"], strategy_params=config.get("strategy", {}), project_root=ROOT,
+                   feature_store=pcfg.get("feature_store", False))
+    summaries = {s.symbol: s for s in map_chunks(unit, syms, workers=workers, kind=pcfg["executor"])}
+    return {"summaries": summaries}
+
+
+def _strategy(config: dict) -> SMAPullbackStrategy:
+    return SMAPullbackStrategy(**config.get("strategy", {}))
+
+
+def _features(config: dict, strat) -> tuple:
+    """The strategy's stored indicator columns, with ``pipeline.feature_store`` on."""
+    return tuple(strat.features) if config["settings"]["pipeline"].get("feature_store", False) else ()
+
+
+def _stage_signals(config: dict, summaries: dict) -> dict:
+    """Portfolio-level selection over per-symbol summaries (single-threaded)."""
+    cands = [s for s in summaries.values() if s.signal and s.signal["action"] == "buy"]
+    # deepest pullback (close furthest below its fast SMA) first
+    strat = _strategy(config)
+
+    def depth(s):
+        fast = s.features.get(f"sma_{strat.fast}")
+        return (s.last_close / fast - 1.0) if fast else 0.0
+    cands.sort(key=depth)
+    limit = config["settings"].get("max_positions", strat.max_positions)
+    return {"signals": [{"symbol": s.symbol, "as_of": s.last_date, **s.signal} for s in cands[:limit]]}
+
+
+def _stage_execution(config: dict, raw: dict, as_of: str, verify_snapshot: bool) -> dict:
+    if config["settings"]["pipeline"].get("incremental", True):
+        return _execution_incremental(config, raw, date.fromisoformat(as_of), verify_snapshot)
+    syms = sorted(raw)
+    strat = _strategy(config)
+    cal = calendar_for_symbols(syms)
+    end = date.fromisoformat(as_of)
+    final_eq, trades, acct = run_chunked_backtest(
+        syms, strat, config["starting_cash"], ROOT, start=cal.next_session(end + timedelta(days=1), -config["days"]),
+        end=end, max_hold_days=strat.max_hold_days, fill_model=FillModel.from_settings(config["settings"]),
+        compliance=Compliance.from_settings(config["settings"], config["starting_cash"], log_only=True, calendar=cal),
+        correlation=CorrelationLimit.from_settings(config["settings"]), features=_features(config, strat),
+        project_root=ROOT, run_kind="pipeline")
+    return _execution_outputs(final_eq, trades, acct, None)
+
+
+def _execution_outputs(final_eq: float, trades: list, acct, snapshot: dict | None) -> dict:
+    dts, vals = zip(*acct.equity_curve) if acct.equity_curve else ((), ())
+    curve = pd.Series(vals, index=pd.Index(dts, name="date"), name="equity", dtype=float)
+    return {"equity": final_eq, "equity_curve": curve, "metrics": backtest_metrics(curve, trades),
+            "compliance": acct.compliance.summary(), "snapshot": snapshot}
+
+
+def _execution_incremental(config: dict, raw: dict, as_of: date, verify: bool) -> dict:
+    syms = sorted(raw)
+    strat = _strategy(config)
+    cal = calendar_for_symbols(syms)
+    run = run_incremental_backtest(
+        syms, strat, config["starting_cash"], ROOT, ROOT / PIPELINE_SUBDIR / SNAPSHOT_FILE,
+        end=as_of, window=config["days"],
+        max_hold_days=strat.max_hold_days, fill_model=FillModel.from_settings(config["settings"]),
+        compliance=Compliance.from_settings(config["settings"], config["starting_cash"], log_only=True, calendar=cal),
+        correlation=CorrelationLimit.from_settings(config["settings"]), features=_features(config, strat),
+        project_root=ROOT, run_kind="pipeline", verify=verify)
+    return _execution_outputs(run.final_eq, run.trades, run.account, run.summary())
+
+
+def _stage_reporting(as_of: str, signals: list, equity: float, equity_curve: pd.Series, metrics: dict,
+                     screened: dict, compliance: dict, snapshot: dict | None) -> dict:
+    logdir = ROOT / "runtime" / "logs"
+    logdir.mkdir(parents=True, exist_ok=True)
+    equity_curve.rename("equity").to_frame().to_csv(logdir / "equity_curve.csv")
+    report = {"as_of": as_of, "equity": equity, "signals": signals, "metrics": metrics, "screen": screened,
+              "compliance": compliance, "snapshot": snapshot}
+    (logdir / "pipeline_report.json").write_text(json.dumps(report, indent=2, default=str))
+    return {"report": report}
+
+
+def build_daily_pipeline(state_dir: Path | None = None, max_workers: int = 4) -> Pipeline:
+    stages = [
+        Stage("fetch", _stage_fetch, inputs=("config", "as_of"), outputs=("raw",)),
+        Stage("screen", _stage_screen, inputs=("config", "raw"), outputs=("candidates", "screened")),
+        Stage("scan", _stage_scan, inputs=("config", "raw", "candidates"), outputs=("summaries",), inline=True),
+        Stage("signals", _stage_signals, inputs=("config", "summaries"), outputs=("signals",)),
+        # verify_snapshot is its own input so toggling it re-runs execution only
+        Stage("execution", _stage_execution, inputs=("config", "raw", "as_of", "verify_snapshot"),
+              outputs=("equity", "equity_curve", "metrics", "compliance", "snapshot"), version="4"),
+        Stage("reporting", _stage_reporting,
+              inputs=("as_of", "signals", "equity", "equity_curve", "metrics", "screened", "compliance", "snapshot"),
+              outputs=("report",)),
+    ]
+    return Pipeline(stages, state_dir or ROOT / PIPELINE_SUBDIR, max_workers=max_workers)
+
+
+def _git_push_logs():
+    subprocess.call(["git", "add", "runtime/logs"], cwd=ROOT)
+    if subprocess.call(["git", "diff", "--cached", "--quiet"], cwd=ROOT) != 0:
+        subprocess.call(["git", "commit", "-m", "pipeline: update logs"], cwd=ROOT)
+        subprocess.call(["git", "push"], cwd=ROOT)
+
+
+# ------------------------------------------------------------------ entry points
+def run_daily(
     days: int = 60,
     symbols: Sequence[str] | None = None,
     sources: Sequence[str] = ("alpaca","yahoo"),
     starting_cash: float = 1000.0,
-) -> float:
-    """
-    Minimal daily pipeline:
-      1. Load env + settings.
-      2. Determine symbol list (arg or settings.universe).
-      3. Fetch/refresh history.
-      4. Load last N days from cache.
-      5. Run SMA pullback backtest (placeholder for live signals).
-      6. Return portfolio equity.
+    auto_push: bool = False,
+    force: bool = False,
+    as_of: date | None = None,
+    progress=None,
+    verify_snapshot: bool = False,
+) -> PipelineRun:
+    """Run the staged pipeline; the result lists which stages ran vs. were skipped.
+
+    *progress* is passed to :meth:`Pipeline.run` (called after each stage).
+    *verify_snapshot* checks an incremental ``execution`` against a full
+    replay (see :func:`~autoswing.engine.snapshot.run_incremental_backtest`).
     """
     load_env(ROOT / ".env")
     st = load_settings(ROOT / "autoswing" / "config" / "settings_default.yaml")
@@ -32,11 +221,23 @@ def run_pipeline(
         syms = getattr(st, "universe_equities", None) or getattr(st, "universe", [])
     else:
         syms = [s.upper() for s in symbols]
-    # fetch data (will append+dedupe cache)
-    fetch_history(syms, history=f"{days}d", sources=sources, project_root=ROOT)
-    # load N days
-    bundle = load_bundle_cached(syms, days=days, project_root=ROOT)
-    # run strat
-    strat = SMAPullbackStrategy()
-    pf = run_backtest(bundle, strat, starting_cash=starting_cash)
-    return float(pf.equity())
+    config = {"days": days, "symbols": list(syms), "sources": list(sources),
+              "starting_cash": starting_cash, "settings": st.model_dump()}
+    run = build_daily_pipeline().run(
+        {"config": config, "as_of": (as_of or date.today()).isoformat(), "verify_snapshot": verify_snapshot},
+        force=force, progress=progress)
+    if auto_push:
+        _git_push_logs()
+    return run
+
+
+def run_pipeline(
+    days: int = 60,
+    symbols: Sequence[str] | None = None,
+    sources: Sequence[str] = ("alpaca","yahoo"),
+    starting_cash: float = 1000.0,
+    auto_push: bool = False,
+) -> float:
+    """Run the daily pipeline and return final portfolio equity."""
+    run = run_daily(days, symbols, sources, starting_cash, auto_push=auto_push)
+    return float(run.artifacts["equity"])
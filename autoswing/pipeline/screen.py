@@ -0,0 +1,66 @@
+"""Universe prefilter ahead of the per-symbol strategy scan.
+
+Cheap price/liquidity/history gates are evaluated for the whole universe at
+once over the :class:`~autoswing.data.stats_index.StatsIndex` frame, so the
+strategy only loads and scans symbols that could trade.  A gate whose
+statistic is unknown (e.g. no volume column for ADV) does not reject.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+@dataclass
+class Prefilter:
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_adv_usd: Optional[float] = None
+    min_bars: Optional[int] = None
+    min_volatility: Optional[float] = None
+    max_volatility: Optional[float] = None
+    max_stale_days: Optional[int] = None   # last bar at most this many days behind the freshest symbol
+
+    @classmethod
+    def from_settings(cls, screen: dict, strategy=None, days: Optional[int] = None) -> "Prefilter":
+        """From the ``screen`` settings block; ``min_bars`` defaults to the strategy's warmup."""
+        pf = cls(**{k: v for k, v in (screen or {}).items() if k in cls.__dataclass_fields__})
+        if pf.min_bars is None and strategy is not None:
+            pf.min_bars = int(getattr(strategy, "warmup_bars", 0)) or None
+        if pf.min_bars is not None and days is not None and pf.min_bars > days:
+            pf.min_bars = days  # the scan only ever sees `days` bars
+        return pf
+
+
+def screen(stats: pd.DataFrame, symbols: Sequence[str], prefilter: Prefilter) -> Tuple[List[str], Dict[str, int]]:
+    """``(candidates, rejected count per gate)`` for *symbols*; unindexed symbols are rejected as ``no_data``.
+
+    A symbol failing several gates is counted under the first one.
+    """
+    syms = pd.Index([s.upper() for s in symbols])
+    df = stats.reindex(syms)
+    p = prefilter
+    gates = {"no_data": df["bars"].isna() | (df["bars"] <= 0)}
+    if p.min_bars is not None:
+        gates["history"] = df["bars"] < p.min_bars
+    if p.min_price is not None:
+        gates["min_price"] = df["last_close"] < p.min_price
+    if p.max_price is not None:
+        gates["max_price"] = df["last_close"] > p.max_price
+    if p.min_adv_usd is not None:
+        gates["adv"] = df["adv_usd"] < p.min_adv_usd
+    if p.min_volatility is not None:
+        gates["min_volatility"] = df["volatility"] < p.min_volatility
+    if p.max_volatility is not None:
+        gates["max_volatility"] = df["volatility"] > p.max_volatility
+    if p.max_stale_days is not None and df["last_date"].notna().any():
+        last = pd.to_datetime(df["last_date"])
+        gates["stale"] = (last.max() - last).dt.days > p.max_stale_days
+    rejected = pd.Series(False, index=syms)
+    counts = {}
+    for name, mask in gates.items():
+        hit = mask.fillna(False).to_numpy(dtype=bool) & ~rejected.to_numpy()
+        counts[name] = int(hit.sum())
+        rejected |= hit
+    return list(syms[~rejected.to_numpy()]), counts
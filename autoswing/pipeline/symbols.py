@@ -0,0 +1,62 @@
+"""Per-symbol pipeline work unit: load -> features -> signal -> compact summary.
+
+Each symbol's frame lives only inside :func:`scan_chunk`; what crosses back to
+the single-threaded portfolio step is a :class:`SymbolSummary` of a few
+scalars, so memory does not grow with the universe.  With *feature_store* the
+strategy's declared indicator columns come from
+:mod:`autoswing.data.features` instead of being recomputed per run.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from autoswing.data.cache import read_daily_cache
+from autoswing.data.features import join_features
+
+
+@dataclass
+class SymbolSummary:
+    symbol: str
+    bars: int
+    last_date: Optional[str] = None
+    last_close: Optional[float] = None
+    features: Dict[str, float] = field(default_factory=dict)  # last value per feature
+    signal: Optional[dict] = None                              # {"action", "price", "stop", "tags"}
+
+
+def _features(df: pd.DataFrame, fast: int, slow: int) -> Dict[str, float]:
+    close = df["close"]
+    out = {f"sma_{n}": df[f"sma_{n}"].iloc[-1] if f"sma_{n}" in df else close.rolling(n).mean().iloc[-1]
+           for n in (fast, slow)}
+    return {k: float(v) for k, v in out.items() if pd.notna(v)}
+
+
+def scan_symbol(symbol: str, days: int, strategy_params: dict, project_root: Path,
+                feature_store: bool = False) -> SymbolSummary:
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    strat = SMAPullbackStrategy(**strategy_params)
+    df = read_daily_cache(symbol, project_root, columns=strat.bar_columns)
+    if df is None:
+        return SymbolSummary(symbol, 0)
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.drop_duplicates("date", keep="last").sort_values("date").tail(days).reset_index(drop=True)
+    if df.empty:
+        return SymbolSummary(symbol, 0)
+    if feature_store:
+        df = join_features(symbol, df, strat.features, project_root)
+    summary = SymbolSummary(symbol, len(df), df["date"].iloc[-1].date().isoformat(),
+                            float(df["close"].iloc[-1]), _features(df, strat.fast, strat.slow))
+    for sig in strat.scan({symbol: df}):
+        summary.signal = {"action": sig.action, "price": float(sig.price),
+                          "stop": sig.stop, "tags": dict(sig.tags)}
+        break
+    return summary
+
+
+def scan_chunk(symbols: List[str], days: int, strategy_params: dict, project_root: Path,
+               feature_store: bool = False) -> List[SymbolSummary]:
+    """Work unit shipped to pool workers (module-level so it pickles)."""
+    return [scan_symbol(s, days, strategy_params, project_root, feature_store) for s in symbols]
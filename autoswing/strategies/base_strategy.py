@@ -14,6 +14,8 @@ class BaseStrategy:
     warmup_bars = 50
     max_positions = 5
     risk_per_trade = 0.02
+    features = ()      # stored indicator columns scan() reads when present (see autoswing.data.features)
+    bar_columns = None  # bar columns scan() reads besides ``date`` (None = all)
 
     def scan(self, data_bundle):  # override
         return []
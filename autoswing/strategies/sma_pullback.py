@@ -1,26 +1,44 @@
-apply_patch <<'EOF'
-*** Begin Patch
-*** Update File: autoswing/strategies/sma_pullback.py
-@@
--class SMAPullbackStrategy(BaseStrategy):
--    timeframe = "1d"
--    warmup_bars = 30
-+class SMAPullbackStrategy(BaseStrategy):
-+    timeframe = "1d"
-+    warmup_bars = 30
-+    max_positions = 5      # will be overwritten by settings if passed in
-+    alloc_pct = 0.20       # 20% of settled cash per entry (capped by open slots)
-+    max_hold_days = 5      # default timed exit
-@@
--    def position_size(self, account, signal):
--        # Phase 1 naive sizing: equal-dollar allocations from account.settled_cash
--        cash = getattr(account, "settled_cash", 0)
--        if cash <= 0:
--            return 0
--        alloc = cash / self.max_positions
--        return int(alloc // signal.price)
-+    def position_size(self, account, signal):
-+        """Deprecated (Phase 3A uses executor sizing)."""
-+        return 0
-*** End Patch
-EOF
+"""SMA pullback swing strategy (daily bars)."""
+from __future__ import annotations
+from autoswing.strategies.base_strategy import BaseStrategy, Signal
+
+
+class SMAPullbackStrategy(BaseStrategy):
+    """Buy pullbacks to the fast SMA while the fast SMA is above the slow SMA."""
+    timeframe = "1d"
+    warmup_bars = 30
+    max_positions = 5      # will be overwritten by settings if passed in
+    alloc_pct = 0.20       # 20% of settled cash per entry (capped by open slots)
+    max_hold_days = 5      # default timed exit
+    bar_columns = ("close",)
+
+    def __init__(self, fast: int = 10, slow: int = 30, **overrides):
+        self.fast = int(fast)
+        self.slow = int(slow)
+        self.warmup_bars = max(self.warmup_bars, self.slow)
+        for k, v in overrides.items():
+            setattr(self, k, v)
+
+    @property
+    def features(self):
+        # derived from fast/slow rather than stored, so it is not an extra instance attribute
+        return f"sma_{self.fast}", f"sma_{self.slow}"
+
+    def scan(self, data_bundle):
+        sigs = []
+        for sym, df in data_bundle.items():
+            if df is None or len(df) < self.warmup_bars:
+                continue
+            close = df["close"]
+            sma_f, sma_s = (df[name].iloc[-1] if name in df else close.rolling(n).mean().iloc[-1]
+                            for name, n in zip(self.features, (self.fast, self.slow)))
+            last = float(close.iloc[-1])
+            # uptrend + close dipped under the fast SMA but holds above the slow SMA
+            if sma_f > sma_s and sma_s < last <= sma_f:
+                sigs.append(Signal(sym, "buy", last, stop=float(sma_s),
+                                   tags={"fast": self.fast, "slow": self.slow}))
+        return sigs
+
+    def position_size(self, account, signal):
+        """Deprecated (Phase 3A uses executor sizing)."""
+        return 0
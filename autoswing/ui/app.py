@@ -1,75 +1,220 @@
+"""Streamlit dashboard.
+
+Long work (backtest, pipeline, walk-forward, Monte Carlo) runs on the
+:class:`~autoswing.ui.jobs.JobRunner` held in ``st.cache_resource``; pages
+show live progress with a cancel button and render the last persisted result
+immediately.  Reads go through ``st.cache_data`` keyed on the source files'
+``(mtime, size)``, so widget interactions do not touch disk unless the data
+actually changed.  Charts are downsampled and logs tailed server-side
+(:mod:`autoswing.ui.data`).
+"""
 from __future__ import annotations
-import json
+import time
+from datetime import datetime
 from pathlib import Path
 import pandas as pd
 import streamlit as st
-from autoswing.pipeline.daily import run_pipeline
-from autoswing.config.loader import load_settings
-from autoswing.backtest.walkforward import walkforward
-from autoswing.analysis.montecarlo import load_trade_returns, mc_paths
+from autoswing.analysis.metrics import metrics_frame
+from autoswing.backtest.walkforward import rank_walkforward
+from autoswing.db.store import RunStore, db_path
+from autoswing.ui.data import CsvTail, FileTail, downsample, hist_frame, histogram
+from autoswing.ui.jobs import JobRunner
 
 ROOT = Path(__file__).parents[2]
 LOGDIR = ROOT / "runtime/logs"
+POLL_SECONDS = 0.5
 
 st.set_page_config(page_title="AutoSwingUS-Pro", layout="wide")
 st.sidebar.title("AutoSwingUS-Pro")
 page = st.sidebar.radio("Sections", ["Status","Backtest","Pipeline","Walk-Forward","Monte Carlo"])
 
-def _load_equity_curve():
+
+@st.cache_resource
+def _runner() -> JobRunner:
+    return JobRunner(ROOT)
+
+
+@st.cache_resource
+def _file_tail(path: str) -> FileTail:
+    return FileTail(Path(path))
+
+
+@st.cache_resource
+def _csv_tail(path: str) -> CsvTail:
+    return CsvTail(Path(path))
+
+
+def _equity_chart(ec: pd.DataFrame):
+    st.line_chart(downsample(ec.set_index("date")["equity"]))
+
+
+def _sig(*paths: Path) -> tuple:
+    """Cache key for file-backed data: (mtime_ns, size) of each path."""
+    out = []
+    for p in paths:
+        try:
+            s = p.stat()
+            out.append((s.st_mtime_ns, s.st_size))
+        except FileNotFoundError:
+            out.append(None)
+    return tuple(out)
+
+
+def _db_sig() -> tuple:
+    db = db_path(ROOT)
+    # WAL mode: recent commits live in the -wal file until checkpoint
+    return _sig(db, db.with_name(db.name + "-wal"))
+
+
+@st.cache_data(show_spinner=False)
+def _equity_curve(kind: str | None, sig: tuple, csv_sig: tuple) -> pd.DataFrame:
+    """Equity of the latest run in the store (falls back to legacy CSV)."""
+    if sig[0] is not None:
+        with RunStore.for_project(ROOT) as store:
+            run_id = store.latest_run_id(kind)
+            if run_id:
+                return store.equity(run_id).reset_index()
     f = LOGDIR / "equity_curve.csv"
     if not f.exists():
         return pd.DataFrame(columns=["date","equity"])
     return pd.read_csv(f, parse_dates=["date"])
 
+
+def _load_equity_curve(kind: str | None = None) -> pd.DataFrame:
+    return _equity_curve(kind, _db_sig(), _sig(LOGDIR / "equity_curve.csv"))
+
+
+@st.cache_data(show_spinner=False)
+def _runs(sig: tuple, limit: int = 20) -> pd.DataFrame:
+    with RunStore.for_project(ROOT) as store:
+        return store.runs(limit=limit)
+
+
+@st.cache_data(show_spinner=False)
+def _trades(sig: tuple, symbol: str | None) -> pd.DataFrame:
+    with RunStore.for_project(ROOT) as store:
+        run_id = None if symbol else store.latest_run_id()
+        return store.trades(run_id=run_id, symbol=symbol)
+
+
+@st.cache_data(show_spinner=False)
+def _walkforward_results(sig: tuple) -> pd.DataFrame:
+    f = LOGDIR / "walkforward_results.csv"
+    return pd.read_csv(f, parse_dates=["start","end"]) if f.exists() else pd.DataFrame()
+
+
+def _job_panel(name: str, label: str, **args) -> dict | None:
+    """Run button + live progress/cancel for *name*; returns the last result record."""
+    runner = _runner()
+    job = runner.active(name)
+    if job is None:
+        if st.button(label):
+            job = runner.submit(name, **args)
+    if job is not None and job.active:
+        st.progress(job.progress, text=f"{name}: {job.state} {job.message}".strip())
+        if st.button("Cancel", key=f"cancel-{name}"):
+            runner.cancel(job.id)
+        time.sleep(POLL_SECONDS)
+        st.rerun()
+    failed = [j for j in runner.history() if j.name == name and j.state in ("failed", "cancelled")]
+    last = runner.latest(name)
+    if failed and (last is None or failed[-1].finished > last["finished"]):
+        j = failed[-1]
+        (st.error if j.state == "failed" else st.warning)(f"Last {name} run {j.state}. {j.error or ''}")
+    if last is not None:
+        when = datetime.fromtimestamp(last["finished"]).isoformat(timespec="seconds")
+        st.caption(f"Last result: {when} ({last['seconds']:.1f}s) args={last['args']}")
+    return last
+
+
 if page == "Status":
     st.header("System Status")
     ec = _load_equity_curve()
     if ec.empty:
         st.code('{"msg":"no pipeline run yet"}')
     else:
-        st.line_chart(ec.set_index("date")["equity"])
+        _equity_chart(ec)
+        st.dataframe(metrics_frame(ec["equity"], index=["equity_curve"]).T)
+    if db_path(ROOT).exists():
+        sig = _db_sig()
+        st.subheader("Recent Runs")
+        st.dataframe(_runs(sig))
+        sym = st.text_input("Trades for symbol (blank = latest run)", "").strip().upper()
+        trades = _trades(sig, sym or None)
+        st.dataframe(trades)
+        pnl = trades["realized_pnl"][trades["side"] == "sell"] if "realized_pnl" in trades else []
+        if len(pnl):
+            st.caption("Realized PnL per closing trade")
+            st.bar_chart(histogram(pnl))
+    jobs = _runner().history()
+    if jobs:
+        st.subheader("UI Jobs")
+        st.dataframe(pd.DataFrame([{"id": j.id, "job": j.name, "state": j.state, "progress": j.progress,
+                                    "seconds": j.seconds, "error": j.error} for j in jobs]))
+    st.subheader("Logs")
+    st.code("\n".join(_file_tail(str(LOGDIR / "watch_loop.log")).tail(200)) or "(no watch_loop.log yet)")
+    if not db_path(ROOT).exists():
+        # runs are recorded in the run store; trades.csv only exists on installs that predate it
+        legacy = _csv_tail(str(LOGDIR / "trades.csv")).read()
+        if not legacy.empty:
+            st.caption("Legacy trades.csv (newest rows)")
+            st.dataframe(legacy.tail(200))
     st.subheader("Quick Actions")
     st.code("autoswingctl pipeline-daily\nautoswingctl data-fetch --symbols AAPL,MSFT --history 3y")
 
 elif page == "Backtest":
     st.header("Backtest (cached)")
     days = st.number_input("Lookback days", 30, 2000, 365, step=5)
-    if st.button("Run Backtest"):
-        from autoswing.cli.main import paper_backtest
-        paper_backtest(days=days)
+    last = _job_panel("paper-backtest", "Run Backtest", days=int(days))
+    if last is not None:
+        st.metric("Final equity", f"{last['result']['equity']:.2f}")
+        st.json(last["result"]["metrics"])
+        ec = _load_equity_curve("backtest")
+        if not ec.empty:
+            _equity_chart(ec)
 
 elif page == "Pipeline":
     st.header("Daily Pipeline Run")
     days = st.number_input("Signal lookback days", 10, 250, 60, step=5, key="pipe_days")
     push = st.checkbox("Git auto-push logs", value=False)
-    if st.button("Run Pipeline Now"):
-        eq = run_pipeline(days=days, auto_push=push)
-        st.success(f"Pipeline complete. Final equity: {eq:.2f}")
-        ec = _load_equity_curve()
+    last = _job_panel("pipeline-daily", "Run Pipeline Now", days=int(days), auto_push=push)
+    if last is not None:
+        res = last["result"]
+        st.success(f"Final equity: {res['equity']:.2f} (ran: {', '.join(res['ran']) or '-'}; "
+                   f"skipped: {', '.join(res['skipped']) or '-'})")
+        ec = _load_equity_curve("pipeline")
         if not ec.empty:
-            st.line_chart(ec.set_index("date")["equity"])
+            _equity_chart(ec)
 
 elif page == "Walk-Forward":
     st.header("Walk-Forward Analysis")
-    st.caption("Rolling train/test optimization demo.")
-    st.write("Defaults: 180 train / 30 test / 30 step.")
-    st.write("Symbols from settings.")
-    if st.button("Run Walk-Forward"):
-        st.write("Running...")
-        st.experimental_rerun()
-    # detect rerun trigger by checking new results file
-    wf_file = LOGDIR / "walkforward_results.csv"
-    if wf_file.exists():
-        df = pd.read_csv(wf_file, parse_dates=["start","end"])
+    st.caption("Rolling train/test optimization; symbols from settings.")
+    c1, c2, c3 = st.columns(3)
+    train = c1.number_input("Train days", 60, 1000, 180, step=10)
+    test = c2.number_input("Test days", 5, 250, 30, step=5)
+    step = c3.number_input("Step days", 5, 250, 30, step=5)
+    _job_panel("walkforward", "Run Walk-Forward", train=int(train), test=int(test), step=int(step))
+    df = _walkforward_results(_sig(LOGDIR / "walkforward_results.csv"))
+    if not df.empty:
         st.dataframe(df)
-        st.bar_chart(df.groupby("symbol")["return"].mean())
+        if "sharpe" in df.columns:
+            ranked = rank_walkforward(df)
+            st.dataframe(ranked)
+            st.bar_chart(ranked["mean_sharpe"])
+        else:
+            st.bar_chart(df.groupby("symbol")["return"].mean())
 
 elif page == "Monte Carlo":
     st.header("Monte Carlo Simulation")
     iters = st.slider("Iterations", 1000, 20000, 10000, step=1000)
-    if st.button("Run MC from trade logs"):
-        arr = load_trade_returns("trades")
-        res = mc_paths(arr, iters=iters, start_equity=1000.0)
+    last = _job_panel("montecarlo", "Run MC from trade logs", iters=int(iters), starting_cash=1000.0,
+                      hist_bins=40)
+    if last is not None:
+        res = dict(last["result"])
+        hist = res.pop("final_hist", None)
         st.json(res)
-        st.write("Distribution of finals:")
-        st.bar_chart(pd.DataFrame(res["final_samples"], columns=["final"]))
+        st.write("Final equity quantiles:")
+        st.bar_chart(pd.Series({k: res[k] for k in ("min", "p05", "p50", "p95", "max")}, name="final"))
+        if hist and hist["counts"]:
+            st.write("Final equity distribution:")
+            st.bar_chart(hist_frame(hist))
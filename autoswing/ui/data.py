@@ -0,0 +1,187 @@
+"""Server-side shaping of UI data: downsampling, histograms, log tailing.
+
+Charts never need more points than the screen has pixels, so series go
+through :func:`downsample` (Largest-Triangle-Three-Buckets, which keeps
+peaks and drawdowns that plain striding drops) and distributions through
+:func:`histogram`.  :class:`FileTail` / :class:`CsvTail` remember a byte
+offset per file and only read what was appended since the last call, so a
+page load costs the same however long ``watch_loop.log`` or ``trades.csv``
+has grown.  Nothing here imports streamlit.
+"""
+from __future__ import annotations
+import io
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional
+
+import numpy as np
+import pandas as pd
+
+CHART_POINTS = 1200
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the *n_out* points LTTB keeps (first and last always kept)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # n_out - 2 buckets between the fixed end points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample(series: pd.Series, max_points: int = CHART_POINTS) -> pd.Series:
+    """*series* reduced to at most *max_points* with :func:`lttb` (NaNs dropped)."""
+    s = series.dropna()
+    if len(s) <= max_points:
+        return s
+    idx = s.index
+    if isinstance(idx, pd.DatetimeIndex) or pd.api.types.is_datetime64_any_dtype(idx):
+        x = pd.DatetimeIndex(idx).asi8.astype(float)
+    elif pd.api.types.is_numeric_dtype(idx):
+        x = idx.to_numpy(dtype=float)
+    else:
+        x = np.arange(len(s), dtype=float)
+    return s.iloc[lttb(x, s.to_numpy(dtype=float), max_points)]
+
+
+def histogram(samples, bins: int = 40) -> pd.DataFrame:
+    """Binned counts of *samples*, indexed by bin midpoint (for ``st.bar_chart``)."""
+    arr = np.asarray(samples, dtype=float).ravel()
+    arr = arr[np.isfinite(arr)]
+    if arr.size == 0:
+        return pd.DataFrame({"count": []})
+    counts, edges = np.histogram(arr, bins=bins)
+    return _hist_frame(edges, counts)
+
+
+def hist_frame(hist: dict) -> pd.DataFrame:
+    """Frame for an ``{"edges": [...], "counts": [...]}`` dict (see ``QuantileSketch.histogram``)."""
+    return _hist_frame(np.asarray(hist["edges"], dtype=float), np.asarray(hist["counts"]))
+
+
+def _hist_frame(edges: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+    mids = (edges[:-1] + edges[1:]) / 2
+    return pd.DataFrame({"count": counts}, index=pd.Index(np.round(mids, 2), name="bin"))
+
+
+# ---------------------------------------------------------------------------
+# Incremental tails
+# ---------------------------------------------------------------------------
+
+class FileTail:
+    """Appended lines of a growing text file, read from a remembered offset.
+
+    Keeps the last *keep* complete lines.  A file that shrinks or is replaced
+    (new inode, e.g. rotation) is re-read from the start.  On first open only
+    the final *initial_bytes* are read, so a huge existing log costs O(keep).
+    """
+
+    def __init__(self, path: Path, keep: int = 500, initial_bytes: int = 256 * 1024):
+        self.path = Path(path)
+        self.keep = keep
+        self.initial_bytes = initial_bytes
+        self.lines: Deque[str] = deque(maxlen=keep)
+        self.offset = 0
+        self.resets = 0
+        self._inode: Optional[int] = None
+        self._partial = b""
+        self._skip_partial = False
+        self._lock = threading.Lock()
+
+    def _floor(self, f) -> int:
+        """First byte that belongs to the tail (after a header, for subclasses)."""
+        return 0
+
+    def _reset(self, f, st: os.stat_result):
+        self.lines.clear()
+        self.resets += 1
+        self._partial = b""
+        self._inode = st.st_ino
+        floor = self._floor(f)
+        self.offset = max(floor, st.st_size - self.initial_bytes)
+        self._skip_partial = False
+        if self.offset > floor:
+            f.seek(self.offset - 1)
+            self._skip_partial = f.read(1) != b"\n"  # landed mid-line
+
+    def read_new(self) -> List[str]:
+        """Lines appended since the last call (complete lines only)."""
+        with self._lock:
+            try:
+                st = self.path.stat()
+            except FileNotFoundError:
+                return []
+            with self.path.open("rb") as f:
+                if self._inode is None or st.st_ino != self._inode or st.st_size < self.offset:
+                    self._reset(f, st)
+                if st.st_size == self.offset:
+                    return []
+                f.seek(self.offset)
+                chunk = f.read(st.st_size - self.offset)
+            self.offset += len(chunk)
+            *complete, self._partial = (self._partial + chunk).split(b"\n")
+            if self._skip_partial and complete:
+                complete = complete[1:]
+                self._skip_partial = False
+            new = [ln.decode("utf-8", "replace").rstrip("\r") for ln in complete]
+            self.lines.extend(new)
+            return new
+
+    def tail(self, n: Optional[int] = None) -> List[str]:
+        self.read_new()
+        lines = list(self.lines)
+        return lines if n is None else lines[-n:]
+
+
+class CsvTail(FileTail):
+    """A CSV's rows as a frame, parsing only rows appended since the last call.
+
+    The header is read once per file; with *max_rows* only the newest rows
+    are kept (and only about that much of an existing file is read).
+    """
+
+    def __init__(self, path: Path, max_rows: Optional[int] = 5000, **read_csv_kw):
+        super().__init__(path, keep=1, initial_bytes=(max_rows or 1 << 40) * 256)
+        self.max_rows = max_rows
+        self.read_csv_kw = read_csv_kw
+        self.header: Optional[str] = None
+        self.frame = pd.DataFrame()
+        self._seen_resets = 0
+
+    def _floor(self, f) -> int:
+        f.seek(0)
+        line = f.readline()
+        self.header = line.decode("utf-8", "replace").rstrip("\r\n") if line.endswith(b"\n") else None
+        return len(line) if self.header is not None else 0
+
+    def read(self) -> pd.DataFrame:
+        new = self.read_new()
+        if self.resets != self._seen_resets:
+            self._seen_resets = self.resets
+            self.frame = pd.DataFrame()
+        if self.header is None:
+            # header was incomplete when first seen: start over next time
+            self._inode = None
+            return self.frame
+        rows = [ln for ln in new if ln]
+        if rows:
+            chunk = pd.read_csv(io.StringIO("\n".join([self.header, *rows])), **self.read_csv_kw)
+            self.frame = pd.concat([self.frame, chunk], ignore_index=True) if len(self.frame) else chunk
+            if self.max_rows is not None and len(self.frame) > self.max_rows:
+                self.frame = self.frame.iloc[-self.max_rows:].reset_index(drop=True)
+        return self.frame
@@ -0,0 +1,161 @@
+"""Background jobs for the Streamlit UI.
+
+The Streamlit script reruns top to bottom on every widget interaction, so
+long work must not run inside it.  :class:`JobRunner` (one per UI server,
+held with ``st.cache_resource``) runs jobs from the daemon's registry
+(:data:`autoswing.daemon.server.JOBS`) on worker threads; heavy jobs fan out
+to processes themselves (Monte Carlo shards, pipeline scan).  Each job
+reports ``progress`` / ``message`` and is cancelled cooperatively: the
+progress callback raises :class:`JobCancelled` at its next checkpoint.
+
+The last successful result of each job name is persisted under
+``runtime/ui/jobs/`` so a fresh page load renders it without re-running.
+Nothing here imports streamlit.
+"""
+from __future__ import annotations
+import os
+import pickle
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).parents[2]
+JOBS_SUBDIR = "runtime/ui/jobs"
+ACTIVE = ("queued", "running")
+
+
+class JobCancelled(Exception):
+    """Raised from a job's progress callback once cancellation is requested."""
+
+
+@dataclass
+class Job:
+    id: str
+    name: str
+    args: Dict[str, Any]
+    state: str = "queued"  # queued | running | done | failed | cancelled
+    progress: float = 0.0
+    message: str = ""
+    result: Any = None
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.state in ACTIVE
+
+    @property
+    def seconds(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+
+class JobRunner:
+    """Thread-pool job queue with progress, cancellation and persisted results."""
+
+    def __init__(self, root: Path = ROOT, workers: int = 2,
+                 registry: Optional[Dict[str, Callable[..., Any]]] = None):
+        if registry is None:
+            from autoswing.daemon.server import JOBS as registry
+        self.root = Path(root)
+        self.registry = registry
+        self.results_dir = self.root / JOBS_SUBDIR
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asw-ui-job")
+
+    # --- queue ------------------------------------------------------------
+    def submit(self, name: str, **args) -> Job:
+        """Queue *name*; if one is already queued/running it is returned instead."""
+        if name not in self.registry:
+            raise KeyError(f"unknown job {name!r}; known: {sorted(self.registry)}")
+        with self._lock:
+            current = self.active(name)
+            if current is not None:
+                return current
+            job = Job(uuid.uuid4().hex[:12], name, args)
+            self.jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or not job.active:
+            return False
+        job._cancel.set()
+        if job.state == "queued":
+            job.state = "cancelled"
+            job.finished = time.time()
+        return True
+
+    def active(self, name: str) -> Optional[Job]:
+        for job in reversed(list(self.jobs.values())):
+            if job.name == name and job.active:
+                return job
+        return None
+
+    def history(self, limit: int = 20) -> List[Job]:
+        return list(self.jobs.values())[-limit:]
+
+    def shutdown(self):
+        for job in list(self.jobs.values()):
+            job._cancel.set()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job: Job):
+        if job._cancel.is_set():
+            return
+
+        def _progress(frac: float, msg: str = ""):
+            if job._cancel.is_set():
+                raise JobCancelled(job.id)
+            job.progress = min(max(float(frac), 0.0), 1.0)
+            job.message = msg
+
+        job.state, job.started = "running", time.time()
+        try:
+            job.result = self.registry[job.name](self.root, **job.args, progress=_progress)
+            job.state, job.progress = "done", 1.0
+        except JobCancelled:
+            job.state = "cancelled"
+        except Exception as exc:
+            job.state = "failed"
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.message = traceback.format_exc(limit=5)
+        job.finished = time.time()
+        if job.state == "done":
+            self._persist(job)
+
+    # --- persisted results --------------------------------------------------
+    def _result_file(self, name: str) -> Path:
+        return self.results_dir / f"{name}.pkl"
+
+    def _persist(self, job: Job):
+        rec = {"id": job.id, "args": job.args, "result": job.result,
+               "finished": job.finished, "seconds": job.seconds}
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.results_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(rec, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._result_file(job.name))
+
+    def latest(self, name: str) -> Optional[dict]:
+        """Last successful result of *name* (this session or a previous one)."""
+        fp = self._result_file(name)
+        if not fp.exists():
+            return None
+        try:
+            with fp.open("rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
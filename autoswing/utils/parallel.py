@@ -0,0 +1,91 @@
+"""Bounded, chunked fan-out of per-symbol work.
+
+Work is cut into chunks (one task per chunk keeps dispatch overhead low on
+large universes) and at most ``2 * workers`` chunks are in flight, so results
+stream back without queueing the whole universe.  :func:`plan_workers` caps
+the worker count by a memory budget, since each worker holds one symbol's
+frame at a time.
+
+Process pools start their workers from a fork server (spawn where there is
+none) instead of forking the caller, which may have other threads running
+(pipeline stages, UI jobs) and would hand the child their held locks.
+"""
+from __future__ import annotations
+import math
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# parquet -> in-memory DataFrame expansion is typically 3-6x for OHLCV
+FRAME_EXPANSION = 5
+
+
+def chunked(items: Sequence[T], size: int) -> List[List[T]]:
+    size = max(1, int(size))
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def plan_workers(files: Iterable[Path], workers: int | None, memory_budget_mb: float | None) -> int:
+    """Worker count honouring *memory_budget_mb* given the largest cache file."""
+    workers = workers or os.cpu_count() or 1
+    if not memory_budget_mb:
+        return max(1, workers)
+    largest = max((p.stat().st_size for p in files if p.exists()), default=0)
+    per_worker = max(largest * FRAME_EXPANSION, 1)
+    return max(1, min(workers, int(memory_budget_mb * 1024 * 1024 // per_worker)))
+
+
+def process_context():
+    """Multiprocessing context that is safe to start from a threaded process."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _executor(kind: str, workers: int) -> Executor:
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers, mp_context=process_context())
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"unknown executor kind {kind!r}")
+
+
+def map_chunks(
+    fn: Callable[[List[T]], List[R]],
+    items: Sequence[T],
+    workers: int = 1,
+    chunk_size: int | None = None,
+    kind: str = "thread",
+) -> Iterator[R]:
+    """Apply *fn* to chunks of *items*; yield individual results as chunks finish.
+
+    ``workers <= 1`` runs inline (no pool, no pickling).  Result order follows
+    chunk completion, not input order.
+    """
+    if not items:
+        return
+    if chunk_size is None:
+        chunk_size = math.ceil(len(items) / max(1, workers * 4))
+    chunks = chunked(items, chunk_size)
+    if workers <= 1:
+        for c in chunks:
+            yield from fn(c)
+        return
+    with _executor(kind, workers) as pool:
+        todo = iter(chunks)
+        running = set()
+        for c in todo:
+            running.add(pool.submit(fn, c))
+            if len(running) >= 2 * workers:
+                break
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                yield from fut.result()
+                nxt = next(todo, None)
+                if nxt is not None:
+                    running.add(pool.submit(fn, nxt))
@@ -0,0 +1,141 @@
+"""Profile a CLI command: sorted report + flamegraph-compatible stacks.
+
+Two modes:
+
+``cprofile``
+    Deterministic :mod:`cProfile` of the command; the report is the pstats
+    table sorted by cumulative time and the raw stats are kept as ``.prof``
+    (snakeviz / ``python -m pstats``).
+``sample``
+    Low-overhead wall-clock sampling of the main thread; the report lists
+    functions by self and inclusive samples.
+
+Either way a background sampler records the main thread's stack every
+*interval* seconds and writes ``<name>.collapsed`` (``a;b;c <count>`` lines)
+for ``flamegraph.pl`` / speedscope.  Output goes to ``runtime/profiles/``.
+"""
+from __future__ import annotations
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+PROFILE_SUBDIR = "runtime/profiles"
+MODES = ("cprofile", "sample")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    mod = frame.f_globals.get("__name__") or Path(code.co_filename).stem
+    return f"{mod}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class StackSampler:
+    """Samples one thread's stack on a daemon thread into collapsed-stack counts."""
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            parts = []
+            while frame is not None:
+                parts.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(parts))] += 1
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in sorted(self.stacks.items()) if stack)
+
+    def report(self, top: int = 40) -> str:
+        self_n: Counter = Counter()
+        incl_n: Counter = Counter()
+        for stack, n in self.stacks.items():
+            frames = stack.split(";")
+            self_n[frames[-1]] += n
+            for f in set(frames):
+                incl_n[f] += n
+        total = sum(self.stacks.values()) or 1
+        lines = [f"{total} samples @ {self.interval * 1000:.1f} ms",
+                 f"{'self%':>7} {'incl%':>7}  function"]
+        for f, n in incl_n.most_common(top):
+            lines.append(f"{100 * self_n[f] / total:7.1f} {100 * n / total:7.1f}  {f}")
+        return "\n".join(lines) + "\n"
+
+
+class Profiler:
+    """Start/stop around a command; :meth:`stop` writes the files and returns them."""
+
+    def __init__(self, project_root: Path, name: str, mode: str = "cprofile", interval: float = 0.005):
+        if mode not in MODES:
+            raise ValueError(f"profile mode must be one of {MODES}, got {mode!r}")
+        self.out_dir = Path(project_root) / PROFILE_SUBDIR
+        self.name = name or "autoswingctl"
+        self.mode = mode
+        self.sampler = StackSampler(interval=interval)
+        self._prof = cProfile.Profile() if mode == "cprofile" else None
+        self._t0 = 0.0
+
+    def start(self) -> "Profiler":
+        self._t0 = time.perf_counter()
+        self.sampler.start()
+        if self._prof is not None:
+            self._prof.enable()
+        return self
+
+    def stop(self) -> Dict[str, Path]:
+        if self._prof is not None:
+            self._prof.disable()
+        self.sampler.stop()
+        wall = time.perf_counter() - self._t0
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.out_dir / f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}"
+        header = f"# {self.name} mode={self.mode} wall={wall:.3f}s\n"
+        out = {"report": stem.with_suffix(".txt"), "collapsed": stem.with_suffix(".collapsed")}
+        if self._prof is not None:
+            buf = io.StringIO()
+            pstats.Stats(self._prof, stream=buf).sort_stats("cumulative").print_stats(40)
+            body = buf.getvalue()
+            out["pstats"] = stem.with_suffix(".prof")
+            self._prof.dump_stats(out["pstats"])
+        else:
+            body = self.sampler.report()
+        out["report"].write_text(header + body + _phase_summary())
+        out["collapsed"].write_text(self.sampler.collapsed())
+        return out
+
+
+def _phase_summary() -> str:
+    """Backtest phase totals, if :func:`run_bar_backtest` recorded any."""
+    from autoswing.utils import telemetry
+    rows = [(dict(labels).get("phase", "?"), m) for (name, labels), m in telemetry.REGISTRY.items()
+            if name == "autoswing_backtest_phase_seconds"]
+    if not rows:
+        return ""
+    total = sum(m.sum for _, m in rows) or 1.0
+    lines = ["", "# backtest phases (seconds across sessions)"]
+    for phase, m in sorted(rows, key=lambda r: -r[1].sum):
+        lines.append(f"{phase:<10} {m.sum:9.3f}s {100 * m.sum / total:6.1f}%  ({m.count} sessions)")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,219 @@
+"""Lightweight counters / gauges / histograms with labels.
+
+Disabled by default: :func:`counter`, :func:`gauge` and :func:`histogram`
+then return one shared no-op object, so instrumented hot paths pay a flag
+check and an attribute call.  Enable with ``AUTOSWING_METRICS=1`` or
+``autoswingctl --metrics``; :func:`flush` appends JSON lines to
+``runtime/logs/metrics.jsonl`` and rewrites a Prometheus textfile
+(``runtime/metrics/autoswing.prom``, or ``$AUTOSWING_PROM_DIR``) for the
+node_exporter textfile collector.
+"""
+from __future__ import annotations
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+METRICS_LOG = "runtime/logs/metrics.jsonl"
+PROM_SUBDIR = "runtime/metrics"
+PROM_FILE = "autoswing.prom"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0, math.inf)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Noop:
+    def inc(self, n: float = 1.0):
+        pass
+
+    def set(self, v: float):
+        pass
+
+    def observe(self, v: float):
+        pass
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        yield
+
+
+NOOP = _Noop()
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, lock: threading.Lock):
+        self._lock = lock
+        self.value = 0.0
+
+    def inc(self, n: float = 1.0):
+        with self._lock:
+            self.value += n
+
+    def sample(self) -> dict:
+        return {"value": self.value}
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, v: float):
+        self.value = float(v)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, lock: threading.Lock, buckets=DEFAULT_BUCKETS):
+        self._lock = lock
+        self.bounds = tuple(buckets)
+        self.counts = [0] * len(self.bounds)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, v: float):
+        with self._lock:
+            self.count += 1
+            self.sum += v
+            for i, b in enumerate(self.bounds):
+                if v <= b:
+                    self.counts[i] += 1
+                    break
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+    def sample(self) -> dict:
+        cum, acc = [], 0
+        for c in self.counts:
+            acc += c
+            cum.append(acc)
+        return {"count": self.count, "sum": self.sum,
+                "buckets": {("+Inf" if math.isinf(b) else repr(b)): n for b, n in zip(self.bounds, cum)}}
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[Tuple[str, LabelKey], object] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    def _get(self, cls, name: str, help: str, labels: dict, **kw):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        m = self._metrics.get(key)
+        if m is None:
+            with self._lock:
+                m = self._metrics.get(key)
+                if m is None:
+                    m = cls(threading.Lock(), **kw)
+                    self._metrics[key] = m
+                    self._help.setdefault(name, (cls.kind, help))
+        return m
+
+    def counter(self, name: str, help: str = "", **labels) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", **labels) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", buckets=DEFAULT_BUCKETS, **labels) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def items(self):
+        return list(self._metrics.items())
+
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+            self._help.clear()
+
+    # --- exporters ----------------------------------------------------------
+    def to_jsonl(self, run: str = "") -> str:
+        ts = time.time()
+        lines = []
+        for (name, labels), m in self.items():
+            lines.append(json.dumps({"ts": ts, "run": run, "name": name, "type": m.kind,
+                                     "labels": dict(labels), **m.sample()}))
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def to_prometheus(self) -> str:
+        by_name: Dict[str, list] = {}
+        for (name, labels), m in self.items():
+            by_name.setdefault(name, []).append((labels, m))
+        out = []
+        for name in sorted(by_name):
+            kind, help = self._help.get(name, ("untyped", ""))
+            out.append(f"# HELP {name} {help or name}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, m in by_name[name]:
+                if m.kind == "histogram":
+                    smp = m.sample()
+                    for le, n in smp["buckets"].items():
+                        out.append(f"{name}_bucket{_fmt_labels(labels + (('le', le),))} {n}")
+                    out.append(f"{name}_sum{_fmt_labels(labels)} {smp['sum']}")
+                    out.append(f"{name}_count{_fmt_labels(labels)} {smp['count']}")
+                else:
+                    out.append(f"{name}{_fmt_labels(labels)} {m.value}")
+        return "\n".join(out) + "\n"
+
+
+def _fmt_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")  # noqa: E731
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels) + "}"
+
+
+REGISTRY = Registry()
+_enabled = os.getenv("AUTOSWING_METRICS", "").lower() in ("1", "true", "yes")
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def counter(name: str, help: str = "", **labels):
+    return REGISTRY.counter(name, help, **labels) if _enabled else NOOP
+
+
+def gauge(name: str, help: str = "", **labels):
+    return REGISTRY.gauge(name, help, **labels) if _enabled else NOOP
+
+
+def histogram(name: str, help: str = "", **labels):
+    return REGISTRY.histogram(name, help, **labels) if _enabled else NOOP
+
+
+def flush(project_root: Path, run: str = "", prom_dir: Optional[Path] = None) -> Optional[Path]:
+    """Append JSON lines and rewrite the Prometheus textfile; returns the .prom path."""
+    if not _enabled or not REGISTRY.items():
+        return None
+    log = Path(project_root) / METRICS_LOG
+    log.parent.mkdir(parents=True, exist_ok=True)
+    with log.open("a", encoding="utf-8") as f:
+        f.write(REGISTRY.to_jsonl(run))
+    prom_dir = Path(prom_dir or os.getenv("AUTOSWING_PROM_DIR") or Path(project_root) / PROM_SUBDIR)
+    prom_dir.mkdir(parents=True, exist_ok=True)
+    # node_exporter may read at any moment: write then rename
+    fd, tmp = tempfile.mkstemp(dir=prom_dir, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(REGISTRY.to_prometheus())
+    target = prom_dir / PROM_FILE
+    os.replace(tmp, target)
+    return target
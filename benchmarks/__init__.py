@@ -0,0 +1,8 @@
+"""Performance benchmarks for AutoSwingUS-Pro hot paths.
+
+Run ``python -m benchmarks.run`` (or ``make bench``).  Data comes from the
+deterministic generator in :mod:`benchmarks.synthetic`.  Timings are compared
+with a JSON baseline under ``benchmarks/baselines/``; ``--save`` rewrites
+the baseline.  The fetch cases run against the offline provider stand-ins
+in :mod:`benchmarks.standins`, so they need no network access.
+"""
@@ -0,0 +1,244 @@
+"""Benchmark cases: one per hot path, parameterized by :class:`Scale`.
+
+A case is a setup function ``(fixture) -> callable``.  The setup runs
+untimed.  The callable it returns is the timed body, run ``repeat`` times.
+Setups return ``None`` to skip a scale.  A body may return a
+:class:`Throughput` so the runner can report items/s and bytes/s as well.
+Context managers a setup needs, such as a stand-in server, go through
+:meth:`Fixture.enter` and are closed once the case has been timed.
+"""
+from __future__ import annotations
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_bundle, write_bundle
+
+
+@dataclass(frozen=True)
+class Scale:
+    name: str
+    symbols: int
+    bars: int
+
+
+SCALES: Dict[str, Scale] = {s.name: s for s in (
+    Scale("small", 10, 250),
+    Scale("medium", 50, 500),
+    Scale("large", 200, 1000),
+)}
+
+
+@dataclass
+class Fixture:
+    """Synthetic data for one scale, also written to a scratch project's cache."""
+    scale: Scale
+    root: Path
+    seed: int = 0
+    bundle: Dict[str, pd.DataFrame] = field(init=False)
+    stack: ExitStack = field(init=False, default_factory=ExitStack)
+
+    def __post_init__(self):
+        self.bundle = synthetic_bundle(self.scale.symbols, self.scale.bars, seed=self.seed)
+        write_bundle(self.bundle, self.root)
+
+    @property
+    def symbols(self) -> list:
+        return list(self.bundle)
+
+    def enter(self, cm):
+        """Enter *cm* for the current case only."""
+        return self.stack.enter_context(cm)
+
+
+@dataclass
+class Throughput:
+    items: int
+    bytes: int = 0
+
+
+Setup = Callable[[Fixture], Optional[Callable[[], object]]]
+CASES: Dict[str, Setup] = {}
+
+
+def case(name: str):
+    def deco(fn: Setup) -> Setup:
+        CASES[name] = fn
+        return fn
+    return deco
+
+
+@case("backtest")
+def _backtest(fx: Fixture):
+    from autoswing.engine.paper_executor import run_bar_backtest
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    strat = SMAPullbackStrategy()
+    return lambda: run_bar_backtest(fx.bundle, strat, 1000.0, max_hold_days=strat.max_hold_days)
+
+
+@case("backtest_fills")
+def _backtest_fills(fx: Fixture):
+    from autoswing.engine.fills import FillModel
+    from autoswing.engine.paper_executor import run_bar_backtest
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    strat = SMAPullbackStrategy()
+    model = FillModel(entry_type="limit", limit_offset_bps=20.0, ttl_bars=3)
+    return lambda: run_bar_backtest(fx.bundle, strat, 1000.0, max_hold_days=strat.max_hold_days,
+                                    fill_model=model)
+
+
+@case("ledger")
+def _ledger(fx: Fixture):
+    from autoswing.engine.ledger import CashLedger
+    days = next(iter(fx.bundle.values()))["date"].dt.date.tolist()
+    amounts = np.random.default_rng(fx.seed).normal(0.0, 50.0, size=(len(days), fx.scale.symbols))
+
+    def run():
+        led = CashLedger(1_000_000.0)
+        for dt, row in zip(days, amounts):
+            for a in row:
+                led.record(dt, a, "X")
+                led.settled_cash(dt)
+        return led.settled_cash(days[-1])
+    return run
+
+
+@case("cache_write")
+def _cache_write(fx: Fixture):
+    from autoswing.data.cache import write_daily_cache
+    root = fx.root / "bench_write"
+    return lambda: [write_daily_cache(s, df, root) for s, df in fx.bundle.items()]
+
+
+@case("cache_read")
+def _cache_read(fx: Fixture):
+    from autoswing.data.cache import read_daily_cache
+    return lambda: [read_daily_cache(s, fx.root) for s in fx.symbols]
+
+
+@case("cache_merge")
+def _cache_merge(fx: Fixture):
+    from autoswing.data.cache import upsert_daily_cache
+    root = fx.root / "bench_merge"
+    write_bundle(fx.bundle, root)
+    # the last 5 bars again plus 5 new ones, as a daily re-fetch would deliver
+    tail = {s: synthetic_bundle([s], 10, seed=fx.seed + 1, end="2025-01-08")[s] for s in fx.symbols}
+    return lambda: [upsert_daily_cache(s, tail[s], root) for s in fx.symbols]
+
+
+@case("load_bundle_cold")
+def _load_bundle_cold(fx: Fixture):
+    from autoswing.data.loader import MEMO, load_bundle_cached
+
+    def run():
+        MEMO.clear()
+        return load_bundle_cached(fx.symbols, fx.scale.bars, fx.root)
+    return run
+
+
+@case("load_bundle_warm")
+def _load_bundle_warm(fx: Fixture):
+    from autoswing.data.loader import load_bundle_cached
+    load_bundle_cached(fx.symbols, fx.scale.bars, fx.root)
+    return lambda: load_bundle_cached(fx.symbols, fx.scale.bars, fx.root)
+
+
+@case("walkforward")
+def _walkforward(fx: Fixture):
+    from autoswing.backtest.walkforward import walkforward
+    if fx.scale.bars < 200:
+        return None
+    return lambda: walkforward(fx.symbols, 150, 20, 20, root=fx.root)
+
+
+@case("montecarlo")
+def _montecarlo(fx: Fixture):
+    from autoswing.analysis.montecarlo import parallel_bootstrap
+    pnls = np.random.default_rng(fx.seed).normal(2.0, 25.0, fx.scale.bars // 5)
+    return lambda: parallel_bootstrap(pnls, iters=fx.scale.symbols * 200, seed=fx.seed)
+
+
+# ---------------------------------------------------------------- fetch (offline stand-ins)
+FETCH_FAULTS = {
+    "clean": {},
+    "flaky": {"alpaca": {"failure": 0.2}},               # 500s -> fall back to the next source
+    "throttled": {"alpaca": {"rate_per_sec": 20.0, "burst": 5}},  # 429s -> SDK retry wait
+}
+
+
+def _history(bars: int) -> str:
+    return f"{bars * 365 // 252}d"
+
+
+def _fetch_case(name: str, sources: Sequence[str], workers: int, scenario: str = "clean",
+                latency: float = 0.05):
+    @case(name)
+    def setup(fx: Fixture):
+        from autoswing.data.fetch import fetch_history
+        from benchmarks.standins import AlpacaStandin, BarStore, Faults, YahooStandin
+        store = BarStore(bars=fx.scale.bars + 60)
+        faults = FETCH_FAULTS[scenario]
+        standins = [fx.enter(AlpacaStandin(store, Faults(latency, latency / 2, **faults.get("alpaca", {})))),
+                    fx.enter(YahooStandin(store, Faults(latency, latency / 2, **faults.get("yahoo", {}))))]
+        root = fx.root / f"bench_{name}"
+
+        def run():
+            sent = sum(s.stats["bytes"] for s in standins)
+            done = fetch_history(fx.symbols, _history(fx.scale.bars), sources, root, max_workers=workers)
+            return Throughput(len(done), sum(s.stats["bytes"] for s in standins) - sent)
+        return run
+    return setup
+
+
+for _w in (1, 8):
+    _fetch_case(f"fetch_alpaca_w{_w}", ["alpaca"], _w)
+    _fetch_case(f"fetch_yahoo_w{_w}", ["yahoo"], _w)
+_fetch_case("fetch_flaky_w8", ["alpaca", "yahoo"], 8, "flaky")
+_fetch_case("fetch_throttled_w8", ["alpaca"], 8, "throttled")
+
+
+def _seed_case(name: str, workers: int, rate_limit_ms: int = 50, latency: float = 0.05):
+    """scripts/seed_cache_from_ccxt.py's paging loop against a :class:`FakeExchange`."""
+    @case(name)
+    def setup(fx: Fixture):
+        import importlib.util
+        try:
+            import ccxt  # noqa: F401  (the seed script imports it at module level)
+        except ImportError:
+            return None
+        from autoswing.utils.parallel import map_chunks
+        from benchmarks.standins import BarStore, Faults, FakeExchange
+        spec = importlib.util.spec_from_file_location(
+            "_bench_seed", Path(__file__).resolve().parents[1] / "scripts" / "seed_cache_from_ccxt.py")
+        seed = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(seed)
+        seed.CACHE_DIR = fx.root / f"bench_{name}"
+        store = BarStore(bars=fx.scale.bars + 60)
+        pairs = [f"C{i:04d}/USDT" for i in range(fx.scale.symbols)]
+        ex = FakeExchange(store, Faults(latency, latency / 2), pairs=pairs, rate_limit_ms=rate_limit_ms,
+                          page_limit=200)
+        ex.load_markets()
+        since = int(store.frame(pairs[0].replace("/", ""))["date"].iloc[-fx.scale.bars].value // 1_000_000)
+
+        def one(chunk):
+            for pair in chunk:
+                rows = seed.fetch_ohlcv_all(ex, pair, "1d", since, 200, None)
+                seed.write_cache(seed.alias_for_pair(pair, "noslash"),
+                                 seed.merge_cache(seed.alias_for_pair(pair, "noslash"),
+                                                  seed.ohlcv_rows_to_df(rows)))
+            return chunk
+
+        def run():
+            sent = ex.stats["bytes"]
+            done = list(map_chunks(one, pairs, workers=workers, chunk_size=1, kind="thread"))
+            return Throughput(len(done), ex.stats["bytes"] - sent)
+        return run
+    return setup
+
+
+for _w in (1, 4):
+    _seed_case(f"seed_ccxt_w{_w}", _w)
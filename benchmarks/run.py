@@ -0,0 +1,163 @@
+"""Run the benchmark cases and compare against a JSON baseline.
+
+Usage::
+
+    python -m benchmarks.run                         # small + medium, compare to the baseline
+    python -m benchmarks.run --scales large --cases backtest,ledger
+    python -m benchmarks.run --save                  # record a new baseline
+
+Each case/scale is timed ``--repeat`` times and the minimum is compared,
+since the minimum is the least noisy estimate on a shared machine.  A result
+is a regression when it is slower than the baseline by more than
+``--tolerance`` (relative) *and* ``--floor`` seconds (absolute, so
+millisecond cases do not flap).  Any regression makes the exit status 1.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from benchmarks.cases import CASES, SCALES, Fixture, Scale, Throughput
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "baseline.json"
+
+
+def machine() -> dict:
+    from autoswing.engine.paper_executor import ENGINE_VERSION
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "machine": platform.machine(), "cpus": os.cpu_count(), "engine_version": ENGINE_VERSION}
+
+
+def time_call(fn, repeat: int) -> dict:
+    runs, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - t0)
+    res = {"min": min(runs), "median": statistics.median(runs), "repeat": repeat}
+    if isinstance(out, Throughput):
+        res.update(items=out.items, bytes=out.bytes,
+                   items_per_s=out.items / res["median"], bytes_per_s=out.bytes / res["median"])
+    return res
+
+
+def run_cases(cases: Iterable[str], scales: Iterable[Scale], repeat: int = 3, seed: int = 0,
+              log=print) -> Dict[str, dict]:
+    """``{"case@scale": {"min", "median", "repeat"}}`` for every case that runs at each scale."""
+    results = {}
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix=f"asw-bench-{scale.name}-") as tmp:
+            t0 = time.perf_counter()
+            fx = Fixture(scale, Path(tmp), seed)
+            log(f"# {scale.name}: {scale.symbols} symbols x {scale.bars} bars "
+                f"(generated in {time.perf_counter() - t0:.1f}s)")
+            for name in cases:
+                with fx.stack:
+                    fn = CASES[name](fx)
+                    if fn is None:
+                        continue
+                    res = time_call(fn, repeat)
+                results[f"{name}@{scale.name}"] = res
+                rate = (f"  {res['items_per_s']:8.1f} items/s  {res['bytes_per_s'] / 1e6:7.2f} MB/s"
+                        if "items_per_s" in res else "")
+                log(f"  {name:<18} min {res['min']:9.4f}s  median {res['median']:9.4f}s{rate}")
+    return results
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = 0.2,
+            floor: float = 0.005) -> List[dict]:
+    """One row per current result, with ``status`` ok / regression / faster / new."""
+    rows = []
+    for key, res in current.items():
+        base = baseline.get(key)
+        row = {"case": key, "seconds": res["min"], "baseline": None, "ratio": None, "status": "new"}
+        if base is not None:
+            b = base["min"]
+            row.update(baseline=b, ratio=res["min"] / b if b > 0 else float("inf"))
+            delta = res["min"] - b
+            if delta > max(tolerance * b, floor):
+                row["status"] = "regression"
+            elif -delta > max(tolerance * b, floor):
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def load_baseline(path: Path) -> Optional[dict]:
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def save_baseline(path: Path, results: Dict[str, dict], merge: bool = True) -> Path:
+    """Write *results* (merged into any existing baseline) with machine metadata."""
+    old = load_baseline(path) if merge else None
+    data = {"meta": {**machine(), "created": datetime.now(timezone.utc).isoformat(timespec="seconds")},
+            "results": {**((old or {}).get("results", {})), **results}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, path)
+    return path
+
+
+def _csv(value: str, known: Dict) -> list:
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    bad = [n for n in names if n not in known]
+    if bad:
+        raise SystemExit(f"unknown: {bad}; choose from {sorted(known)}")
+    return names
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="AutoSwing performance benchmarks.")
+    p.add_argument("--cases", default=",".join(CASES), help="comma list (default: all)")
+    p.add_argument("--scales", default="small,medium", help=f"comma list of {list(SCALES)}")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--baseline", type=Path, default=BASELINE)
+    p.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown flagged as a regression")
+    p.add_argument("--floor", type=float, default=0.005, help="ignore differences below this many seconds")
+    p.add_argument("--save", action="store_true", help="write results into the baseline file")
+    p.add_argument("--output", type=Path, help="also write this run's results as JSON")
+    args = p.parse_args(argv)
+
+    cases = _csv(args.cases, CASES)
+    scales = [SCALES[s] for s in _csv(args.scales, SCALES)]
+    results = run_cases(cases, scales, repeat=args.repeat, seed=args.seed)
+    if args.output:
+        args.output.write_text(json.dumps({"meta": machine(), "results": results}, indent=2) + "\n")
+    if args.save:
+        print(f"baseline written: {save_baseline(args.baseline, results)}")
+        return 0
+
+    base = load_baseline(args.baseline)
+    if base is None:
+        print(f"no baseline at {args.baseline}; run with --save to create one")
+        return 0
+    if base["meta"].get("platform") != machine()["platform"] or base["meta"].get("cpus") != os.cpu_count():
+        print(f"note: baseline recorded on {base['meta'].get('platform')} / {base['meta'].get('cpus')} cpus")
+    rows = compare(results, base["results"], args.tolerance, args.floor)
+    print(f"\n{'case':<30}{'seconds':>10}{'baseline':>10}{'ratio':>8}  status")
+    for r in rows:
+        b = "-" if r["baseline"] is None else f"{r['baseline']:.4f}"
+        ratio = "-" if r["ratio"] is None else f"{r['ratio']:.2f}"
+        print(f"{r['case']:<30}{r['seconds']:>10.4f}{b:>10}{ratio:>8}  {r['status']}")
+    regressions = [r["case"] for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(f"\nREGRESSION (>{args.tolerance:.0%}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
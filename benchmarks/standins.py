@@ -0,0 +1,332 @@
+"""Offline stand-ins for the market-data providers, for fetch benchmarks.
+
+* :class:`AlpacaStandin` is a local HTTP server for the Alpaca
+  ``/v2/stocks/bars`` endpoint, paginated with ``next_page_token``.  The
+  real alpaca-py client talks to it through ``ALPACA_DATA_URL``, so the
+  SDK, JSON decoding and retry-on-429 are all measured.
+* :class:`YahooStandin` replaces ``yfinance.download`` inside
+  :mod:`autoswing.data.sources.yahoo_source`.  Frames have the pinned
+  yfinance 0.2.40 single-ticker shape.  Failed downloads return an empty
+  frame, as yfinance does.
+* :class:`FakeExchange` is a ccxt-style exchange: ``load_markets``,
+  ``fetch_ohlcv`` pagination by ``since``/``limit``, ``enableRateLimit``
+  pacing, and ``RateLimitExceeded`` / ``ExchangeNotAvailable`` errors.
+
+Every stand-in serves the same deterministic :class:`BarStore` bars through
+a :class:`Faults` gate: fixed latency plus jitter, a token-bucket rate
+limit, and random failures.  Each stand-in keeps request and byte counts in
+``.stats``.
+"""
+from __future__ import annotations
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from autoswing.data.calendar import is_crypto
+from benchmarks.synthetic import synthetic_bundle
+
+try:  # raise the real ccxt error types when ccxt is installed
+    from ccxt.base.errors import ExchangeNotAvailable, RateLimitExceeded
+except ImportError:
+    class RateLimitExceeded(Exception):
+        pass
+
+    class ExchangeNotAvailable(Exception):
+        pass
+
+DAY_MS = 86_400_000
+
+
+@dataclass
+class Faults:
+    """Per-request behaviour of a stand-in."""
+    latency: float = 0.0        # seconds added to every request
+    jitter: float = 0.0         # uniform extra seconds, 0..jitter
+    rate_per_sec: float = 0.0   # token-bucket refill rate; 0 = unlimited
+    burst: int = 10             # bucket size
+    failure: float = 0.0        # probability of a server error
+    seed: int = 0
+
+
+class Gate:
+    """Applies :class:`Faults` to each request; thread-safe."""
+
+    def __init__(self, faults: Faults):
+        self.faults = faults
+        self.stats: Counter = Counter()
+        self._rng = random.Random(faults.seed)
+        self._lock = threading.Lock()
+        self._tokens = float(faults.burst)
+        self._stamp = time.monotonic()
+
+    def admit(self) -> str:
+        """``"ok"``, ``"rate_limited"`` or ``"error"``, after the simulated latency."""
+        f = self.faults
+        with self._lock:
+            delay = f.latency + (self._rng.random() * f.jitter if f.jitter else 0.0)
+            fail = f.failure and self._rng.random() < f.failure
+            if f.rate_per_sec:
+                now = time.monotonic()
+                self._tokens = min(f.burst, self._tokens + (now - self._stamp) * f.rate_per_sec)
+                self._stamp = now
+                limited = self._tokens < 1.0
+                if not limited:
+                    self._tokens -= 1.0
+            else:
+                limited = False
+            self.stats["requests"] += 1
+            outcome = "rate_limited" if limited else "error" if fail else "ok"
+            self.stats[outcome] += 1
+        if delay:
+            time.sleep(delay)
+        return outcome
+
+    def sent(self, nbytes: int):
+        with self._lock:
+            self.stats["bytes"] += nbytes
+
+
+class BarStore:
+    """Deterministic daily bars for any symbol, ending at *end* (default today).
+
+    Each symbol is seeded from its name.  Crypto pairs trade every day;
+    everything else follows the equities calendar.
+    """
+
+    def __init__(self, bars: int = 1500, end: Optional[date] = None):
+        self.bars = bars
+        self.end = end or date.today()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        key = symbol.upper()
+        with self._lock:
+            df = self._frames.get(key)
+        if df is None:
+            cal = "crypto" if is_crypto(key) else "equities"
+            df = synthetic_bundle([key], self.bars, seed=zlib.crc32(key.encode()), end=str(self.end),
+                                  calendar=cal)[key]
+            with self._lock:
+                self._frames[key] = df
+        return df
+
+    def between(self, symbol: str, start=None, end=None, end_inclusive: bool = True) -> pd.DataFrame:
+        df = self.frame(symbol)
+        d = df["date"]
+        keep = np.ones(len(df), dtype=bool)
+        if start is not None:
+            keep &= (d >= pd.Timestamp(start).tz_localize(None)).to_numpy()
+        if end is not None:
+            e = pd.Timestamp(end).tz_localize(None)
+            keep &= (d <= e if end_inclusive else d < e).to_numpy()
+        return df.loc[keep]
+
+
+class _Env:
+    """Set environment variables for the duration of a ``with`` block."""
+
+    def __init__(self, **values: str):
+        self.values = values
+        self._old: Dict[str, Optional[str]] = {}
+
+    def __enter__(self):
+        for k, v in self.values.items():
+            self._old[k] = os.environ.get(k)
+            os.environ[k] = v
+        return self
+
+    def __exit__(self, *exc):
+        for k, v in self._old.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+# ---------------------------------------------------------------- Alpaca
+class AlpacaStandin:
+    """Local ``/v2/stocks/bars`` server; use as a context manager.
+
+    Inside the ``with`` block ``ALPACA_DATA_URL`` points at the server and
+    stand-in API keys are set, so :func:`fetch_alpaca_daily` uses it.  A
+    429 is retried by the SDK after its fixed retry wait (3 s), so
+    rate-limit scenarios show that cost too.
+    """
+
+    def __init__(self, store: BarStore, faults: Faults = Faults(), page_size: int = 10_000):
+        self.store = store
+        self.gate = Gate(faults)
+        self.page_size = page_size
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._env: Optional[_Env] = None
+
+    @property
+    def stats(self) -> Counter:
+        return self.gate.stats
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _bars(self, query: dict) -> dict:
+        sym = query["symbols"][0].split(",")[0].upper()
+        df = self.store.between(sym, query.get("start", [None])[0], query.get("end", [None])[0])
+        limit = min(int(query.get("limit", [self.page_size])[0] or self.page_size), self.page_size)
+        offset = int(query.get("page_token", ["0"])[0] or 0)
+        page = df.iloc[offset:offset + limit]
+        bars = [{"t": t.strftime("%Y-%m-%dT05:00:00Z"), "o": o, "h": h, "l": lo, "c": c, "v": v,
+                 "n": int(v // 100), "vw": (h + lo + c) / 3}
+                for t, o, h, lo, c, v in zip(page["date"], page["open"], page["high"], page["low"],
+                                             page["close"], page["volume"])]
+        nxt = offset + limit
+        return {"bars": {sym: bars} if bars else {}, "next_page_token": str(nxt) if nxt < len(df) else None}
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != "/v2/stocks/bars":
+                    return self._send(404, {"code": 40410000, "message": "endpoint not found"})
+                outcome = standin.gate.admit()
+                if outcome == "rate_limited":
+                    return self._send(429, {"code": 42910000, "message": "rate limit exceeded"})
+                if outcome == "error":
+                    return self._send(500, {"code": 50010000, "message": "internal server error"})
+                self._send(200, standin._bars(parse_qs(url.query)))
+
+            def _send(self, status: int, payload: dict):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                standin.gate.sent(len(body))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "AlpacaStandin":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self._env = _Env(ALPACA_DATA_URL=self.url, ALPACA_PAPER_KEY="standin", ALPACA_PAPER_SECRET="standin")
+        self._env.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._env.__exit__(*exc)
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ---------------------------------------------------------------- Yahoo
+class YahooStandin:
+    """``yf.download`` stand-in installed into ``yahoo_source`` for a ``with`` block."""
+
+    def __init__(self, store: BarStore, faults: Faults = Faults()):
+        self.store = store
+        self.gate = Gate(faults)
+        self._saved = None
+
+    @property
+    def stats(self) -> Counter:
+        return self.gate.stats
+
+    def download(self, tickers, start=None, end=None, progress=True, auto_adjust=False, **kwargs) -> pd.DataFrame:
+        if self.gate.admit() != "ok":
+            return pd.DataFrame()  # yfinance logs the failure and returns an empty frame
+        df = self.store.between(str(tickers), start, end, end_inclusive=False)
+        out = pd.DataFrame({"Open": df["open"].to_numpy(), "High": df["high"].to_numpy(),
+                            "Low": df["low"].to_numpy(), "Close": df["close"].to_numpy(),
+                            "Volume": df["volume"].to_numpy().astype("int64")},
+                           index=pd.DatetimeIndex(df["date"], name="Date"))
+        self.gate.sent(int(out.memory_usage(index=True).sum()))
+        return out
+
+    def __enter__(self) -> "YahooStandin":
+        from autoswing.data.sources import yahoo_source
+        self._saved = yahoo_source.yf
+        yahoo_source.yf = self
+        return self
+
+    def __exit__(self, *exc):
+        from autoswing.data.sources import yahoo_source
+        yahoo_source.yf = self._saved
+
+
+# ---------------------------------------------------------------- ccxt
+class FakeExchange:
+    """The slice of the ccxt sync exchange API that our crypto loaders use."""
+
+    def __init__(self, store: BarStore, faults: Faults = Faults(), exchange_id: str = "standin",
+                 pairs=("BTC/USDT", "ETH/USDT"), rate_limit_ms: int = 0, page_limit: int = 1000,
+                 enable_rate_limit: bool = True):
+        self.id = exchange_id
+        self.store = store
+        self.gate = Gate(faults)
+        self.symbols = list(pairs)
+        self.markets = {}
+        self.rateLimit = rate_limit_ms
+        self.enableRateLimit = enable_rate_limit
+        self.page_limit = page_limit
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> Counter:
+        return self.gate.stats
+
+    def _throttle(self):
+        if not (self.enableRateLimit and self.rateLimit):
+            return
+        with self._lock:
+            wait = self._last + self.rateLimit / 1000.0 - time.monotonic()
+            self._last = time.monotonic() + max(0.0, wait)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _call(self):
+        self._throttle()
+        outcome = self.gate.admit()
+        if outcome == "rate_limited":
+            raise RateLimitExceeded(f"{self.id} 429 Too Many Requests")
+        if outcome == "error":
+            raise ExchangeNotAvailable(f"{self.id} 503 Service Unavailable")
+
+    def load_markets(self, reload: bool = False) -> dict:
+        self._call()
+        self.markets = {p: {"symbol": p, "base": p.split("/")[0], "quote": p.split("/")[-1]} for p in self.symbols}
+        return self.markets
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1d", since: Optional[int] = None,
+                    limit: Optional[int] = None) -> list:
+        if timeframe != "1d":
+            raise ValueError(f"stand-in serves daily bars only, not {timeframe!r}")
+        self._call()
+        start = None if since is None else pd.Timestamp(since, unit="ms")
+        df = self.store.between(symbol.replace("/", ""), start).iloc[:min(limit or self.page_limit,
+                                                                          self.page_limit)]
+        ts = df["date"].to_numpy().astype("datetime64[ms]").astype(np.int64)
+        rows = [[int(t), o, h, lo, c, v] for t, o, h, lo, c, v in
+                zip(ts, df["open"], df["high"], df["low"], df["close"], df["volume"])]
+        self.gate.sent(len(json.dumps(rows)))
+        return rows
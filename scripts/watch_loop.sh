@@ -21,11 +21,17 @@ while true; do
   # smoke tests
   pytest -q || echo "[WARN] pytest failed"
 
-  # fast backtest (short lookback; faster)
-  python -m autoswing.cli paper-backtest --days 60 || echo "[WARN] backtest failed"
+  if [ -S runtime/daemon.sock ] && python -m autoswing.cli daemon-ctl ping >/dev/null 2>&1; then
+    # resident daemon: jobs run in the warm process
+    python -m autoswing.cli daemon-ctl run paper-backtest --args '{"days": 60}' || echo "[WARN] backtest failed"
+    python -m autoswing.cli daemon-ctl run montecarlo --args '{"iters": 500, "starting_cash": 1000}' || echo "[WARN] mc failed"
+  else
+    # fast backtest (short lookback; faster)
+    python -m autoswing.cli paper-backtest --days 60 || echo "[WARN] backtest failed"
 
-  # run montecarlo for sanity
-  python -m autoswing.cli montecarlo --iters 500 --start 1000 || echo "[WARN] mc failed"
+    # run montecarlo for sanity
+    python -m autoswing.cli montecarlo --iters 500 --start 1000 || echo "[WARN] mc failed"
+  fi
 
   # log to file
   echo "[$TS] cycle done" >> "$LOG_DIR/watch_loop.log"
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+from autoswing.data.calendar import equities_calendar
+from benchmarks.cases import Scale
+from benchmarks.run import compare, run_cases, save_baseline, load_baseline
+from benchmarks.synthetic import synthetic_bundle
+
+
+def test_generator_is_deterministic_and_valid():
+    a = synthetic_bundle(3, 120, seed=5)
+    b = synthetic_bundle(4, 120, seed=5)
+    for s in a:
+        pd.testing.assert_frame_equal(a[s], b[s])  # adding symbols leaves existing ones unchanged
+    df = a["SYN00000"]
+    assert len(df) == 120 and (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+    assert (df["low"] <= df[["open", "close"]].min(axis=1)).all() and (df["volume"] > 0).all()
+    assert equities_calendar().is_session(df["date"]).all()
+    gappy = synthetic_bundle(1, 500, seed=5, gap_rate=0.1)["SYN00000"]
+    assert 400 < len(gappy) < 500
+    assert not synthetic_bundle(1, 120, seed=6)["SYN00000"]["close"].equals(df["close"])
+
+
+def test_compare_flags_regressions(tmp_path):
+    base = {"a@small": {"min": 1.0}, "b@small": {"min": 1.0}, "c@small": {"min": 0.001}}
+    cur = {"a@small": {"min": 1.5}, "b@small": {"min": 0.5}, "c@small": {"min": 0.003},
+           "d@small": {"min": 1.0}}
+    status = {r["case"]: r["status"] for r in compare(cur, base, tolerance=0.2, floor=0.005)}
+    assert status == {"a@small": "regression", "b@small": "faster", "c@small": "ok", "d@small": "new"}
+
+    path = save_baseline(tmp_path / "base.json", {"a@small": {"min": 1.0}})
+    save_baseline(path, {"b@small": {"min": 2.0}})
+    data = load_baseline(path)
+    assert set(data["results"]) == {"a@small", "b@small"} and "engine_version" in data["meta"]
+
+
+def test_run_cases_tiny_scale():
+    res = run_cases(["ledger", "cache_read", "walkforward"], [Scale("tiny", 2, 60)], repeat=1, log=lambda m: None)
+    assert set(res) == {"ledger@tiny", "cache_read@tiny"}  # walkforward skips short histories
+    assert all(r["min"] > 0 and r["repeat"] == 1 for r in res.values())
+
+
+def test_fetch_standins_end_to_end(tmp_path):
+    from autoswing.data.cache import read_daily_cache
+    from autoswing.data.fetch import fetch_history
+    from benchmarks.standins import AlpacaStandin, BarStore, Faults, FakeExchange, RateLimitExceeded, YahooStandin
+    store = BarStore(bars=300)
+    with AlpacaStandin(store, Faults(failure=1.0)) as alpaca, YahooStandin(store) as yahoo:
+        assert fetch_history(["AAA", "BBB"], "60d", ["alpaca", "yahoo"], tmp_path) == ["AAA", "BBB"]
+        assert alpaca.stats["error"] == 2 and yahoo.stats["ok"] == 2  # every symbol fell back to yahoo
+    with AlpacaStandin(store, page_size=10) as alpaca:
+        assert fetch_history(["CCC"], "60d", ["alpaca"], tmp_path) == ["CCC"]
+        assert alpaca.stats["requests"] > 3 and alpaca.stats["bytes"] > 0  # paginated
+    assert read_daily_cache("CCC", tmp_path)["close"].iloc[-1] == store.frame("CCC")["close"].iloc[-1]
+
+    ex = FakeExchange(store, Faults(rate_per_sec=1.0, burst=2), page_limit=100)
+    rows = ex.fetch_ohlcv("BTC/USDT", since=0, limit=500)
+    assert len(rows) == 100 and rows[0][0] < rows[-1][0]
+    ex.fetch_ohlcv("BTC/USDT", since=rows[-1][0] + 1)
+    with pytest.raises(RateLimitExceeded):
+        ex.fetch_ohlcv("BTC/USDT")
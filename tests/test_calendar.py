@@ -0,0 +1,42 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from autoswing.data.cache import cache_gaps, upsert_daily_cache
+from autoswing.data.calendar import calendar_for, crypto_calendar, equities_calendar, nyse_holidays
+from autoswing.data.fetch import fetch_plan
+from autoswing.data.stats_index import StatsIndex
+from autoswing.engine import CashLedger
+
+
+def test_equities_sessions():
+    assert date(2024, 3, 29) in nyse_holidays(2024)      # Good Friday
+    assert date(2022, 12, 26) in nyse_holidays(2022)     # Christmas on a Sunday
+    cal = equities_calendar()
+    assert cal.count_sessions("2024-01-01", "2024-12-31") == 252
+    assert cal.next_session(date(2024, 7, 3)) == date(2024, 7, 5)
+    assert cal.next_session(date(2024, 7, 6)) == date(2024, 7, 8)   # Saturday counts from Friday
+    idx = cal.session_index(["2024-07-03", "2024-07-04", "2024-07-05"])
+    assert idx[0] + 1 == idx[2] and idx[1] == -1
+    assert crypto_calendar().next_session(date(2024, 7, 3), 2) == date(2024, 7, 5)
+    assert calendar_for("BTC/USDT").name == "crypto" and calendar_for("AAPL").name == "equities"
+
+
+def test_settlement_counts_sessions():
+    led = CashLedger(0.0)
+    led.record(date(2024, 7, 3), 100.0, "X")   # Wednesday before Independence Day
+    assert led.events[0].settle_date == date(2024, 7, 5)
+    assert led.settled_cash(date(2024, 7, 4)) == 0.0 and led.settled_cash(date(2024, 7, 5)) == 100.0
+
+
+def test_gaps_and_incremental_plan(tmp_path):
+    dates = equities_calendar().sessions_between("2024-06-03", "2024-06-28")
+    df = pd.DataFrame({"date": pd.to_datetime(np.delete(dates, 5)), "close": 10.0, "volume": 1e6})
+    StatsIndex.for_project(tmp_path).put("AAA", upsert_daily_cache("AAA", df, tmp_path))
+    assert cache_gaps("AAA", tmp_path).tolist() == [dates[5].astype(object)]
+    assert cache_gaps("ZZZ", tmp_path) is None
+
+    plan = fetch_plan(["AAA", "NEW"], "1y", tmp_path, as_of=date(2024, 6, 30))  # Sunday: nothing new
+    assert plan == {"AAA": None, "NEW": "1y"}
+    plan = fetch_plan(["AAA"], "1y", tmp_path, as_of=date(2024, 7, 2))
+    assert plan == {"AAA": "9d"}
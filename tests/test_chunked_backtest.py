@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from autoswing.data.cache import append_daily_cache, read_daily_cache
+from autoswing.data.loader import SessionChunks
+from autoswing.engine.fills import FillModel
+from autoswing.engine.paper_executor import run_bar_backtest, run_chunked_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+from benchmarks.synthetic import synthetic_bundle, write_bundle
+
+
+@pytest.fixture(scope="module")
+def cached(tmp_path_factory):
+    root = tmp_path_factory.mktemp("chunked")
+    bundle = synthetic_bundle(6, 160, seed=7, gap_rate=0.05)
+    write_bundle(bundle, root)
+    return bundle, root
+
+
+def test_read_daily_cache_date_range(cached, tmp_path):
+    bundle, root = cached
+    df = bundle["SYN00000"]
+    lo, hi = df["date"].iloc[10], df["date"].iloc[19]
+    part = read_daily_cache("SYN00000", root, start=lo, end=hi, columns=["close"])
+    assert list(part.columns) == ["date", "close"] and part["date"].tolist() == df["date"].iloc[10:20].tolist()
+    write_bundle({"AAA": df.iloc[:50]}, tmp_path)
+    append_daily_cache("AAA", df.iloc[40:60], tmp_path)  # delta segments are filtered too
+    assert len(read_daily_cache("AAA", tmp_path, start=df["date"].iloc[45])) == 15
+
+
+def test_session_chunks_carry_lookback(cached):
+    bundle, root = cached
+    chunks = SessionChunks(list(bundle) + ["MISSING"], root, chunk_sessions=50, lookback=30)
+    assert chunks.symbols == list(bundle) and len(chunks) == -(-len(chunks.sessions) // 50)
+    blocks = list(chunks)
+    assert np.array_equal(np.concatenate([b for b, _ in blocks]), chunks.sessions)
+    block, frames = blocks[1]
+    df = frames["SYN00001"]
+    before = (df["date"] < block[0]).sum()
+    assert before == 30 and df["date"].iloc[-1] <= block[-1]
+    assert chunks.last_close["SYN00001"] == bundle["SYN00001"]["close"].iloc[-1]
+
+
+@pytest.mark.parametrize("fill_model", [None, FillModel(entry_type="limit", limit_offset_bps=20.0, ttl_bars=3,
+                                                         protective_stops=True)])
+def test_chunked_matches_in_memory(cached, fill_model):
+    bundle, root = cached
+    strat = SMAPullbackStrategy()
+    ref_eq, ref_trades, ref_acct = run_bar_backtest(bundle, strat, 1000.0, max_hold_days=strat.max_hold_days,
+                                                    fill_model=fill_model)
+    for chunk in (1, 45):
+        eq, trades, acct = run_chunked_backtest(list(bundle), strat, 1000.0, root, chunk_sessions=chunk,
+                                                max_hold_days=strat.max_hold_days, fill_model=fill_model)
+        assert eq == pytest.approx(ref_eq) and acct.equity_curve == ref_acct.equity_curve
+        assert [(t["dt"], t["symbol"], t["qty"]) for t in trades] == \
+            [(t["dt"], t["symbol"], t["qty"]) for t in ref_trades]
+
+
+def test_session_chunks_read_only_the_warmup(cached, tmp_path, monkeypatch):
+    import autoswing.data.loader as loader
+    bundle, _ = cached
+    write_bundle({"OLD": bundle["SYN00000"], "LATE": bundle["SYN00001"].iloc[120:]}, tmp_path)
+    reads = []
+
+    def spy(sym, root, start=None, end=None, columns=None):
+        df = read_daily_cache(sym, root, start=start, end=end, columns=columns)
+        if columns is None:
+            reads.append((sym, len(df)))
+        return df
+
+    monkeypatch.setattr(loader, "read_daily_cache", spy)
+    old = bundle["SYN00000"]["date"]
+    chunks = SessionChunks(["OLD", "LATE"], tmp_path, chunk_sessions=20, lookback=10, start=old.iloc[60])
+    blocks = list(chunks)
+    assert chunks.sessions[0] == np.datetime64(old.iloc[60].date())
+    assert reads[0] == ("OLD", 10 + 20)                     # warm-up plus the block, not the whole history
+    late = [n for s, n in reads if s == "LATE"]
+    assert len(late) == len(blocks) and sum(late) == len(bundle["SYN00001"]) - 120   # each bar read once
+    _, frames = blocks[-1]
+    assert (frames["LATE"]["date"] < blocks[-1][0][0]).sum() == 10
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+# cumulative microseconds allowed for importing autoswing.cli.main itself
+CLI_IMPORT_BUDGET_US = 250_000
+HEAVY = ("pandas", "numpy", "pyarrow", "alpaca", "yfinance", "ccxt", "pydantic",
+         "streamlit", "autoswing.pipeline", "autoswing.engine")
+
+def _importtime(*args):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "autoswing.cli", *args],
+                          cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    mods = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        if cum.strip().isdigit():
+            mods[name.strip()] = int(cum)
+    return mods
+
+def test_help_does_not_import_heavy_modules():
+    mods = _importtime("--help")
+    leaked = sorted(m for m in mods if m.split(".")[0] in HEAVY or m.startswith(HEAVY))
+    assert not leaked, f"--help imported heavy modules: {leaked[:10]}"
+
+def test_help_import_budget():
+    mods = _importtime("--help")
+    assert mods["autoswing.cli.main"] < CLI_IMPORT_BUDGET_US, mods["autoswing.cli.main"]
@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from autoswing.engine import CashLedger, Compliance, PDTMonitor
+from autoswing.engine.fills import FillModel
+from autoswing.engine.paper_executor import PaperAccount, run_bar_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+
+D = date(2024, 3, 4)  # Monday
+
+
+def test_ledger_incremental_matches_scan():
+    led = CashLedger(1000.0, settlement_days=2)
+    rng = np.random.default_rng(1)
+    for k in range(60):
+        dt = D + timedelta(days=k // 3)
+        led.record(dt, float(rng.normal(0, 50)), "X")
+        want = led.starting_cash + sum(e.amount for e in led.events if e.settle_date <= dt)
+        assert np.isclose(led.settled_cash(dt), want)
+        assert np.isclose(led.unsettled_cash(dt), sum(e.amount for e in led.events if e.settle_date > dt))
+    # an earlier date still answers correctly (scan fallback)
+    assert np.isclose(led.settled_cash(D), led.starting_cash + sum(e.amount for e in led.events
+                                                                    if e.settle_date <= D))
+
+
+def test_freeride_blocks_and_logs():
+    c = Compliance(1000.0)
+    acct = PaperAccount(1000.0, compliance=c)
+    assert c.check("buy", "AAA", 10, 90.0, D) is None
+    acct.buy(D, "AAA", 90.0, 10)
+    acct.sell(D + timedelta(days=1), "AAA", 95.0, 10)  # proceeds settle the day after
+    assert c.check("buy", "BBB", 5, 20.0, D + timedelta(days=1)) is None  # the 100 left over
+    assert c.check("buy", "BBB", 6, 20.0, D + timedelta(days=1)) == "unsettled_funds"
+    assert c.check("buy", "BBB", 6, 20.0, D + timedelta(days=2)) is None
+
+    log = Compliance(1000.0, log_only=True)
+    acct = PaperAccount(1000.0, compliance=log)
+    acct.buy(D, "AAA", 100.0, 10)
+    acct.sell(D + timedelta(days=1), "AAA", 100.0, 10)
+    day2 = D + timedelta(days=1)
+    assert log.check("buy", "BBB", 10, 50.0, day2) is None  # logged, not blocked
+    acct.buy(day2, "BBB", 50.0, 10)
+    assert log.check("sell", "BBB", 10, 50.0, day2) is None
+    assert log.summary() == {"violations": 2, "blocked": 0, "by_rule": {"unsettled_funds": 1, "freeride": 1}}
+    assert log.check("sell", "BBB", 10, 50.0, D + timedelta(days=2)) is None
+    assert log.summary()["violations"] == 2  # funds settled: selling is fine now
+
+
+def test_pdt_rolling_window():
+    pdt = PDTMonitor()
+    c = Compliance(1e6, pdt=pdt, enforce_pdt=True)
+    days = pd.bdate_range(D, periods=8).date
+    for dt in days[:3]:
+        c.record("buy", "AAA", 1, 10.0, dt)
+        assert c.check("sell", "AAA", 1, 10.0, dt) is None
+        c.record("sell", "AAA", 1, 10.0, dt)
+    c.record("buy", "AAA", 1, 10.0, days[3])
+    assert c.check("sell", "AAA", 1, 10.0, days[3]) == "pdt"
+    assert c.check("sell", "AAA", 1, 10.0, days[3], equity=30_000) is None
+    assert pdt.count(days[5]) == 2 and pdt.count(days[6]) == 1  # rolling 5-business-day window
+    c.record("buy", "AAA", 1, 10.0, days[5])
+    assert c.check("sell", "AAA", 1, 10.0, days[5]) is None
+
+
+def test_batch_matches_sequential_cash_rule():
+    orders = (["OLD", "A", "B", "C"], ["sell", "buy", "buy", "buy"], [1, 5, 5, 1], [100.0, 100.0, 100.0, 100.0])
+    batch, seq = Compliance(1000.0), Compliance(1000.0)
+    for c in (batch, seq):
+        c.record("buy", "OLD", 1, 100.0, D)
+    dt = D + timedelta(days=1)
+    ok = batch.check_batch(dt, *orders)
+    expected = []
+    for sym, side, qty, px in zip(*orders):
+        expected.append(seq.check(side, sym, qty, px, dt) is None)
+        if expected[-1]:
+            seq.record(side, sym, qty, px, dt)
+    assert ok.tolist() == expected == [True, True, False, True]   # a blocked buy does not use up cash
+    assert batch.counts == seq.counts
+
+
+def test_backtest_log_only_keeps_trades():
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2023-01-02", periods=250)
+    bundle = {s: pd.DataFrame({"date": dates, "close": 100 * np.exp(rng.normal(0.001, 0.02, 250).cumsum())})
+              for s in ("AAA", "BBB", "CCC")}
+    strat = SMAPullbackStrategy()
+    base = run_bar_backtest(bundle, strat, 1000.0, max_hold_days=strat.max_hold_days)
+    logged = run_bar_backtest(bundle, strat, 1000.0, max_hold_days=strat.max_hold_days,
+                              compliance=Compliance(1000.0, log_only=True))
+    assert [t["qty"] for t in logged[1]] == [t["qty"] for t in base[1]]
+    enforced = run_bar_backtest(bundle, strat, 1000.0, max_hold_days=strat.max_hold_days,
+                                fill_model=FillModel(entry_type="market"), compliance=Compliance(1000.0))
+    assert enforced[2].compliance.summary()["blocked"] == enforced[2].compliance.summary()["violations"]
+
+
+class _HoldSells(Compliance):
+    """Blocks every sell before *until* (stand-in for a rule that lifts later)."""
+
+    def __init__(self, until):
+        super().__init__(1e6)
+        self.until = until
+
+    def check_batch(self, dt, symbols, sides, qtys, prices, equity=None):
+        ok = super().check_batch(dt, symbols, sides, qtys, prices, equity)
+        return ok & ~((np.asarray(sides) == "sell") & (dt < self.until))
+
+
+def test_blocked_fills_keep_resting():
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2023-01-02", periods=250)
+    bundle = {s: pd.DataFrame({"date": dates, "close": 100 * np.exp(rng.normal(0.001, 0.02, 250).cumsum())})
+              for s in ("AAA", "BBB", "CCC", "DDD")}
+    strat = SMAPullbackStrategy()
+    until = dates[200].date()
+    _, trades, _ = run_bar_backtest(bundle, strat, 10000.0, max_hold_days=strat.max_hold_days,
+                                    fill_model=FillModel(entry_type="market"), compliance=_HoldSells(until))
+    held = {t["symbol"] for t in trades if t["dt"] < until}
+    sells = [t for t in trades if t["side"] == "sell"]
+    assert sells and min(t["dt"] for t in sells) == until
+    # the timed exits blocked until then all go out on the first session they may
+    assert {t["symbol"] for t in sells if t["dt"] == until} == held
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+from autoswing.analysis.covariance import RollingCovariance
+from autoswing.engine.correlation import CorrelationLimit
+from autoswing.engine.fills import FillModel
+from autoswing.engine.paper_executor import run_bar_backtest, run_chunked_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+from benchmarks.synthetic import synthetic_bundle, write_bundle
+
+
+def _closes(n, sessions, seed=0):
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 0.01, (sessions, 1))
+    rets = common * rng.uniform(0.2, 1.5, n) + rng.normal(0, 0.01, (sessions, n))
+    return pd.DataFrame(100 * np.exp(np.cumsum(rets, axis=0)), columns=[f"S{k}" for k in range(n)])
+
+
+def test_matches_pandas_window_and_halflife():
+    px = _closes(6, 200)
+    px.iloc[50:60, 2] = np.nan                       # a gap: the return after it spans the gap
+    rets = np.log(px.ffill()).diff().where(px.notna())
+    win = RollingCovariance(px.columns, window=30, min_periods=10)
+    ew = RollingCovariance(px.columns, halflife=15.0, min_periods=10)
+    for row in px.to_numpy():
+        win.update(row)
+        ew.update(row)
+    ref = rets.iloc[-30:]
+    assert win.corr().to_numpy() == pytest.approx(ref.corr(min_periods=10).to_numpy())
+    assert win.cov().to_numpy() == pytest.approx(ref.cov(min_periods=10).to_numpy())
+    cols = ["S0", "S1", "S3"]                        # halflife parity on the gap-free columns
+    ewm = rets[cols].iloc[1:].ewm(halflife=15.0).corr().iloc[-len(cols):]
+    assert ew.corr(cols).to_numpy() == pytest.approx(ewm.to_numpy())
+
+
+def test_lookups_and_new_symbols():
+    px = _closes(3, 80, seed=1)
+    cov = RollingCovariance(["S0", "S1"], window=40, min_periods=20)
+    for t, row in enumerate(px.to_dict("records")):
+        cov.update(row if t >= 70 else {"S0": row["S0"], "S1": row["S1"]})
+    assert cov.symbols == ["S0", "S1", "S2"]
+    assert np.isnan(cov.max_corr("S2", ["S0"]))      # 9 returns since S2 joined: short of min_periods
+    c = cov.corr()
+    assert cov.corr_with("S0", ["S1", "S2", "NOPE"])[:2] == pytest.approx(c.loc["S0", ["S1", "S2"]].to_numpy(),
+                                                                          nan_ok=True)
+    assert cov.max_corr("S0", ["S0", "S1"]) == pytest.approx(c.loc["S0", "S1"])
+    assert np.isnan(cov.max_corr("NOPE", ["S0"]))
+    with pytest.raises(ValueError):
+        RollingCovariance(window=None)
+
+
+def test_symbol_added_mid_window_keeps_the_ring():
+    px = _closes(3, 17, seed=2)
+    cov = RollingCovariance(["S0", "S1"], window=10, min_periods=5)
+    for t, row in enumerate(px.to_dict("records")):
+        if t == 13:
+            cov.add_symbols(["S2"])
+        cov.update(row if t >= 13 else {"S0": row["S0"], "S1": row["S1"]})
+    rets = np.log(px).diff()
+    rets.loc[:13, "S2"] = np.nan                     # S2's first return is the one after it joined
+    ref = rets.iloc[-10:].corr(min_periods=5)
+    assert cov.corr(["S0", "S1"]).to_numpy() == pytest.approx(ref.loc[["S0", "S1"], ["S0", "S1"]].to_numpy())
+
+
+def _with_clones(seed=5, bars=250):
+    bundle = synthetic_bundle(4, bars, seed=seed)
+    for s, df in list(bundle.items()):
+        clone = df.copy()
+        clone[["open", "high", "low", "close"]] *= 2   # same returns: correlation 1
+        bundle["X" + s] = clone
+    return bundle
+
+
+def _held_together(trades):
+    held, together = set(), False
+    for tr in sorted(trades, key=lambda t: t["trade_id"]):
+        if tr["side"] == "buy":
+            held.add(tr["symbol"])
+        else:
+            held.discard(tr["symbol"])
+        together |= any(("X" + s) in held for s in held)
+    return together
+
+
+def test_limit_keeps_clones_apart():
+    bundle = _with_clones()
+    _, free, _ = run_bar_backtest(bundle, SMAPullbackStrategy(), 10000.0)
+    limit = CorrelationLimit(max_corr=0.9, window=20, min_periods=5)
+    _, gated, _ = run_bar_backtest(bundle, SMAPullbackStrategy(), 10000.0, correlation=limit)
+    assert _held_together(free) and not _held_together(gated)
+    loose = CorrelationLimit(max_corr=1.0, window=20, min_periods=5)
+    _, same, _ = run_bar_backtest(bundle, SMAPullbackStrategy(), 10000.0, correlation=loose)
+    assert same == free
+    assert CorrelationLimit.from_settings({"correlation": {"max_corr": None}}) is None
+    assert CorrelationLimit.from_settings({"correlation": {"max_corr": 0.8, "halflife": 10}}).window is None
+
+
+def test_chunked_matches_in_memory_with_limit(tmp_path):
+    bundle = _with_clones(seed=7, bars=300)
+    write_bundle(bundle, tmp_path)
+    kw = dict(fill_model=FillModel(entry_type="limit", limit_offset_bps=20.0, ttl_bars=3),
+              correlation=CorrelationLimit(max_corr=0.9, window=20, min_periods=5))
+    strat = SMAPullbackStrategy()
+    eq, trades, _ = run_bar_backtest(bundle, strat, 10000.0, **kw)
+    ceq, ctrades, _ = run_chunked_backtest(list(bundle), SMAPullbackStrategy(), 10000.0, tmp_path,
+                                           chunk_sessions=40, lookback=strat.warmup_bars, **kw)
+    assert ctrades == trades and ceq == pytest.approx(eq)
+    assert not _held_together(trades)
@@ -0,0 +1,42 @@
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from autoswing.daemon import Daemon, DailySchedule, request
+from autoswing.daemon import server
+
+def test_schedule_next_after():
+    sch = DailySchedule.parse("19:15 America/Los_Angeles")
+    tz = ZoneInfo("America/Los_Angeles")
+    assert sch.next_after(datetime(2025, 7, 1, 10, 0, tzinfo=tz)) == datetime(2025, 7, 1, 19, 15, tzinfo=tz)
+    assert sch.next_after(datetime(2025, 7, 1, 19, 15, tzinfo=tz)) == datetime(2025, 7, 2, 19, 15, tzinfo=tz)
+
+def test_socket_run_and_stop(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "warm_up", lambda: None)
+    monkeypatch.setitem(server.JOBS, "echo", lambda root, progress=None, **kw: kw)
+    sock = tmp_path / "d.sock"
+    d = Daemon(tmp_path, socket_path=sock)
+    t = threading.Thread(target=d.serve_forever, daemon=True)
+    t.start()
+    for _ in range(100):
+        if sock.exists():
+            break
+        threading.Event().wait(0.02)
+    assert request(sock, {"cmd": "ping"})["ok"]
+    resp = request(sock, {"cmd": "run", "job": "echo", "args": {"x": 1}, "wait": True})
+    assert resp["state"] == "done" and resp["result"] == {"x": 1}
+    assert not request(sock, {"cmd": "run", "job": "nope"})["ok"]
+    request(sock, {"cmd": "stop"})
+    t.join(5)
+    assert not t.is_alive() and not sock.exists()
+
+def test_job_history_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setitem(server.JOBS, "echo", lambda root, progress=None, **kw: kw)
+    d = Daemon(tmp_path, socket_path=tmp_path / "d.sock", history=3)
+    worker = threading.Thread(target=d._worker, daemon=True)
+    worker.start()
+    ids = [d.submit("echo", {"i": i}) for i in range(6)]
+    assert d.wait(ids[-1], timeout=5)["result"] == {"i": 5}
+    d._queue.put(None)
+    worker.join(5)
+    assert list(d.jobs) == ids[-3:] and set(d._done) == set(ids[-3:])
+    assert [j["args"]["i"] for j in d.recent()] == [3, 4, 5]
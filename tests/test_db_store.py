@@ -0,0 +1,35 @@
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from autoswing.db.store import RunStore
+
+def _trade(i, dt, sym, side, pnl):
+    return {"trade_id": i, "dt": dt, "symbol": sym, "side": side, "qty": 1, "price": 10.0,
+            "notional": 10.0, "fee": 0.0, "settle_dt": dt, "settled": False,
+            "realized_pnl": pnl, "cash_after": 100.0}
+
+def test_record_and_query(tmp_path):
+    with RunStore(tmp_path / "t.sqlite") as st:
+        rid = st.record_run(
+            [_trade(1, date(2025, 1, 2), "AAA", "buy", 0.0), _trade(2, date(2025, 1, 6), "AAA", "sell", 3.5),
+             _trade(3, date(2025, 1, 6), "BBB", "buy", 0.0)],
+            [(date(2025, 1, 2), 100.0), (date(2025, 1, 6), 103.5)],
+            strategy="X", params={"fast": 10}, starting_cash=100.0, final_equity=103.5)
+        st.record_run([_trade(1, date(2025, 2, 3), "AAA", "sell", -1.0)], kind="pipeline")
+        assert st.latest_run_id() != rid
+        assert len(st.trades(run_id=rid)) == 3
+        assert list(st.trades(symbol="BBB").symbol) == ["BBB"]
+        assert len(st.trades(start=date(2025, 1, 5), end=date(2025, 1, 31))) == 2
+        assert np.allclose(sorted(st.trade_pnls()), [-1.0, 3.5])
+        assert st.equity(rid).iloc[-1] == 103.5
+        assert st.runs(kind="pipeline").n_trades.iloc[0] == 1
+        assert st.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_day_bounds_cover_datetime_rows(tmp_path):
+    with RunStore(tmp_path / "t.sqlite") as st:
+        st.record_run([_trade(1, pd.Timestamp("2025-01-06"), "AAA", "buy", 0.0),
+                       _trade(2, datetime(2025, 1, 7, 15, 30), "AAA", "sell", 1.0),
+                       _trade(3, date(2025, 1, 8), "AAA", "buy", 0.0)])
+        assert list(st.trades(start=date(2025, 1, 6), end=date(2025, 1, 7)).trade_id) == [1, 2]
+        assert list(st.trades(start=datetime(2025, 1, 7, 18), end="2025-01-08").trade_id) == [2, 3]
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from autoswing.data import features as F
+from autoswing.data.cache import append_daily_cache, compact_daily_cache, read_daily_cache
+from autoswing.pipeline.symbols import scan_chunk
+from benchmarks.synthetic import synthetic_bundle, write_bundle
+
+NAMES = ["sma_10", "sma_30", "atr_14", "vol_20", "ret_5", "hh_20", "ll_20"]
+
+
+def _assert_matches_rebuild(sym, root):
+    full = F.compute_features(read_daily_cache(sym, root), NAMES)
+    got = F.read_features(sym, NAMES, root)
+    assert got["date"].equals(full["date"])
+    for n in NAMES:
+        assert np.array_equal(got[n].to_numpy(), full[n].to_numpy(), equal_nan=True), n
+
+
+def test_extends_bit_exact_on_appends_and_late_bars(tmp_path):
+    bundle = synthetic_bundle(2, 300, seed=2, gap_rate=0.05)
+    write_bundle({s: df.iloc[:200] for s, df in bundle.items()}, tmp_path)
+    assert [F.ensure_features(s, NAMES, tmp_path) for s in bundle] == ["rebuilt", "rebuilt"]
+    assert F.ensure_features("SYN00000", NAMES[:2], tmp_path) == "fresh"
+    for s, df in bundle.items():
+        append_daily_cache(s, df.iloc[200:250], tmp_path)
+    late = bundle["SYN00001"].iloc[[195]].copy()   # inside the stored tail
+    late["close"] *= 1.1
+    append_daily_cache("SYN00001", late, tmp_path)
+    deep = bundle["SYN00000"].iloc[[60]].copy()    # older than the tail: context read from the cache
+    deep["high"] *= 1.5
+    append_daily_cache("SYN00000", deep, tmp_path)
+    assert [F.ensure_features(s, NAMES, tmp_path) for s in bundle] == ["extended", "extended"]
+    for s in bundle:
+        _assert_matches_rebuild(s, tmp_path)
+    ref = bundle["SYN00001"]["close"].iloc[:250].copy()
+    ref.iloc[195] *= 1.1
+    got = F.read_features("SYN00001", ["sma_10"], tmp_path, start=bundle["SYN00001"]["date"].iloc[240])
+    assert len(got) == 10 and got["sma_10"].to_numpy() == pytest.approx(ref.rolling(10).mean().iloc[-10:].to_numpy())
+
+
+def test_invalidation_and_join(tmp_path, monkeypatch):
+    bundle = synthetic_bundle(1, 120, seed=4)
+    write_bundle(bundle, tmp_path)
+    F.ensure_features("SYN00000", ["sma_10"], tmp_path)
+    assert F.ensure_features("SYN00000", ["atr_14"], tmp_path) == "rebuilt"      # new feature, old one kept
+    assert F.ensure_features("SYN00000", ["sma_10", "atr_14"], tmp_path) == "fresh"
+    monkeypatch.setitem(F.FEATURES, "atr", F.FeatureKind(F._atr, ("high", "low", "close"), lambda n: n, version=2))
+    assert F.ensure_features("SYN00000", ["atr_14"], tmp_path) == "rebuilt"      # feature version bumped
+    append_daily_cache("SYN00000", bundle["SYN00000"].iloc[-3:], tmp_path)
+    compact_daily_cache("SYN00000", tmp_path)
+    assert F.ensure_features("SYN00000", ["atr_14"], tmp_path) == "rebuilt"      # base file rewritten
+    assert F.ensure_features("MISSING", ["atr_14"], tmp_path) == "missing"
+    with pytest.raises(ValueError):
+        F.parse_feature("sma_x")
+
+    bars = read_daily_cache("SYN00000", tmp_path).iloc[50:]
+    joined = F.join_features("SYN00000", bars, ["sma_10", "atr_14"], tmp_path)
+    assert len(joined) == len(bars) and joined["sma_10"].notna().all()
+    assert joined["sma_10"].iloc[-1] == pytest.approx(bundle["SYN00000"]["close"].iloc[-10:].mean())
+
+
+def test_scan_reads_stored_features(tmp_path):
+    bundle = synthetic_bundle(6, 200, seed=11)
+    write_bundle(bundle, tmp_path)
+    params = {"fast": 10, "slow": 30}
+    plain = scan_chunk(list(bundle), 120, params, tmp_path)
+    stored = scan_chunk(list(bundle), 120, params, tmp_path, feature_store=True)
+    assert [s.signal for s in plain] == [s.signal for s in stored]
+    for a, b in zip(plain, stored):
+        assert b.features == pytest.approx(a.features)
+
+
+def test_loaders_attach_stored_features(tmp_path):
+    from autoswing.data.loader import SessionChunks, load_bundle_cached
+    from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+    bundle = synthetic_bundle(3, 150, seed=6)
+    write_bundle(bundle, tmp_path)
+    strat = SMAPullbackStrategy()
+    assert "features" not in vars(strat) and strat.features == ("sma_10", "sma_30")
+    got = load_bundle_cached(list(bundle), 60, tmp_path, columns=strat.bar_columns, features=strat.features)
+    for s, df in got.items():
+        assert list(df.columns) == ["date", "close", "sma_10", "sma_30"]
+        ref = bundle[s]["close"].rolling(30).mean().iloc[-60:].to_numpy()
+        assert df["sma_30"].to_numpy() == pytest.approx(ref)
+    chunks = SessionChunks(list(bundle), tmp_path, 40, 10, features=strat.features)
+    for _, frames in chunks:
+        for s, df in frames.items():
+            full = bundle[s].set_index("date")["close"].rolling(10).mean()
+            assert df["sma_10"].to_numpy() == pytest.approx(full.loc[df["date"]].to_numpy(), nan_ok=True)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from autoswing.engine.fills import BUY, LIMIT, MARKET, SELL, STOP, STOP_LIMIT, FillModel, OrderBook
+from autoswing.engine.paper_executor import run_bar_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+
+
+def _bar(o, h, l, c, v=1e6):
+    return tuple(np.array([x], dtype=float) for x in (o, h, l, c, v))
+
+
+def _fill(model, side, kind, limit=np.nan, stop=np.nan, bar=(100, 105, 95, 101), qty=10):
+    book = OrderBook(model)
+    book.add(0, side, kind, qty, limit, stop)
+    sym, sd, q, px = book.match(*_bar(*bar))
+    return (float(px[0]), int(q[0])) if len(px) else None
+
+
+def test_limit_stop_and_gaps():
+    m = FillModel()
+    assert _fill(m, BUY, LIMIT, limit=97) == (97.0, 10)
+    assert _fill(m, BUY, LIMIT, limit=102) == (100.0, 10)  # gapped through: fills at the open
+    assert _fill(FillModel(gap_fill="order"), BUY, LIMIT, limit=102) == (102.0, 10)
+    assert _fill(m, BUY, LIMIT, limit=90) is None
+    assert _fill(m, SELL, LIMIT, limit=104) == (104.0, 10)
+    assert _fill(m, SELL, STOP, stop=96) == (96.0, 10)
+    assert _fill(m, SELL, STOP, stop=102) == (100.0, 10)  # gap down through a sell stop
+    assert _fill(m, BUY, STOP, stop=106) is None
+    assert _fill(m, BUY, STOP_LIMIT, limit=103, stop=102) == (102.0, 10)
+    assert _fill(m, BUY, STOP_LIMIT, limit=96, stop=99) == (96.0, 10)  # open above limit, trades back down
+    assert _fill(FillModel(slippage_bps=100), BUY, MARKET) == (101.0, 10)
+    assert _fill(FillModel(slippage_bps=100), SELL, MARKET) == (99.0, 10)
+    assert _fill(FillModel(slippage_bps=100), BUY, LIMIT, limit=97) == (97.0, 10)
+
+
+def test_partial_fills_rest_until_ttl():
+    book = OrderBook(FillModel(participation=0.1))
+    book.add(0, BUY, MARKET, 25, ttl=2)
+    bar = _bar(10, 10, 10, 10, v=100)
+    assert book.match(*bar)[2].tolist() == [10]
+    assert book.match(*bar)[2].tolist() == [10]
+    assert len(book) == 0  # ttl spent with 5 unfilled
+    # sessions without a bar for the symbol don't burn ttl
+    book.add(0, BUY, LIMIT, 5, limit=1.0, ttl=1)
+    book.match(*_bar(np.nan, np.nan, np.nan, np.nan))
+    assert len(book) == 1
+
+
+def test_from_settings():
+    assert FillModel.from_settings({"default_order_type": "close"}) is None
+    m = FillModel.from_settings({"default_order_type": "stop", "execution": {"slippage_bps": 3}})
+    assert m.entry_type == "stop" and m.slippage_bps == 3
+    with pytest.raises(ValueError):
+        FillModel(entry_type="iceberg")
+
+
+def _ohlc_bundle(syms=("AAA", "BBB"), n=250, seed=5):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=n)
+    out = {}
+    for s in syms:
+        c = 100 * np.exp(rng.normal(0.001, 0.02, n).cumsum())
+        o = np.r_[c[0], c[:-1]] * np.exp(rng.normal(0, 0.005, n))
+        out[s] = pd.DataFrame({"date": dates, "open": o, "high": np.maximum(o, c) * 1.01,
+                               "low": np.minimum(o, c) * 0.99, "close": c, "volume": 1e6})
+    return out
+
+
+def test_backtest_with_fill_model():
+    bundle = _ohlc_bundle()
+    strat = SMAPullbackStrategy()
+    _, legacy, _ = run_bar_backtest(bundle, strat, 1000.0, max_hold_days=strat.max_hold_days)
+    eq, trades, acct = run_bar_backtest(bundle, strat, 1000.0, max_hold_days=strat.max_hold_days,
+                                        fill_model=FillModel(entry_type="market"))
+    assert legacy and trades
+    bars = {s: df.assign(d=df["date"].dt.date).set_index("d") for s, df in bundle.items()}
+    for t in trades:  # market entries and timed exits all fill at a later session's open
+        assert t["price"] == pytest.approx(bars[t["symbol"]].loc[t["dt"], "open"])
+    assert min(t["dt"] for t in trades) > min(t["dt"] for t in legacy)
+    assert acct.cash_running >= 0 and len(acct.equity_curve) == 250
+
+
+def test_resting_entries_reserve_settled_cash():
+    from autoswing.engine.compliance import Compliance
+    bundle = _ohlc_bundle(syms=tuple(f"S{k}" for k in range(8)), seed=0)
+    strat = SMAPullbackStrategy()
+    model = FillModel(entry_type="limit", limit_offset_bps=50.0, ttl_bars=3, protective_stops=True)
+    _, trades, acct = run_bar_backtest(bundle, strat, 1000.0, max_hold_days=strat.max_hold_days, fill_model=model,
+                                       compliance=Compliance(1000.0, log_only=True))
+    assert trades
+    # no entry was paid with unsettled sale proceeds, and cash never went negative
+    assert acct.compliance.counts["unsettled_funds"] == 0 and acct.compliance.counts["freeride"] == 0
+    assert min(t["cash_after"] for t in trades) >= 0
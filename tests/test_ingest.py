@@ -0,0 +1,42 @@
+import asyncio
+import pandas as pd
+from autoswing.data.cache import delta_segments, read_daily_cache, write_daily_cache
+from autoswing.data.ingest import BarIngestor
+from autoswing.data.loader import load_bundle_cached
+from autoswing.engine.live import ReplayFeed
+
+
+def _bar(day, close, sym="TEST"):
+    return {"symbol": sym, "date": f"2025-01-{day:02d}", "open": close, "high": close, "low": close,
+            "close": close, "volume": 1}
+
+
+def test_micro_batches_visible_to_readers_and_deduped(tmp_path):
+    base = pd.DataFrame({"date": pd.date_range("2024-12-30", periods=2), "open": [1.0, 2], "high": [1.0, 2],
+                         "low": [1.0, 2], "close": [1.0, 2], "volume": [1.0, 1]})
+    write_daily_cache("TEST", base, tmp_path)
+    ing = BarIngestor(tmp_path, max_batch=3, max_delay=60, compact_every=0)
+    for b in (_bar(2, 10), _bar(3, 11), _bar(2, 12)):  # in-buffer duplicate: newest wins
+        ing.add(b)
+    assert ing.add(_bar(6, 13))  # 3rd distinct bar -> flush
+    assert len(delta_segments("TEST", tmp_path)) == 1
+    assert not ing.add(_bar(3, 99))  # already published -> dropped
+    ing.add(_bar(5, 14))  # late but new
+    ing.flush()
+    df = load_bundle_cached(["TEST"], 100, tmp_path)["TEST"]
+    assert df["close"].tolist() == [1.0, 2.0, 12.0, 11.0, 14.0, 13.0]
+    assert ing.stats["duplicates"] == 2 and ing.stats["late"] == 1
+    ing.close()
+    assert delta_segments("TEST", tmp_path) == []
+    assert read_daily_cache("TEST", tmp_path)["close"].tolist() == df["close"].tolist()
+
+
+def test_async_run_from_replay_feed(tmp_path):
+    dates = pd.bdate_range("2024-01-01", periods=50)
+    bundle = {s: pd.DataFrame({"date": dates, "close": range(50)}) for s in ("AAA", "BBB")}
+    ing = BarIngestor(tmp_path, max_batch=16, max_delay=0.05, compact_every=4)
+    stats = asyncio.run(ing.run(ReplayFeed(bundle)))
+    assert stats["written"] == 100 and stats["flushes"] >= 6 and stats["compactions"] >= 1
+    for s in ("AAA", "BBB"):
+        assert delta_segments(s, tmp_path) == []
+        assert len(read_daily_cache(s, tmp_path)) == 50
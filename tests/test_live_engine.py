@@ -0,0 +1,74 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from autoswing.engine.live import BrokerAdapter, LiveEngine, PaperBroker, ReplayFeed, run_replay
+from autoswing.engine.paper_executor import PaperAccount, run_bar_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+
+
+def _bundle(syms=("AAA",), n=250, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=n)
+    return {s: pd.DataFrame({"date": dates, "close": 100 * np.exp(rng.normal(0.001, 0.02, n).cumsum())})
+            for s in syms}
+
+
+def test_replay_matches_backtest_for_one_symbol():
+    bundle = _bundle()
+    strat = SMAPullbackStrategy()
+    bt_eq, bt_trades, bt_acct = run_bar_backtest(bundle, strat, 1000.0, max_hold_days=strat.max_hold_days)
+    eq, trades, acct, stats = run_replay(bundle, SMAPullbackStrategy())
+    assert bt_trades and [(t["dt"], t["side"], t["qty"]) for t in trades] == \
+        [(t["dt"], t["side"], t["qty"]) for t in bt_trades]
+    assert abs(eq - bt_eq) < 1e-9
+    assert acct.equity_curve == bt_acct.equity_curve
+    assert stats.events == 250 and stats.latency.count == 250
+
+
+def test_checks_reject():
+    bundle = _bundle(("AAA", "BBB", "CCC"))
+    acct = PaperAccount(1000.0)
+    deny = lambda account, order: "halted" if order.side == "buy" else None  # noqa: E731
+    eng = LiveEngine(SMAPullbackStrategy(), ReplayFeed(bundle), acct, PaperBroker(acct), checks=[deny])
+    stats = asyncio.run(eng.run())
+    assert stats.events == 750 and stats.fills == 0 and stats.rejected["halted"] == stats.orders > 0
+    s = stats.summary()
+    assert s["latency_ms_p50"] is not None and s["events_per_sec"] > 0
+
+
+def test_stop_finishes_the_current_bar_and_takes_no_more():
+    bundle = _bundle(("AAA", "BBB", "CCC"))
+    acct = PaperAccount(1000.0)
+    seen = []
+
+    def halt(account, order):
+        seen.append(order)
+        eng.stop()
+        return "halted"
+
+    eng = LiveEngine(SMAPullbackStrategy(), ReplayFeed(bundle), acct, PaperBroker(acct), checks=[halt])
+    stats = asyncio.run(eng.run())
+    bars = ReplayFeed(bundle).bars
+    first = bars.index[(bars["symbol"] == seen[0].symbol) & (bars["date"] == seen[0].dt)][0]
+    assert len(seen) == stats.orders == 1 and stats.events == first + 1 < len(bars)
+    assert acct.equity_curve[-1][0] == seen[0].dt                    # the open session is still closed out
+    with pytest.raises(TypeError):
+        BrokerAdapter()
+
+
+def test_stop_while_the_feed_is_idle():
+    class IdleFeed:
+        async def __aiter__(self):
+            await asyncio.sleep(3600)
+            yield  # pragma: no cover
+
+    async def main():
+        acct = PaperAccount(1000.0)
+        eng = LiveEngine(SMAPullbackStrategy(), IdleFeed(), acct, PaperBroker(acct))
+        task = asyncio.create_task(eng.run())
+        await asyncio.sleep(0.05)
+        eng.stop()
+        return await asyncio.wait_for(task, 1.0)
+
+    assert asyncio.run(main()).events == 0
@@ -0,0 +1,31 @@
+import numpy as np
+from autoswing.analysis.metrics import equity_metrics, trade_metrics, max_drawdown_duration, metrics_frame
+
+def test_equity_metrics_rows_match_single():
+    rng = np.random.default_rng(3)
+    curves = 100 * np.cumprod(1 + rng.normal(0.001, 0.01, (4, 300)), axis=1)
+    batch = equity_metrics(curves)
+    for i in range(4):
+        one = equity_metrics(curves[i])
+        for k in batch:
+            assert np.isclose(batch[k][i], one[k][0], equal_nan=True)
+    assert (batch["max_drawdown"] <= 0).all()
+
+def test_drawdown_and_duration():
+    eq = np.array([100, 110, 99, 105, 108, 112, 90.0])
+    m = equity_metrics(eq)
+    assert np.isclose(m["max_drawdown"][0], 90 / 112 - 1)
+    assert max_drawdown_duration(eq)[0] == 3
+
+def test_trade_metrics_nan_padded():
+    p = np.array([[10, -5, 5, np.nan], [-1, -1, np.nan, np.nan]])
+    m = trade_metrics(p)
+    assert list(m["trades"]) == [3, 2]
+    assert np.isclose(m["win_rate"][0], 2 / 3)
+    assert np.isclose(m["profit_factor"][0], 3.0)
+    assert m["profit_factor"][1] == 0.0
+
+def test_metrics_frame_ranks():
+    eq = np.vstack([np.linspace(100, 120, 50), np.linspace(100, 90, 50)])
+    df = metrics_frame(eq, index=["up", "down"])
+    assert df.sort_values("total_return").index[-1] == "up"
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from autoswing.analysis.sketch import QuantileSketch
+from autoswing.analysis.montecarlo import parallel_bootstrap
+
+def test_sketch_quantiles_and_merge():
+    rng = np.random.default_rng(0)
+    vals = rng.normal(0, 100, 20_000)
+    a = QuantileSketch(0.01).update(vals[:7000])
+    b = QuantileSketch(0.01).update(vals[7000:])
+    a.merge(b)
+    assert a.count == len(vals)
+    assert a.min == vals.min() and a.max == vals.max()
+    for q in (0.05, 0.5, 0.95):
+        exact = np.quantile(vals, q)
+        assert abs(a.quantile(q) - exact) <= 0.02 * abs(exact) + 1.0
+
+def test_parallel_bootstrap_reproducible():
+    pnls = [10.0, -5.0, 3.0, -12.0, 8.0]
+    r1 = parallel_bootstrap(pnls, iters=3000, starting_cash=1000, workers=1, seed=7)
+    r2 = parallel_bootstrap(pnls, iters=3000, starting_cash=1000, workers=1, seed=7)
+    assert r1 == r2
+    assert r1["min"] <= r1["p05"] <= r1["p50"] <= r1["p95"] <= r1["max"]
+    assert r1["max_dd_p50"] >= 0
+
+def test_parallel_bootstrap_workers():
+    res = parallel_bootstrap([1.0, -1.0], iters=1000, workers=2, seed=1)
+    assert res["workers"] == 2
+    assert 990 <= res["p50"] <= 1010
+
+def test_parallel_bootstrap_needs_an_iteration():
+    with pytest.raises(ValueError):
+        parallel_bootstrap([1.0], iters=0)
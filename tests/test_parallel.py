@@ -0,0 +1,20 @@
+from autoswing.utils.parallel import chunked, map_chunks, plan_workers
+
+def _square_all(xs):
+    return [x * x for x in xs]
+
+def test_chunked():
+    assert chunked(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+
+def test_map_chunks_inline_and_pools():
+    items = list(range(50))
+    want = sorted(x * x for x in items)
+    assert list(map_chunks(_square_all, items, workers=1)) == [x * x for x in items]
+    assert sorted(map_chunks(_square_all, items, workers=3, chunk_size=4, kind="thread")) == want
+    assert sorted(map_chunks(_square_all, items, workers=2, kind="process")) == want
+
+def test_plan_workers_memory_budget(tmp_path):
+    f = tmp_path / "x.parquet"
+    f.write_bytes(b"0" * 1024 * 1024)  # 1 MiB file -> ~5 MiB per worker
+    assert plan_workers([f], 8, memory_budget_mb=12) == 2
+    assert plan_workers([f], 8, memory_budget_mb=None) == 8
@@ -0,0 +1,53 @@
+import pytest
+from autoswing.pipeline.dag import Pipeline, Stage
+
+def _graph(calls, fail=False):
+    def a(x):
+        calls.append("a"); return {"y": x * 2}
+    def b(y):
+        calls.append("b"); return {"z": y + 1}
+    def c(y):
+        calls.append("c")
+        if fail:
+            raise RuntimeError("boom")
+        return {"w": y - 1}
+    def d(z, w):
+        calls.append("d"); return {"out": z * w}
+    return [Stage("a", a, ("x",), ("y",)), Stage("b", b, ("y",), ("z",)),
+            Stage("c", c, ("y",), ("w",)), Stage("d", d, ("z", "w"), ("out",))]
+
+def test_skip_when_inputs_unchanged(tmp_path):
+    calls = []
+    p = Pipeline(_graph(calls), tmp_path)
+    r1 = p.run({"x": 3})
+    assert r1.artifacts["out"] == 7 * 5 and sorted(r1.ran) == ["a", "b", "c", "d"]
+    calls.clear()
+    r2 = p.run({"x": 3})
+    assert calls == [] and sorted(r2.skipped) == ["a", "b", "c", "d"]
+    assert r2.artifacts["out"] == 35
+    r3 = p.run({"x": 4})
+    assert sorted(r3.ran) == ["a", "b", "c", "d"]
+
+def test_failure_keeps_completed_stages(tmp_path):
+    calls = []
+    with pytest.raises(RuntimeError):
+        Pipeline(_graph(calls, fail=True), tmp_path).run({"x": 3})
+    calls.clear()
+    r = Pipeline(_graph(calls), tmp_path).run({"x": 3})
+    assert "a" in r.skipped and "c" in r.ran and "d" in r.ran
+
+def test_inline_stage_runs_on_callers_thread(tmp_path):
+    import threading
+    threads = {}
+    def a(x):
+        threads["a"] = threading.current_thread(); return {"y": x}
+    def b(y):
+        threads["b"] = threading.current_thread()
+        if y < 0:
+            raise ValueError("negative")
+        return {"z": y}
+    stages = [Stage("a", a, ("x",), ("y",)), Stage("b", b, ("y",), ("z",), inline=True)]
+    assert Pipeline(stages, tmp_path).run({"x": 1}).artifacts["z"] == 1
+    assert threads["b"] is threading.current_thread() and threads["a"] is not threads["b"]
+    with pytest.raises(ValueError):
+        Pipeline(stages, tmp_path).run({"x": -1})
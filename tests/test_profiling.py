@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from autoswing.utils import telemetry
+from autoswing.utils.profiling import Profiler
+from autoswing.engine.paper_executor import BACKTEST_PHASES, run_bar_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+
+
+def _bundle(n=80):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2024-01-01", periods=n)
+    return {s: pd.DataFrame({"date": dates, "close": 100 + rng.normal(0, 1, n).cumsum()}) for s in ("AAA", "BBB")}
+
+
+def test_profiler_writes_report_and_collapsed(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "_enabled", True)
+    monkeypatch.setattr(telemetry, "REGISTRY", telemetry.Registry())
+    for mode in ("cprofile", "sample"):
+        prof = Profiler(tmp_path, f"bt-{mode}", mode=mode, interval=0.001).start()
+        run_bar_backtest(_bundle(), SMAPullbackStrategy(), 1000.0, max_hold_days=5)
+        out = prof.stop()
+        report = out["report"].read_text()
+        assert f"mode={mode}" in report and "backtest phases" in report
+        lines = out["collapsed"].read_text().splitlines()
+        assert lines and all(l.rsplit(" ", 1)[1].isdigit() for l in lines)
+    assert (tmp_path / "runtime/profiles").is_dir()
+
+
+def test_phase_histograms_cover_each_session(monkeypatch):
+    monkeypatch.setattr(telemetry, "_enabled", True)
+    monkeypatch.setattr(telemetry, "REGISTRY", telemetry.Registry())
+    run_bar_backtest(_bundle(40), SMAPullbackStrategy(), 1000.0)
+    phases = {dict(lbl)["phase"]: m for (name, lbl), m in telemetry.REGISTRY.items()
+              if name == "autoswing_backtest_phase_seconds"}
+    assert set(phases) == set(BACKTEST_PHASES)
+    assert all(m.count == 40 for m in phases.values())
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from autoswing.backtest.result_cache import ResultCache, strategy_fingerprint
+from autoswing.engine.paper_executor import run_bar_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+
+def _bundle(seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 * np.cumprod(1 + rng.normal(0.0005, 0.015, 120))
+    return {"AAA": pd.DataFrame({"date": pd.bdate_range("2024-01-02", periods=120), "open": c,
+                                 "high": c, "low": c, "close": c, "volume": 1e6})}
+
+def test_hit_returns_identical_result(tmp_path):
+    cache = ResultCache(tmp_path)
+    strat = SMAPullbackStrategy()
+    first = run_bar_backtest(_bundle(), strat, 1000.0, max_hold_days=5, cache=cache)
+    assert len(cache) == 1
+    second = run_bar_backtest(_bundle(), strat, 1000.0, max_hold_days=5, cache=cache)
+    assert second[0] == first[0] and second[1] == first[1]
+    assert second[2].equity_curve == first[2].equity_curve
+
+def test_key_changes_with_inputs(tmp_path):
+    cache = ResultCache(tmp_path)
+    base = cache.key(_bundle(), SMAPullbackStrategy(), None, starting_cash=1000)
+    assert base == cache.key(_bundle(), SMAPullbackStrategy(), None, starting_cash=1000)
+    assert base != cache.key(_bundle(1), SMAPullbackStrategy(), None, starting_cash=1000)
+    assert base != cache.key(_bundle(), SMAPullbackStrategy(fast=5), None, starting_cash=1000)
+    assert base != cache.key(_bundle(), SMAPullbackStrategy(), {"max_positions": 3}, starting_cash=1000)
+
+    class Wider(SMAPullbackStrategy):  # same instance attributes, other class default
+        alloc_pct = 0.5
+    assert base != cache.key(_bundle(), Wider(), None, starting_cash=1000)
+    assert strategy_fingerprint(Wider())["params"]["alloc_pct"] == 0.5
+    assert strategy_fingerprint(SMAPullbackStrategy(max_positions=2))["params"]["max_positions"] == 2
+
+def test_lru_cap(tmp_path):
+    cache = ResultCache(tmp_path, max_entries=2)
+    for i in range(4):
+        cache.put(f"k{i}", i)
+    assert len(cache) == 2
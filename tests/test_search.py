@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from autoswing.backtest.search import AUDIT_FIELDS, grid_search, make_folds, sample_configs, successive_halving
+from benchmarks.synthetic import synthetic_bundle
+
+SPACE = {"fast": [5, 10], "slow": [10, 20, 40], "max_hold_days": [5]}
+
+
+def test_sample_configs_and_folds():
+    grid = sample_configs(SPACE)
+    assert len(grid) == 5 and all(p["slow"] > p["fast"] for p in grid)  # (10, 10) is invalid
+    assert sample_configs(SPACE, 3, seed=1) == sample_configs(SPACE, 3, seed=1)
+    assert len(sample_configs(SPACE, 3, seed=1)) == 3
+    sessions = pd.bdate_range("2024-01-01", periods=100).values.astype("datetime64[D]")
+    folds = make_folds(sessions, 20, 30)
+    assert [f.index for f in folds] == [0, 1, 2] and folds[0].start == sessions[30]
+    assert folds[-1].end == sessions[89]
+
+
+def test_successive_halving_prunes_and_audits(tmp_path):
+    bundle = synthetic_bundle(6, 400, seed=2)
+    audit = tmp_path / "audit.csv"
+    sh = successive_halving(bundle, SPACE, n_configs=4, eta=2, fold_days=60, min_symbols=6, seed=0,
+                            audit_path=audit, search_id="t")
+    assert [r["configs"] for r in sh.rungs] == [4, 2] and [r["folds"] for r in sh.rungs] == [3, 6]
+    # promoted configs reuse their rung-0 folds
+    assert sh.backtests == 4 * 3 + 2 * 3 and sh.audit["memo"].sum() == 2 * 3
+    assert list(sh.audit.columns) == AUDIT_FIELDS and len(sh.audit) == 4 * 3 + 2 * 6
+    logged = pd.read_csv(audit)
+    assert len(logged) == len(sh.audit) and set(logged["search_id"]) == {"t"}
+    top = sh.leaderboard.iloc[0]
+    assert top["rung"] == 1 and {k: top[k] for k in sh.best} == sh.best
+
+    grid = grid_search(bundle, SPACE, n_configs=4, fold_days=60, seed=0, audit_path=audit)
+    assert grid.backtests == 4 * 6 and sh.symbol_folds < grid.symbol_folds
+    assert len(pd.read_csv(audit)) == len(sh.audit) + len(grid.audit)  # appended, one header
+    # the finalists' full-budget scores match the exhaustive run
+    full = grid.leaderboard.set_index("config_id")["score"]
+    for _, row in sh.leaderboard[sh.leaderboard["rung"] == 1].iterrows():
+        assert row["score"] == pytest.approx(full[row["config_id"]])
+
+    # a rung that widens the universe is a different portfolio: nothing is reused
+    wide = successive_halving(bundle, SPACE, n_configs=4, eta=2, fold_days=60, min_symbols=2, seed=0)
+    assert [r["symbols"] for r in wide.rungs] == [3, 6]
+    assert wide.backtests == 4 * 3 + 2 * 6 and not wide.audit["memo"].any()
+
+
+def test_search_needs_a_fold():
+    with pytest.raises(ValueError):
+        successive_halving(synthetic_bundle(2, 50, seed=0), SPACE, fold_days=60)
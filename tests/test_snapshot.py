@@ -0,0 +1,91 @@
+import gzip
+import pickle
+
+import pandas as pd
+from autoswing.data.cache import append_daily_cache
+from autoswing.engine.compliance import Compliance
+from autoswing.engine.fills import FillModel
+from autoswing.engine.paper_executor import run_chunked_backtest
+from autoswing.engine.snapshot import load_snapshot, run_incremental_backtest
+from autoswing.strategies.sma_pullback import SMAPullbackStrategy
+from benchmarks.synthetic import synthetic_bundle, write_bundle
+
+
+def _run(bundle, root, verify=True, **strategy):
+    strat = SMAPullbackStrategy(**strategy)
+    return run_incremental_backtest(list(bundle), strat, 1000.0, root, root / "account.snapshot",
+                                    start=bundle["SYN00000"]["date"].iloc[40], max_hold_days=strat.max_hold_days,
+                                    fill_model=FillModel(entry_type="limit", limit_offset_bps=20.0, ttl_bars=3),
+                                    compliance=Compliance(1000.0, log_only=True), verify=verify)
+
+
+def _until(bundle, lo, hi=None):
+    return {s: df[(df["date"] >= lo) & ((df["date"] < hi) if hi is not None else True)] for s, df in bundle.items()}
+
+
+def test_resumes_and_matches_full_replay(tmp_path):
+    bundle = synthetic_bundle(5, 200, seed=3, gap_rate=0.05)
+    dates = bundle["SYN00000"]["date"]
+    write_bundle(_until(bundle, dates.iloc[0], dates.iloc[150]), tmp_path)
+    first = _run(bundle, tmp_path)
+    assert not first.resumed and first.reason == "no usable snapshot" and first.verify["ok"]
+    for lo, hi in ((150, 170), (170, None)):
+        new = _until(bundle, dates.iloc[lo], dates.iloc[hi] if hi else None)
+        for s, df in new.items():
+            append_daily_cache(s, df, tmp_path)
+        run = _run(bundle, tmp_path)
+        sessions = pd.concat([df["date"] for df in new.values()]).nunique()
+        assert run.resumed and run.sessions == sessions and run.verify["ok"], run.verify
+    assert run.origin == first.origin
+    assert run.last_session == max(df["date"].iloc[-1] for df in bundle.values()).date()
+    strat = SMAPullbackStrategy()
+    full = run_chunked_backtest(list(bundle), strat, 1000.0, tmp_path, start=first.origin,
+                                max_hold_days=strat.max_hold_days,
+                                fill_model=FillModel(entry_type="limit", limit_offset_bps=20.0, ttl_bars=3),
+                                compliance=Compliance(1000.0, log_only=True))
+    assert full[0] == run.final_eq and len(full[1]) == len(run.trades)
+    # nothing new: no sessions processed, same state
+    again = _run(bundle, tmp_path, verify=False)
+    assert again.resumed and again.sessions == 0 and again.final_eq == run.final_eq
+
+
+def test_stale_snapshots_start_over_and_late_bars_are_flagged(tmp_path):
+    bundle = synthetic_bundle(3, 160, seed=5)
+    dates = bundle["SYN00000"]["date"]
+    write_bundle(_until(bundle, dates.iloc[0], dates.iloc[150]), tmp_path)
+    _run(bundle, tmp_path, verify=False)
+    assert _run(bundle, tmp_path, verify=False, fast=5).reason == "run parameters changed"
+
+    path = tmp_path / "account.snapshot"
+    snap = load_snapshot(path)
+    snap.version = 0
+    with gzip.open(path, "wb") as f:
+        pickle.dump(snap, f)
+    assert load_snapshot(path) is None and _run(bundle, tmp_path, verify=False, fast=5).reason == "no usable snapshot"
+
+    # a bar arriving late for a session already processed
+    late = bundle["SYN00001"].iloc[[140]].copy()
+    late[["open", "high", "low", "close"]] *= 1.5
+    append_daily_cache("SYN00001", late, tmp_path)
+    run = _run(bundle, tmp_path, fast=5)
+    assert run.resumed and not run.verify["ok"]
+    assert run.verify["first_divergence"] == pd.Timestamp(dates.iloc[140]).date()
+
+
+def test_window_resumes_as_the_end_moves_and_other_anchors_start_over(tmp_path):
+    bundle = synthetic_bundle(3, 160, seed=6)
+    dates = bundle["SYN00000"]["date"]
+    write_bundle(bundle, tmp_path)
+    state = tmp_path / "account.snapshot"
+
+    def run(end, **anchor):
+        return run_incremental_backtest(list(bundle), SMAPullbackStrategy(), 1000.0, tmp_path, state,
+                                        end=dates.iloc[end], **anchor)
+    first = run(140, window=60)
+    assert first.origin == dates.iloc[81].date()   # 60 sessions up to and including the end
+    nxt = run(145, window=60)  # a day later: same window, so the snapshot carries on
+    assert nxt.resumed and nxt.sessions == 5 and nxt.origin == first.origin
+    assert run(150, window=90).reason == "run parameters changed"
+    assert run(155, start=dates.iloc[40]).reason == "run parameters changed"
+    assert run(159, start=dates.iloc[40]).resumed
+    assert run(159, start=dates.iloc[50]).reason == "run parameters changed"
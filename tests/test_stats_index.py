@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from autoswing.data.cache import append_daily_cache, compact_daily_cache, write_daily_cache
+from autoswing.data.stats_index import StatsIndex
+from autoswing.pipeline.screen import Prefilter, screen
+
+
+def _bars(n=60, start="2024-01-01", price=50.0, volume=1e5, seed=0):
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(rng.normal(0, 0.01, n).cumsum())
+    return pd.DataFrame({"date": pd.bdate_range(start, periods=n), "close": close, "volume": volume})
+
+
+def _expected(df, window=20):
+    c, v = df["close"].to_numpy(), df["volume"].to_numpy()
+    r = np.diff(np.log(c[-(window + 1):]))
+    return len(df), float(c[-1]), float((c[-window:] * v[-window:]).mean()), float(np.std(r, ddof=1))
+
+
+def _check(entry, df):
+    n, last, adv, vol = _expected(df)
+    assert entry.bars == n and entry.last_close == last
+    assert np.isclose(entry.adv_usd, adv) and np.isclose(entry.volatility, vol)
+
+
+def test_incremental_matches_full_and_persists(tmp_path):
+    df = _bars(80)
+    write_daily_cache("AAA", df.iloc[:60], tmp_path)
+    idx = StatsIndex(tmp_path)
+    assert idx.refresh(["AAA"]) == 1 and idx.refresh(["AAA"]) == 0
+    # new bars + a corrected bar inside the tail, as the ingestor would publish them
+    new = df.iloc[58:80].copy()
+    new.loc[new.index[0], "close"] *= 1.05
+    df.loc[58, "close"] = new["close"].iloc[0]
+    append_daily_cache("AAA", new, tmp_path)
+    idx.extend("AAA", new)
+    _check(idx.get("AAA"), df)
+    assert idx.refresh(["AAA"]) == 0
+    idx.save()
+    compact_daily_cache("AAA", tmp_path)
+    idx.restamp("AAA")
+    idx.save()
+    again = StatsIndex(tmp_path)
+    _check(again.get("AAA"), df)
+    assert again.refresh(["AAA"]) == 0
+    # a rewrite behind the index's back is picked up by refresh
+    write_daily_cache("AAA", df.iloc[:30], tmp_path)
+    assert again.refresh(["AAA"]) == 1 and again.get("AAA").bars == 30
+
+
+def test_screen_gates(tmp_path):
+    idx = StatsIndex(tmp_path)
+    idx.put("OK", _bars(60, price=50, volume=1e5))
+    idx.put("PENNY", _bars(60, price=0.5, volume=1e7))
+    idx.put("THIN", _bars(60, price=50, volume=10))
+    idx.put("NEW", _bars(10, price=50, volume=1e5))
+    idx.put("OLD", _bars(60, start="2023-06-01", price=50, volume=1e5))
+    idx.put("NOVOL", _bars(60).drop(columns="volume"))
+    pf = Prefilter(min_price=1.0, min_adv_usd=1e6, min_bars=30, max_stale_days=10)
+    cands, rejected = screen(idx.frame(), ["ok", "PENNY", "THIN", "NEW", "OLD", "NOVOL", "MISSING"], pf)
+    assert cands == ["OK", "NOVOL"]
+    assert rejected == {"no_data": 1, "history": 1, "min_price": 1, "adv": 1, "stale": 1}
+
+
+def test_prefilter_from_settings():
+    class Strat:
+        warmup_bars = 30
+    pf = Prefilter.from_settings({"min_price": 5.0, "unknown": 1}, Strat(), days=20)
+    assert pf.min_price == 5.0 and pf.min_bars == 20
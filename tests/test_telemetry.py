@@ -0,0 +1,21 @@
+import json
+from autoswing.utils import telemetry
+
+def test_disabled_is_noop(monkeypatch):
+    monkeypatch.setattr(telemetry, "_enabled", False)
+    assert telemetry.counter("x_total") is telemetry.NOOP
+    with telemetry.histogram("x_seconds").time():
+        pass
+
+def test_export_jsonl_and_prometheus(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "_enabled", True)
+    monkeypatch.setattr(telemetry, "REGISTRY", telemetry.Registry())
+    telemetry.counter("asw_requests_total", "Requests", source="yahoo").inc(3)
+    telemetry.gauge("asw_rate", "Rate").set(2.5)
+    telemetry.histogram("asw_seconds", "Latency").observe(0.02)
+    prom = telemetry.flush(tmp_path, run="t", prom_dir=tmp_path / "prom")
+    text = prom.read_text()
+    assert 'asw_requests_total{source="yahoo"} 3.0' in text
+    assert "# TYPE asw_seconds histogram" in text and 'asw_seconds_bucket{le="+Inf"} 1' in text
+    rows = [json.loads(l) for l in (tmp_path / telemetry.METRICS_LOG).read_text().splitlines()]
+    assert {r["name"] for r in rows} == {"asw_requests_total", "asw_rate", "asw_seconds"}
@@ -0,0 +1,56 @@
+import os
+import numpy as np
+import pandas as pd
+from autoswing.analysis.sketch import QuantileSketch
+from autoswing.ui.data import CsvTail, FileTail, downsample, histogram
+
+
+def test_downsample_keeps_extremes_and_ends():
+    idx = pd.bdate_range("2000-01-03", periods=20_000)
+    s = pd.Series(np.random.default_rng(0).normal(0, 1, len(idx)).cumsum(), index=idx)
+    d = downsample(s, 500)
+    assert len(d) == 500 and d.index[0] == idx[0] and d.index[-1] == idx[-1]
+    assert d.index.is_monotonic_increasing
+    span = s.max() - s.min()
+    assert s.max() - d.max() < 0.01 * span and d.min() - s.min() < 0.01 * span
+    strided = s.iloc[:: len(s) // 500]
+    assert (d.max() - d.min()) >= (strided.max() - strided.min())
+
+
+def test_histograms_conserve_counts():
+    x = np.random.default_rng(1).normal(1000, 50, 10_000)
+    assert histogram(x, bins=30)["count"].sum() == len(x)
+    h = QuantileSketch(0.01).update(x).histogram(30)
+    assert sum(h["counts"]) == len(x) and len(h["edges"]) == 31
+
+
+def test_file_tail_reads_only_appended_lines(tmp_path):
+    fp = tmp_path / "watch_loop.log"
+    fp.write_text("a\nb\nc")  # 'c' not terminated yet
+    t = FileTail(fp, keep=3)
+    assert t.read_new() == ["a", "b"]
+    with fp.open("a") as f:
+        f.write("\nd\n")
+    assert t.read_new() == ["c", "d"] and t.tail() == ["b", "c", "d"]
+    assert t.read_new() == []
+    fp.write_text("x\n")  # truncated/rotated
+    assert t.tail() == ["x"]
+
+
+def test_file_tail_starts_near_end_of_large_file(tmp_path):
+    fp = tmp_path / "big.log"
+    fp.write_text("".join(f"line {i}\n" for i in range(10_000)))
+    t = FileTail(fp, keep=5, initial_bytes=100)
+    assert t.tail() == [f"line {i}" for i in range(9995, 10_000)]
+    assert t.offset == os.path.getsize(fp)
+
+
+def test_csv_tail_appends_rows(tmp_path):
+    fp = tmp_path / "trades.csv"
+    fp.write_text("trade_id,price\n1,10.0\n")
+    t = CsvTail(fp, max_rows=2)
+    assert t.read()["trade_id"].tolist() == [1]
+    with fp.open("a") as f:
+        f.write("2,11.0\n3,12.5\n")
+    df = t.read()
+    assert df["trade_id"].tolist() == [2, 3] and df["price"].iloc[-1] == 12.5
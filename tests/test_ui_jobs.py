@@ -0,0 +1,48 @@
+import threading
+import time
+from autoswing.ui.jobs import JobRunner
+
+
+def _slow(root, n=50, gate=None, progress=None):
+    for i in range(n):
+        if gate is not None:
+            gate.wait()
+        progress(i / n, f"step {i}")
+        time.sleep(0.002)
+    return {"n": n}
+
+
+def _boom(root, progress=None):
+    raise ValueError("bad input")
+
+
+def _wait(job, timeout=5.0):
+    t0 = time.time()
+    while job.active and time.time() - t0 < timeout:
+        time.sleep(0.01)
+    return job
+
+
+def test_result_is_persisted_for_a_fresh_runner(tmp_path):
+    runner = JobRunner(tmp_path, registry={"slow": _slow})
+    job = _wait(runner.submit("slow", n=5))
+    assert job.state == "done" and job.progress == 1.0 and job.result == {"n": 5}
+    again = JobRunner(tmp_path, registry={"slow": _slow}).latest("slow")
+    assert again["result"] == {"n": 5} and again["args"] == {"n": 5}
+
+
+def test_cancel_and_dedupe(tmp_path):
+    gate = threading.Event()
+    runner = JobRunner(tmp_path, registry={"slow": _slow})
+    job = runner.submit("slow", n=1000, gate=gate)
+    assert runner.submit("slow", n=1) is job  # second click while active
+    assert runner.cancel(job.id)
+    gate.set()
+    assert _wait(job).state == "cancelled"
+    assert runner.latest("slow") is None
+
+
+def test_failure_is_reported(tmp_path):
+    runner = JobRunner(tmp_path, registry={"boom": _boom})
+    job = _wait(runner.submit("boom"))
+    assert job.state == "failed" and "bad input" in job.error